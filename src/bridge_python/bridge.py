@@ -8,71 +8,115 @@ Runs on port 5001.
 import os
 import sys
 
-# Ensure the bridge_python directory is in the path for vision imports
-# We use __file__ which should resolve to the full path of bridge.py
-_this_file = __file__
-if hasattr(_this_file, "__fspath__"):
-    _this_file = _this_file.__fspath__()
-_bridge_dir = os.path.dirname(os.path.abspath(_this_file))
-print(f"Bridge startup: Adding {_bridge_dir} to sys.path")
+# Ensure the bridge_python directory is in the path for vision imports (once)
+_bridge_dir = os.path.dirname(os.path.abspath(os.fspath(__file__)))
 if _bridge_dir not in sys.path:
     sys.path.insert(0, _bridge_dir)
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_sock import Sock
-import pywinauto
 from pywinauto import Application, Desktop
 from pywinauto.keyboard import send_keys
+import json
 import logging
+import threading
 import time
-from PIL import ImageGrab
+import uuid
+from dataclasses import dataclass, replace
 import io
-import base64
+
+import win_input
+from vision.capture import (
+    grab_screen,
+    grab_screen_array,
+    grab_screen_bgra,
+    grab_screen_bmp,
+    get_screen_size,
+)
+
+# Try to import orjson (faster JSON encoding, serializes NumPy arrays natively)
+_ORJSON_AVAILABLE = False
+
+try:
+    import orjson
+
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    pass
 
 # Vision imports (lazy loaded to avoid startup delay)
 _vision_service = None
+_vision_lock = threading.RLock()
+_detection_batcher = None
+_vision_api = None
 
 # Context Manager for caching and compression
 from context_manager import get_context_manager
 
 
 def get_vision_service():
-    """Lazy load VisionService to avoid slow startup"""
+    """Lazy load VisionService on the first /vision call to avoid slow startup"""
     global _vision_service
     if _vision_service is None:
-        # Ensure vision module is importable
-        import os
-        import sys
+        with _vision_lock:
+            if _vision_service is None:
+                from vision.vision_service import VisionService
 
-        # Get the directory containing this file
-        this_file = os.path.abspath(__file__)
-        bridge_dir = os.path.dirname(this_file)
+                _vision_service = VisionService(confidence_threshold=0.10)
+    return _vision_service
 
-        # Debug logging
-        import logging
 
-        logging.info(f"Vision import: __file__={this_file}")
-        logging.info(f"Vision import: bridge_dir={bridge_dir}")
-        logging.info(
-            f"Vision import: sys.path[0]={sys.path[0] if sys.path else 'empty'}"
-        )
+def vision_api():
+    """
+    The vision_service module, imported once on first use.
 
-        # Add to path if not present
-        if bridge_dir not in sys.path:
-            sys.path.insert(0, bridge_dir)
-            logging.info(f"Vision import: Added {bridge_dir} to sys.path")
+    Endpoints call this instead of running a `from vision.vision_service
+    import ...` statement per request; the import stays lazy so starting the
+    bridge does not load ONNX Runtime.
+    """
+    global _vision_api
+    if _vision_api is None:
+        from vision import vision_service
 
-        # Check if vision folder exists
-        vision_dir = os.path.join(bridge_dir, "vision")
-        if os.path.isdir(vision_dir):
-            logging.info(f"Vision import: vision folder exists at {vision_dir}")
-        else:
-            logging.error(f"Vision import: vision folder NOT FOUND at {vision_dir}")
+        _vision_api = vision_service
+    return _vision_api
 
-        from vision.vision_service import VisionService
 
-        _vision_service = VisionService(confidence_threshold=0.10)
-    return _vision_service
+def get_detection_batcher():
+    """Lazy load the DetectionBatcher that coalesces concurrent /vision/detect calls"""
+    global _detection_batcher
+    if _detection_batcher is None:
+        with _vision_lock:
+            if _detection_batcher is None:
+                from vision.batcher import DetectionBatcher
+
+                _detection_batcher = DetectionBatcher(
+                    get_vision_service(),
+                    max_batch_size=int(os.environ.get("VISION_BATCH_SIZE", 8)),
+                    max_queue_time=float(os.environ.get("VISION_BATCH_WAIT_MS", 15))
+                    / 1000,
+                )
+    return _detection_batcher
+
+
+def warmup_vision():
+    """
+    Load the vision stack and run one detection on a blank frame.
+
+    Run from a background thread at startup so session creation, CUDA
+    initialization and kernel compilation are paid before the first request.
+    """
+    try:
+        import numpy as np
+
+        start = time.perf_counter_ns()
+        get_vision_service().detect_elements(
+            np.zeros((720, 1280, 3), dtype=np.uint8), use_cache=False
+        )
+        elapsed_ms = ms_since(start)
+        logging.info(f"Vision warmup finished in {elapsed_ms} ms")
+    except Exception as e:
+        logging.warning(f"Vision warmup skipped: {e}")
 
 
 app = Flask(__name__)
@@ -82,6 +126,11 @@ logging.basicConfig(level=logging.INFO)
 # ==================== RESPONSE HELPERS ====================
 
 
+def ms_since(start_ns):
+    """Whole milliseconds elapsed since a time.perf_counter_ns() mark."""
+    return (time.perf_counter_ns() - start_ns) // 1_000_000
+
+
 def success_response(action=None, **kwargs):
     """Returns a standardized success response."""
     response = {"status": "success", "engine": "pywinauto"}
@@ -98,16 +147,181 @@ def error_response(code, message, status_code=500):
     ), status_code
 
 
+# ==================== KEY TABLES ====================
+
+# Special key mapping (pywinauto send_keys syntax)
+_SPECIAL_KEYS = {
+    "enter": "{ENTER}",
+    "tab": "{TAB}",
+    "escape": "{ESC}",
+    "backspace": "{BACKSPACE}",
+    "delete": "{DELETE}",
+    "space": " ",
+    "up": "{UP}",
+    "down": "{DOWN}",
+    "left": "{LEFT}",
+    "right": "{RIGHT}",
+    "home": "{HOME}",
+    "end": "{END}",
+    "pageup": "{PGUP}",
+    "pagedown": "{PGDN}",
+}
+
+# Hotkey tokens: modifiers, special keys and F1-F24, built once at import
+_HOTKEY_TABLE = {
+    "ctrl": "^",
+    "alt": "%",
+    "shift": "+",
+    "win": "#",
+    **_SPECIAL_KEYS,
+    **{f"f{n}": f"{{F{n}}}" for n in range(1, 25)},
+}
+
+
+def request_data():
+    """Decodes the JSON request body in one pass ({} for an empty/non-object body)."""
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    data = orjson.loads(raw) if _ORJSON_AVAILABLE else json.loads(raw)
+    return data if isinstance(data, dict) else {}
+
+
+def _query_flag(name):
+    """True when ?name=1 / ?name=true is in the query string."""
+    return request.args.get(name, "").lower() in ("1", "true")
+
+
+@dataclass(slots=True)
+class ScreenshotRequest:
+    """
+    Parameters of the /vision/screenshot* endpoints.
+
+    Built once per request from a single body decode, with VisionConfig
+    defaults for anything the client left out.
+    """
+
+    image_format: str
+    jpeg_quality: int
+    max_width: int
+    max_height: int
+    include_thumbnail: bool
+    thumbnail_max_size: int
+    use_cache: bool = True
+    raw: bool = False
+    binary: bool = False
+    force_screenshot: bool = False
+    defer_screenshot: bool = False
+    # /vision/screenshot_region only
+    x: int | None = None
+    y: int | None = None
+    width: int | None = None
+    height: int | None = None
+
+    @classmethod
+    def from_request(cls):
+        data = request_data()
+        config = vision_api().VisionConfig
+        get = data.get
+        return cls(
+            image_format=get("format", config.image_format),
+            jpeg_quality=get("jpeg_quality", config.jpeg_quality),
+            max_width=get("max_width", config.max_width),
+            max_height=get("max_height", config.max_height),
+            include_thumbnail=get("include_thumbnail", config.include_thumbnail),
+            thumbnail_max_size=get("thumbnail_max_size", config.thumbnail_max_size),
+            use_cache=get("use_cache", True),
+            raw=bool(get("raw")) or _query_flag("raw"),
+            binary=bool(get("binary")) or _query_flag("binary"),
+            force_screenshot=get("force_screenshot", False),
+            defer_screenshot=get("defer_screenshot", False),
+            x=get("x"),
+            y=get("y"),
+            width=get("width"),
+            height=get("height"),
+        )
+
+
+def _json_default(obj):
+    """Fallback serializer for NumPy values when orjson is unavailable."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_response(payload, status_code=200):
+    """
+    Serializes a payload with orjson when available (NumPy arrays allowed).
+
+    Screenshot endpoints use this instead of jsonify: orjson writes the
+    ~100s of KB of base64 data straight into the body without the stdlib
+    encoder's per-character escape scan.
+    """
+    if _ORJSON_AVAILABLE:
+        body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        body = json.dumps(payload, default=_json_default)
+    return app.response_class(body, status=status_code, mimetype="application/json")
+
+
+def fast_success_response(action=None, **kwargs):
+    """Same as success_response, serialized through json_response."""
+    response = {"status": "success", "engine": "pywinauto"}
+    if action:
+        response["action"] = action
+    response.update(kwargs)
+    return json_response(response)
+
+
+def serialize_items(items, layout="rows"):
+    """Serializes elements/text regions as a list of dicts or, opt-in, as columns."""
+    if layout == "columns":
+        return vision_api().to_columns(items)
+    return [item.to_dict() for item in items]
+
+
 # ==================== HELPER FUNCTIONS ====================
 
 
+_desktops = {}
+_desktops_lock = threading.Lock()
+_com_state = threading.local()
+
+
+def get_desktop(backend="win32"):
+    """Returns a shared Desktop for the backend (created once, not per request)."""
+    desktop = _desktops.get(backend)
+    if desktop is None:
+        with _desktops_lock:
+            desktop = _desktops.get(backend)
+            if desktop is None:
+                desktop = Desktop(backend=backend)
+                _desktops[backend] = desktop
+    return desktop
+
+
+@app.before_request
+def ensure_com_initialized():
+    """Joins the COM multithreaded apartment once per Flask worker thread (UIA)."""
+    if getattr(_com_state, "initialized", False):
+        return
+    _com_state.initialized = True
+    try:
+        import comtypes
+
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+    except (ImportError, OSError):
+        # Not on Windows, or the thread already joined an apartment
+        pass
+
+
 def get_target(data):
     """Gets target window from request data."""
     title = data.get("title")
     selector = data.get("selector")
     backend = data.get("backend", "win32")
 
-    desktop = Desktop(backend=backend)
+    desktop = get_desktop(backend)
     if title:
         return desktop.window(title_re=title)
     if selector:
@@ -139,13 +353,13 @@ def explore():
         params = {}
 
         # Try cache first
-        hit, cached_response = ctx.get_cached("explore", params)
+        hit, cached_response, cache_key = ctx.get_cached_with_key("explore", params)
         if hit:
             cached_response["cache_hit"] = True
             return jsonify(cached_response)
 
         # Execute actual query
-        windows = Desktop(backend="win32").windows()
+        windows = get_desktop("win32").windows()
         result = [safe_get_window_info(w) for w in windows]
 
         # Build response dict
@@ -158,7 +372,9 @@ def explore():
         }
 
         # Cache the response
-        ctx.process_response("explore", params, response_dict, compress=False)
+        ctx.process_response(
+            "explore", params, response_dict, compress=False, cache_key=cache_key
+        )
 
         return jsonify(response_dict)
     except Exception as e:
@@ -178,7 +394,7 @@ def health():
 def click():
     """Single click on target element."""
     try:
-        target = get_target(request.json)
+        target = get_target(request_data())
         target.set_focus()
         target.click_input()
         return success_response("click")
@@ -190,7 +406,7 @@ def click():
 def double_click():
     """Double click on target element."""
     try:
-        target = get_target(request.json)
+        target = get_target(request_data())
         target.set_focus()
         target.double_click_input()
         return success_response("double_click")
@@ -202,7 +418,7 @@ def double_click():
 def right_click():
     """Right click on target element."""
     try:
-        target = get_target(request.json)
+        target = get_target(request_data())
         target.set_focus()
         target.right_click_input()
         return success_response("right_click")
@@ -214,17 +430,12 @@ def right_click():
 def click_at():
     """Click at specific coordinates."""
     try:
-        data = request.json
+        data = request_data()
         x = data.get("x", 0)
         y = data.get("y", 0)
         button = data.get("button", "left")
 
-        if button == "right":
-            pywinauto.mouse.right_click(coords=(x, y))
-        elif button == "middle":
-            pywinauto.mouse.middle_click(coords=(x, y))
-        else:
-            pywinauto.mouse.click(coords=(x, y))
+        win_input.click(x, y, button if button in ("right", "middle") else "left")
 
         return success_response("click_at", x=x, y=y, button=button)
     except Exception as e:
@@ -235,10 +446,10 @@ def click_at():
 def mouse_move():
     """Move mouse to coordinates."""
     try:
-        data = request.json
+        data = request_data()
         x = data.get("x", 0)
         y = data.get("y", 0)
-        pywinauto.mouse.move(coords=(x, y))
+        win_input.move(x, y)
         return success_response("mouse_move", x=x, y=y)
     except Exception as e:
         return error_response("MOUSE_MOVE_FAILED", str(e))
@@ -246,13 +457,13 @@ def mouse_move():
 
 @app.route("/scroll", methods=["POST"])
 def scroll():
-    """Scroll mouse wheel."""
+    """Scroll mouse wheel at the cursor (or at x, y when given)."""
     try:
-        data = request.json
+        data = request_data()
         direction = data.get("direction", "down")
         amount = data.get("amount", 3)
         wheel_dist = amount if direction == "up" else -amount
-        pywinauto.mouse.scroll(coords=(0, 0), wheel_dist=wheel_dist)
+        win_input.scroll(wheel_dist, data.get("x"), data.get("y"))
         return success_response("scroll", direction=direction, amount=amount)
     except Exception as e:
         return error_response("SCROLL_FAILED", str(e))
@@ -260,19 +471,16 @@ def scroll():
 
 @app.route("/drag_and_drop", methods=["POST"])
 def drag_and_drop():
-    """Drag from one point to another."""
+    """Drag from one point to another (optional steps: intermediate moves, default 8)."""
     try:
-        data = request.json
+        data = request_data()
         from_x = data.get("from_x", 0)
         from_y = data.get("from_y", 0)
         to_x = data.get("to_x", 0)
         to_y = data.get("to_y", 0)
+        steps = data.get("steps", 8)
 
-        pywinauto.mouse.press(coords=(from_x, from_y))
-        time.sleep(0.1)
-        pywinauto.mouse.move(coords=(to_x, to_y))
-        time.sleep(0.1)
-        pywinauto.mouse.release(coords=(to_x, to_y))
+        win_input.drag(from_x, from_y, to_x, to_y, steps=steps)
 
         return success_response(
             "drag_and_drop",
@@ -290,7 +498,7 @@ def drag_and_drop():
 def type_text():
     """Type text into target element."""
     try:
-        data = request.json
+        data = request_data()
         target = get_target(data)
         text = data.get("text", "")
         target.set_focus()
@@ -304,26 +512,22 @@ def type_text():
 def hotkey():
     """Send keyboard shortcut."""
     try:
-        data = request.json
+        data = request_data()
         keys = data.get("keys", "")
 
-        # Convert format: "ctrl+s" -> "^s", "alt+f4" -> "%{F4}"
-        key_map = {"ctrl": "^", "alt": "%", "shift": "+", "win": "#"}
-
         parts = keys.lower().split("+")
-        pywinauto_keys = ""
-
-        for part in parts:
-            if part in key_map:
-                pywinauto_keys += key_map[part]
-            elif part.startswith("f") and part[1:].isdigit():
-                pywinauto_keys += "{" + part.upper() + "}"
-            elif len(part) == 1:
-                pywinauto_keys += part
-            else:
-                pywinauto_keys += "{" + part.upper() + "}"
 
-        send_keys(pywinauto_keys)
+        # Named keys go straight to SendInput; anything else uses send_keys
+        if not win_input.send_hotkey(parts):
+            # Convert format: "ctrl+s" -> "^s", "alt+f4" -> "%{F4}"
+            pywinauto_keys = "".join(
+                [
+                    _HOTKEY_TABLE.get(part)
+                    or (part if len(part) == 1 else "{" + part.upper() + "}")
+                    for part in parts
+                ]
+            )
+            send_keys(pywinauto_keys)
         return success_response("hotkey", keys=keys)
     except Exception as e:
         return error_response("HOTKEY_FAILED", str(e))
@@ -333,29 +537,16 @@ def hotkey():
 def key_press():
     """Press a single key."""
     try:
-        data = request.json
+        data = request_data()
         key = data.get("key", "")
 
-        # Special key mapping
-        special_keys = {
-            "enter": "{ENTER}",
-            "tab": "{TAB}",
-            "escape": "{ESC}",
-            "backspace": "{BACKSPACE}",
-            "delete": "{DELETE}",
-            "space": " ",
-            "up": "{UP}",
-            "down": "{DOWN}",
-            "left": "{LEFT}",
-            "right": "{RIGHT}",
-            "home": "{HOME}",
-            "end": "{END}",
-            "pageup": "{PGUP}",
-            "pagedown": "{PGDN}",
-        }
-
-        key_to_send = special_keys.get(key.lower(), key)
-        send_keys(key_to_send)
+        # Named keys go straight to SendInput. Single characters (digits
+        # included) go through send_keys, which resolves them for the active
+        # layout and applies shift; on AZERTY the raw VK for "1" types "&".
+        is_named = len(key) > 1
+        if not (is_named and win_input.press_key(key.lower())):
+            key_to_send = _SPECIAL_KEYS.get(key.lower(), key)
+            send_keys(key_to_send)
         return success_response("key_press", key=key)
     except Exception as e:
         return error_response("KEY_PRESS_FAILED", str(e))
@@ -368,7 +559,7 @@ def key_press():
 def focus_window():
     """Bring window to foreground."""
     try:
-        target = get_target(request.json)
+        target = get_target(request_data())
         target.set_focus()
         return success_response("focus_window", window=target.window_text())
     except Exception as e:
@@ -379,7 +570,7 @@ def focus_window():
 def close_window():
     """Close a window."""
     try:
-        target = get_target(request.json)
+        target = get_target(request_data())
         title = target.window_text()
         target.close()
         return success_response("close_window", window=title)
@@ -414,6 +605,21 @@ def vision_debug():
 
         debug_info["import_success"] = True
         debug_info["vision_service_class"] = str(VisionService)
+
+        import PIL
+        import onnxruntime
+        from vision import capture, encoding, nms, resize
+
+        # Pillow-SIMD releases carry a ".postN" suffix (e.g. 9.0.0.post1)
+        debug_info["backends"] = {
+            "capture": capture.get_capture_backend(),
+            "jpeg_encoder": encoding.get_encoder_backend(),
+            "nms": nms.get_nms_backend(),
+            "resize": resize.get_resize_backend(),
+            "ort_providers": onnxruntime.get_available_providers(),
+            "pillow": PIL.__version__,
+            "pillow_simd": ".post" in PIL.__version__,
+        }
     except Exception as e:
         debug_info["import_success"] = False
         debug_info["import_error"] = str(e)
@@ -424,6 +630,29 @@ def vision_debug():
     return jsonify(debug_info)
 
 
+@app.route("/vision/caps", methods=["GET"])
+def vision_caps():
+    """
+    Reports the encoder/capture backends and the CPU's SIMD support.
+
+    Returns:
+        - jpeg_encoder, base64: Codec in use (pybase64 reports its SIMD path)
+        - cpu, simd, best_simd: CPU model and extensions (needs py-cpuinfo)
+        - capture: Screen capture backend
+    """
+    try:
+        from vision import capture, encoding
+
+        return success_response(
+            "vision_caps",
+            capture=capture.get_capture_backend(),
+            **encoding.get_capabilities(),
+        )
+    except Exception as e:
+        logging.exception("Vision caps failed")
+        return error_response("VISION_CAPS_FAILED", str(e))
+
+
 @app.route("/vision/detect", methods=["POST"])
 def vision_detect():
     """
@@ -432,32 +661,37 @@ def vision_detect():
     Request body:
         - use_tiling (bool, optional): Force tiling mode for large screens
         - confidence (float, optional): Minimum confidence threshold (0-1)
+        - layout (str, optional): 'rows' (default) or 'columns' (one array per field)
+        - no_cache (bool, optional): Ignore results cached for an identical frame
 
     Returns:
         - elements: List of detected UI elements with coordinates
     """
     try:
-        data = request.json or {}
+        data = request_data()
         use_tiling = data.get("use_tiling", False)
         confidence = data.get("confidence", 0.25)
+        layout = data.get("layout", "rows")
+        no_cache = data.get("no_cache", False)
 
-        # Take screenshot
-        screenshot = ImageGrab.grab()
-
-        # Get vision service
-        service = get_vision_service()
+        # Take screenshot (RGB view over the capture buffer, tiled without copies)
+        screenshot = grab_screen_array()
+        screen_height, screen_width = screenshot.shape[:2]
 
-        # Detect elements
-        start = time.time()
-        elements = service.detect_elements(screenshot, use_tiling=use_tiling)
-        elapsed = time.time() - start
+        # Detect elements (concurrent requests share batched model calls)
+        start = time.perf_counter_ns()
+        if no_cache:
+            elements = get_vision_service().detect_elements(screenshot, use_cache=False)
+        else:
+            elements = get_detection_batcher().detect(screenshot)
+        elapsed = ms_since(start)
 
-        return success_response(
+        return fast_success_response(
             "vision_detect",
             element_count=len(elements),
-            elapsed_ms=int(elapsed * 1000),
-            screen_size={"width": screenshot.size[0], "height": screenshot.size[1]},
-            elements=[e.to_dict() for e in elements],
+            elapsed_ms=elapsed,
+            screen_size={"width": screen_width, "height": screen_height},
+            elements=serialize_items(elements, layout),
         )
     except Exception as e:
         logging.exception("Vision detect failed")
@@ -471,37 +705,41 @@ def vision_ocr():
 
     Request body:
         - full_text (bool, optional): Return full concatenated text instead of regions
+        - layout (str, optional): 'rows' (default) or 'columns' (one array per field)
+        - no_cache (bool, optional): Ignore results cached for an identical frame
 
     Returns:
         - text_regions: List of text regions with positions
         - full_text: All text concatenated (if requested)
     """
     try:
-        data = request.json or {}
+        data = request_data()
         full_text_only = data.get("full_text", False)
+        layout = data.get("layout", "rows")
+        no_cache = data.get("no_cache", False)
 
         # Take screenshot
-        screenshot = ImageGrab.grab()
+        screenshot = grab_screen()
 
         # Get vision service
         service = get_vision_service()
 
         # Run OCR
-        start = time.time()
-        regions = service.recognize_text(screenshot)
-        elapsed = time.time() - start
+        start = time.perf_counter_ns()
+        regions = service.recognize_text(screenshot, use_cache=not no_cache)
+        elapsed = ms_since(start)
 
         if full_text_only:
             full_text = " ".join(r.text for r in regions)
             return success_response(
-                "vision_ocr", elapsed_ms=int(elapsed * 1000), full_text=full_text
+                "vision_ocr", elapsed_ms=elapsed, full_text=full_text
             )
         else:
-            return success_response(
+            return fast_success_response(
                 "vision_ocr",
                 region_count=len(regions),
-                elapsed_ms=int(elapsed * 1000),
-                text_regions=[r.to_dict() for r in regions],
+                elapsed_ms=elapsed,
+                text_regions=serialize_items(regions, layout),
             )
     except Exception as e:
         logging.exception("Vision OCR failed")
@@ -517,13 +755,14 @@ def vision_find_text():
     Request body:
         - text (str, required): Text to search for
         - case_sensitive (bool, optional): Case-sensitive matching (default: false)
+        - no_cache (bool, optional): Ignore results cached for an identical frame
 
     Returns:
         - found: Whether the element was found
         - element: The element details if found (x, y, width, height, confidence, text)
     """
     try:
-        data = request.json or {}
+        data = request_data()
         text = data.get("text")
         case_sensitive = data.get("case_sensitive", False)
 
@@ -533,21 +772,26 @@ def vision_find_text():
             )
 
         # Take screenshot
-        screenshot = ImageGrab.grab()
+        screenshot = grab_screen()
 
         # Get vision service
         service = get_vision_service()
 
         # Find element
-        start = time.time()
-        element = service.find_element_by_text(screenshot, text, case_sensitive)
-        elapsed = time.time() - start
+        start = time.perf_counter_ns()
+        element = service.find_element_by_text(
+            screenshot,
+            text,
+            case_sensitive,
+            use_cache=not data.get("no_cache", False),
+        )
+        elapsed = ms_since(start)
 
         if element:
             return success_response(
                 "vision_find_text",
                 found=True,
-                elapsed_ms=int(elapsed * 1000),
+                elapsed_ms=elapsed,
                 search_text=text,
                 element=element.to_dict(),
             )
@@ -555,7 +799,7 @@ def vision_find_text():
             return success_response(
                 "vision_find_text",
                 found=False,
-                elapsed_ms=int(elapsed * 1000),
+                elapsed_ms=elapsed,
                 search_text=text,
                 element=None,
             )
@@ -575,13 +819,14 @@ def vision_click_text():
         - case_sensitive (bool, optional): Case-sensitive matching (default: false)
         - button (str, optional): Mouse button to use (left, right, middle)
         - double_click (bool, optional): Perform double-click instead of single click
+        - no_cache (bool, optional): Ignore results cached for an identical frame
 
     Returns:
         - clicked: Whether the click was performed
         - element: The element that was clicked
     """
     try:
-        data = request.json or {}
+        data = request_data()
         text = data.get("text")
         case_sensitive = data.get("case_sensitive", False)
         button = data.get("button", "left")
@@ -593,21 +838,26 @@ def vision_click_text():
             )
 
         # Take screenshot
-        screenshot = ImageGrab.grab()
+        screenshot = grab_screen()
 
         # Get vision service
         service = get_vision_service()
 
         # Find element
-        start = time.time()
-        element = service.find_element_by_text(screenshot, text, case_sensitive)
-        find_elapsed = time.time() - start
+        start = time.perf_counter_ns()
+        element = service.find_element_by_text(
+            screenshot,
+            text,
+            case_sensitive,
+            use_cache=not data.get("no_cache", False),
+        )
+        find_elapsed = ms_since(start)
 
         if not element:
             return success_response(
                 "vision_click_text",
                 clicked=False,
-                elapsed_ms=int(find_elapsed * 1000),
+                elapsed_ms=find_elapsed,
                 search_text=text,
                 reason="Text not found on screen",
             )
@@ -616,20 +866,16 @@ def vision_click_text():
         x, y = element.center
 
         if double_click:
-            pywinauto.mouse.double_click(coords=(x, y))
-        elif button == "right":
-            pywinauto.mouse.right_click(coords=(x, y))
-        elif button == "middle":
-            pywinauto.mouse.middle_click(coords=(x, y))
+            win_input.click(x, y, count=2)
         else:
-            pywinauto.mouse.click(coords=(x, y))
+            win_input.click(x, y, button if button in ("right", "middle") else "left")
 
-        total_elapsed = time.time() - start
+        total_elapsed = ms_since(start)
 
         return success_response(
             "vision_click_text",
             clicked=True,
-            elapsed_ms=int(total_elapsed * 1000),
+            elapsed_ms=total_elapsed,
             search_text=text,
             click_coords={"x": x, "y": y},
             element=element.to_dict(),
@@ -652,22 +898,22 @@ def vision_analyze():
         - full_text: All recognized text
     """
     try:
-        data = request.json or {}
+        data = request_data()
         use_cache = data.get("use_cache", True)
 
         # Take screenshot
-        screenshot = ImageGrab.grab()
+        screenshot = grab_screen()
 
         # Get vision service
         service = get_vision_service()
 
         # Full analysis
-        start = time.time()
+        start = time.perf_counter_ns()
         analysis = service.analyze_screen(screenshot, use_cache=use_cache)
-        elapsed = time.time() - start
+        elapsed = ms_since(start)
 
         return success_response(
-            "vision_analyze", elapsed_ms=int(elapsed * 1000), **analysis
+            "vision_analyze", elapsed_ms=elapsed, **analysis
         )
     except Exception as e:
         logging.exception("Vision analyze failed")
@@ -687,6 +933,7 @@ def vision_ocr_region():
         - y (int, required): Top coordinate of region
         - width (int, required): Width of region
         - height (int, required): Height of region
+        - layout (str, optional): 'rows' (default) or 'columns' (one array per field)
 
     Performance: ~120ms vs ~530ms for full screen
 
@@ -694,34 +941,40 @@ def vision_ocr_region():
         - text_regions: List of text regions within the specified area
     """
     try:
-        data = request.json or {}
+        data = request_data()
         x = data.get("x")
         y = data.get("y")
         width = data.get("width")
         height = data.get("height")
+        layout = data.get("layout", "rows")
 
         if x is None or y is None or width is None or height is None:
             return error_response(
                 "MISSING_PARAMETER", "x, y, width, height are all required", 400
             )
 
-        # Take screenshot
-        screenshot = ImageGrab.grab()
+        # Capture only the requested region instead of grabbing and cropping
+        screenshot = grab_screen(bbox=(x, y, x + width, y + height))
 
         # Get vision service
         service = get_vision_service()
 
-        # OCR the region
-        start = time.time()
-        regions = service.recognize_text_region(screenshot, x, y, width, height)
-        elapsed = time.time() - start
-
-        return success_response(
+        # OCR the whole capture (recognize_text_region raises on OCR failure,
+        # unlike the cached full-frame path), then shift results back to
+        # screen coordinates
+        start = time.perf_counter_ns()
+        regions = [
+            replace(r, x=r.x + x, y=r.y + y)
+            for r in service.recognize_text_region(screenshot, 0, 0, width, height)
+        ]
+        elapsed = ms_since(start)
+
+        return fast_success_response(
             "vision_ocr_region",
             region_count=len(regions),
-            elapsed_ms=int(elapsed * 1000),
+            elapsed_ms=elapsed,
             search_region={"x": x, "y": y, "width": width, "height": height},
-            text_regions=[r.to_dict() for r in regions],
+            text_regions=serialize_items(regions, layout),
         )
     except Exception as e:
         logging.exception("Vision OCR region failed")
@@ -750,7 +1003,7 @@ def vision_find_text_fast():
         - region: Text region details if found
     """
     try:
-        data = request.json or {}
+        data = request_data()
         text = data.get("text")
         hint_regions = data.get("hint_regions", [])
 
@@ -765,21 +1018,21 @@ def vision_find_text_fast():
             hints = [(r["x"], r["y"], r["width"], r["height"]) for r in hint_regions]
 
         # Take screenshot
-        screenshot = ImageGrab.grab()
+        screenshot = grab_screen()
 
         # Get vision service
         service = get_vision_service()
 
         # Fast search
-        start = time.time()
+        start = time.perf_counter_ns()
         region = service.find_text_fast(screenshot, text, hints)
-        elapsed = time.time() - start
+        elapsed = ms_since(start)
 
         if region:
             return success_response(
                 "vision_find_text_fast",
                 found=True,
-                elapsed_ms=int(elapsed * 1000),
+                elapsed_ms=elapsed,
                 search_text=text,
                 used_hints=len(hints) if hints else 0,
                 region=region.to_dict(),
@@ -788,7 +1041,7 @@ def vision_find_text_fast():
             return success_response(
                 "vision_find_text_fast",
                 found=False,
-                elapsed_ms=int(elapsed * 1000),
+                elapsed_ms=elapsed,
                 search_text=text,
                 used_hints=len(hints) if hints else 0,
                 region=None,
@@ -817,7 +1070,7 @@ def vision_ocr_cached():
         - cache_stats: Current cache statistics
     """
     try:
-        data = request.json or {}
+        data = request_data()
         use_cache = data.get("use_cache", True)
         clear_cache = data.get("clear_cache", False)
         full_text_only = data.get("full_text", False)
@@ -830,12 +1083,12 @@ def vision_ocr_cached():
             service.clear_ocr_cache()
 
         # Take screenshot
-        screenshot = ImageGrab.grab()
+        screenshot = grab_screen()
 
         # Run OCR
-        start = time.time()
+        start = time.perf_counter_ns()
         regions = service.recognize_text_cached(screenshot, use_cache=use_cache)
-        elapsed = time.time() - start
+        elapsed = ms_since(start)
 
         # Get cache stats
         cache_stats = service.get_ocr_cache_stats()
@@ -844,7 +1097,7 @@ def vision_ocr_cached():
             full_text = " ".join(r.text for r in regions)
             return success_response(
                 "vision_ocr_cached",
-                elapsed_ms=int(elapsed * 1000),
+                elapsed_ms=elapsed,
                 full_text=full_text,
                 cache_stats=cache_stats,
             )
@@ -852,7 +1105,7 @@ def vision_ocr_cached():
             return success_response(
                 "vision_ocr_cached",
                 region_count=len(regions),
-                elapsed_ms=int(elapsed * 1000),
+                elapsed_ms=elapsed,
                 text_regions=[r.to_dict() for r in regions],
                 cache_stats=cache_stats,
             )
@@ -908,6 +1161,7 @@ def vision_config_get():
 
     Returns:
         - mode: Current vision mode ('local', 'agent', 'auto')
+        - format: Screenshot encoding ('jpeg', 'webp', 'png')
         - jpeg_quality: JPEG compression quality (1-100)
         - max_width: Maximum screenshot width
         - max_height: Maximum screenshot height
@@ -915,9 +1169,9 @@ def vision_config_get():
         - thumbnail_max_size: Maximum thumbnail dimension
     """
     try:
-        from vision.vision_service import VisionConfig
+        vs = vision_api()
 
-        return success_response("vision_config", **VisionConfig.get_config())
+        return success_response("vision_config", **vs.VisionConfig.get_config())
     except Exception as e:
         logging.exception("Vision config get failed")
         return error_response("VISION_CONFIG_GET_FAILED", str(e))
@@ -930,6 +1184,7 @@ def vision_config_set():
 
     Request body (all optional):
         - mode (str): Vision mode ('local', 'agent', 'auto')
+        - format (str): Screenshot encoding 'jpeg' (default), 'webp' or 'png'
         - jpeg_quality (int): JPEG quality 1-100 (default 75)
         - max_width (int): Maximum screenshot width (default 1920)
         - max_height (int): Maximum screenshot height (default 1080)
@@ -940,16 +1195,16 @@ def vision_config_set():
         - Updated configuration
     """
     try:
-        from vision.vision_service import VisionConfig
+        vs = vision_api()
 
-        data = request.json or {}
+        data = request_data()
 
-        VisionConfig.update(**data)
+        vs.VisionConfig.update(**data)
 
         return success_response(
             "vision_config",
             message="Configuration updated",
-            **VisionConfig.get_config(),
+            **vs.VisionConfig.get_config(),
         )
     except ValueError as e:
         return error_response("INVALID_CONFIG", str(e), 400)
@@ -967,14 +1222,23 @@ def vision_screenshot():
     analysis. Returns a compressed, optionally resized screenshot.
 
     Request body (all optional):
+        - raw (bool): Return the full-resolution screen as an uncompressed
+          image/bmp body instead of JSON (also accepted as ?raw=1).
+          Recommended when the client runs on the same host.
+        - binary (bool): Return the encoded image itself as the response
+          body (image/jpeg, image/webp or image/png) with the metadata in
+          X-Image-* headers, skipping base64 and JSON (also ?binary=1)
+        - format (str): Override encoding ('jpeg', 'webp', 'png')
         - jpeg_quality (int): Override JPEG quality (1-100)
         - max_width (int): Override maximum width
         - max_height (int): Override maximum height
         - include_thumbnail (bool): Include a smaller preview
 
     Returns:
-        - screenshot: Base64 JPEG data with metadata
-            - data: Base64-encoded JPEG image
+        - raw: BMP bytes (Content-Type: image/bmp), no resizing or metadata
+        - binary: Encoded image bytes, metadata in headers
+        - screenshot: Base64 image data with metadata
+            - data: Base64-encoded image (JPEG unless format overrides)
             - width, height: Dimensions after resizing
             - original_width, original_height: Original screen dimensions
             - size_bytes: Compressed size
@@ -986,39 +1250,46 @@ def vision_screenshot():
         - Token-efficient for AI vision APIs
     """
     try:
-        from vision.vision_service import VisionConfig, optimize_screenshot
-
-        data = request.json or {}
-
-        # Take screenshot
-        screenshot = ImageGrab.grab()
-
-        # Get parameters (use request overrides or config defaults)
-        jpeg_quality = data.get("jpeg_quality", VisionConfig.jpeg_quality)
-        max_width = data.get("max_width", VisionConfig.max_width)
-        max_height = data.get("max_height", VisionConfig.max_height)
-        include_thumbnail = data.get(
-            "include_thumbnail", VisionConfig.include_thumbnail
+        from vision.capture_worker import get_capture_worker
+
+        req = ScreenshotRequest.from_request()
+
+        # Raw mode: header + capture buffer, no encode or base64
+        if req.raw:
+            return Response(grab_screen_bmp(), mimetype="image/bmp")
+
+        # Capture + optimize on the shared capture thread; concurrent
+        # requests are served from one grab
+        start = time.perf_counter_ns()
+        optimized = get_capture_worker().screenshot(
+            max_width=req.max_width,
+            max_height=req.max_height,
+            jpeg_quality=req.jpeg_quality,
+            include_thumbnail=req.include_thumbnail and not req.binary,
+            thumbnail_max_size=req.thumbnail_max_size,
+            image_format=req.image_format,
+            encode_base64=not req.binary,
         )
-        thumbnail_max_size = data.get(
-            "thumbnail_max_size", VisionConfig.thumbnail_max_size
-        )
-
-        # Optimize screenshot
-        start = time.time()
-        optimized = optimize_screenshot(
-            screenshot,
-            max_width=max_width,
-            max_height=max_height,
-            jpeg_quality=jpeg_quality,
-            include_thumbnail=include_thumbnail,
-            thumbnail_max_size=thumbnail_max_size,
-        )
-        elapsed = time.time() - start
+        elapsed = ms_since(start)
+
+        # Binary mode: the encoder's bytes object is handed to the WSGI
+        # server as-is (no base64 copy, no JSON string)
+        if req.binary:
+            return Response(
+                optimized.raw,
+                mimetype=f"image/{optimized.format}",
+                headers={
+                    "X-Image-Width": str(optimized.width),
+                    "X-Image-Height": str(optimized.height),
+                    "X-Original-Width": str(optimized.original_width),
+                    "X-Original-Height": str(optimized.original_height),
+                    "X-Elapsed-Ms": str(elapsed),
+                },
+            )
 
-        return success_response(
+        return fast_success_response(
             "vision_screenshot",
-            elapsed_ms=int(elapsed * 1000),
+            elapsed_ms=elapsed,
             screenshot=optimized.to_dict(),
         )
     except Exception as e:
@@ -1040,9 +1311,10 @@ def vision_screenshot_region():
         - width (int, required): Width of region
         - height (int, required): Height of region
         - jpeg_quality (int, optional): Override JPEG quality (1-100)
+        - format (str, optional): Override encoding ('jpeg', 'webp', 'png')
 
     Returns:
-        - screenshot: Base64 JPEG data with metadata (same as /vision/screenshot)
+        - screenshot: Base64 image data with metadata (same as /vision/screenshot)
 
     Example regions:
         - Taskbar: {"x": 0, "y": 1040, "width": 1920, "height": 40}
@@ -1050,39 +1322,41 @@ def vision_screenshot_region():
         - Center dialog: {"x": 660, "y": 340, "width": 600, "height": 400}
     """
     try:
-        from vision.vision_service import VisionConfig, optimize_region
-
-        data = request.json or {}
+        vs = vision_api()
 
-        x = data.get("x")
-        y = data.get("y")
-        width = data.get("width")
-        height = data.get("height")
-        jpeg_quality = data.get("jpeg_quality", VisionConfig.jpeg_quality)
+        req = ScreenshotRequest.from_request()
+        x, y, width, height = req.x, req.y, req.width, req.height
+        jpeg_quality = req.jpeg_quality
+        image_format = req.image_format
 
         if x is None or y is None or width is None or height is None:
             return error_response(
                 "MISSING_PARAMETER", "x, y, width, height are all required", 400
             )
 
-        # Take screenshot
-        screenshot = ImageGrab.grab()
-
-        # Optimize region
-        start = time.time()
-        optimized = optimize_region(
-            screenshot,
-            x=x,
-            y=y,
-            width=width,
-            height=height,
-            jpeg_quality=jpeg_quality,
-        )
-        elapsed = time.time() - start
+        screen_size = get_screen_size()
+        start = time.perf_counter_ns()
+        if screen_size:
+            # Capture only the region's pixels, then encode them directly
+            box = vs.clamp_region(x, y, width, height, *screen_size)
+            optimized = vs.encode_region(
+                grab_screen_bgra(bbox=box), screen_size, jpeg_quality, image_format
+            )
+        else:
+            optimized = vs.optimize_region(
+                grab_screen(),
+                x=x,
+                y=y,
+                width=width,
+                height=height,
+                jpeg_quality=jpeg_quality,
+                image_format=image_format,
+            )
+        elapsed = ms_since(start)
 
-        return success_response(
+        return fast_success_response(
             "vision_screenshot_region",
-            elapsed_ms=int(elapsed * 1000),
+            elapsed_ms=elapsed,
             requested_region={"x": x, "y": y, "width": width, "height": height},
             screenshot=optimized.to_dict(),
         )
@@ -1091,6 +1365,65 @@ def vision_screenshot_region():
         return error_response("VISION_SCREENSHOT_REGION_FAILED", str(e))
 
 
+# Screenshots encoded after the analysis response has been sent
+DEFERRED_SCREENSHOT_TTL = 60.0
+_deferred_executor = None
+_deferred_screenshots = {}  # token -> (Future, created_at)
+_deferred_lock = threading.Lock()
+
+
+def defer_screenshot(encode, *args, **kwargs):
+    """
+    Runs a screenshot encode in the background.
+
+    Returns:
+        URL the client can GET once for the finished screenshot
+    """
+    global _deferred_executor
+    from concurrent.futures import ThreadPoolExecutor
+
+    token = uuid.uuid4().hex
+    now = time.time()
+    with _deferred_lock:
+        if _deferred_executor is None:
+            _deferred_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="DeferredScreenshot"
+            )
+        # Drop results nobody collected
+        for key, (_, created_at) in list(_deferred_screenshots.items()):
+            if now - created_at > DEFERRED_SCREENSHOT_TTL:
+                del _deferred_screenshots[key]
+        _deferred_screenshots[token] = (
+            _deferred_executor.submit(encode, *args, **kwargs),
+            now,
+        )
+    return f"/vision/screenshot_pending/{token}"
+
+
+@app.route("/vision/screenshot_pending/<token>", methods=["GET"])
+def vision_screenshot_pending(token):
+    """
+    Collect a screenshot deferred by /vision/analyze_or_screenshot.
+
+    Waits for the encode if it is still running. Each URL can be read once.
+    """
+    try:
+        with _deferred_lock:
+            entry = _deferred_screenshots.pop(token, None)
+        if entry is None:
+            return error_response(
+                "SCREENSHOT_NOT_FOUND", "Unknown or expired screenshot token", 404
+            )
+
+        optimized = entry[0].result(timeout=30)
+        return fast_success_response(
+            "vision_screenshot_pending", screenshot=optimized.to_dict()
+        )
+    except Exception as e:
+        logging.exception("Vision screenshot pending failed")
+        return error_response("VISION_SCREENSHOT_PENDING_FAILED", str(e))
+
+
 @app.route("/vision/analyze_or_screenshot", methods=["POST"])
 def vision_analyze_or_screenshot():
     """
@@ -1106,6 +1439,9 @@ def vision_analyze_or_screenshot():
         - use_cache (bool, optional): Use OCR cache (default True, local mode only)
         - jpeg_quality (int, optional): Override JPEG quality for screenshot
         - force_screenshot (bool, optional): Always include screenshot even in local mode
+        - defer_screenshot (bool, optional): Don't wait for the screenshot encode
+          after a local analysis; return screenshot_pending_url instead, to be
+          fetched with GET (default False)
 
     Returns:
         Depends on mode:
@@ -1115,22 +1451,35 @@ def vision_analyze_or_screenshot():
                 limited results
     """
     try:
-        from vision.vision_service import VisionConfig, optimize_screenshot
+        vs = vision_api()
 
-        data = request.json or {}
-        use_cache = data.get("use_cache", True)
-        jpeg_quality = data.get("jpeg_quality", VisionConfig.jpeg_quality)
-        force_screenshot = data.get("force_screenshot", False)
+        req = ScreenshotRequest.from_request()
+        use_cache = req.use_cache
+        jpeg_quality = req.jpeg_quality
+        force_screenshot = req.force_screenshot
+        defer = req.defer_screenshot
 
-        mode = VisionConfig.mode
-        screenshot = ImageGrab.grab()
+        mode = vs.VisionConfig.mode
+        screenshot = grab_screen()
 
-        start = time.time()
+        start = time.perf_counter_ns()
         result = {"mode": mode}
 
+        def attach_screenshot():
+            # Encode now, or hand the encode to a worker and return its URL
+            if defer:
+                result["screenshot_pending_url"] = defer_screenshot(
+                    vs.optimize_screenshot, screenshot, jpeg_quality=jpeg_quality
+                )
+            else:
+                optimized = vs.optimize_screenshot(
+                    screenshot, jpeg_quality=jpeg_quality
+                )
+                result["screenshot"] = optimized.to_dict()
+
         if mode == "agent":
             # Agent mode: just return screenshot
-            optimized = optimize_screenshot(screenshot, jpeg_quality=jpeg_quality)
+            optimized = vs.optimize_screenshot(screenshot, jpeg_quality=jpeg_quality)
             result["screenshot"] = optimized.to_dict()
 
         elif mode == "local":
@@ -1141,8 +1490,7 @@ def vision_analyze_or_screenshot():
 
             # Optionally include screenshot
             if force_screenshot:
-                optimized = optimize_screenshot(screenshot, jpeg_quality=jpeg_quality)
-                result["screenshot"] = optimized.to_dict()
+                attach_screenshot()
 
         else:  # auto mode
             # Try local analysis first
@@ -1160,26 +1508,19 @@ def vision_analyze_or_screenshot():
                     result["fallback_reason"] = (
                         f"Limited local results: {element_count} elements, {text_count} text regions"
                     )
-                    optimized = optimize_screenshot(
-                        screenshot, jpeg_quality=jpeg_quality
-                    )
-                    result["screenshot"] = optimized.to_dict()
+                    attach_screenshot()
                 elif force_screenshot:
-                    optimized = optimize_screenshot(
-                        screenshot, jpeg_quality=jpeg_quality
-                    )
-                    result["screenshot"] = optimized.to_dict()
+                    attach_screenshot()
 
             except Exception as local_error:
                 # Local failed - fall back to screenshot
                 result["fallback_reason"] = f"Local analysis failed: {str(local_error)}"
-                optimized = optimize_screenshot(screenshot, jpeg_quality=jpeg_quality)
-                result["screenshot"] = optimized.to_dict()
+                attach_screenshot()
 
-        elapsed = time.time() - start
-        result["elapsed_ms"] = int(elapsed * 1000)
+        elapsed = ms_since(start)
+        result["elapsed_ms"] = elapsed
 
-        return success_response("vision_analyze_or_screenshot", **result)
+        return fast_success_response("vision_analyze_or_screenshot", **result)
 
     except Exception as e:
         logging.exception("Vision analyze_or_screenshot failed")
@@ -1203,9 +1544,9 @@ def vision_screenshot_cache_stats():
         - hit_rate: Cache hit ratio (0-1)
     """
     try:
-        from vision.vision_service import get_screenshot_cache
+        vs = vision_api()
 
-        cache = get_screenshot_cache()
+        cache = vs.get_screenshot_cache()
         return success_response("vision_screenshot_cache_stats", **cache.get_stats())
     except Exception as e:
         logging.exception("Vision screenshot cache stats failed")
@@ -1221,9 +1562,9 @@ def vision_screenshot_cache_clear():
         - message: Confirmation message
     """
     try:
-        from vision.vision_service import get_screenshot_cache
+        vs = vision_api()
 
-        cache = get_screenshot_cache()
+        cache = vs.get_screenshot_cache()
         cache.clear()
         return success_response(
             "vision_screenshot_cache_clear", message="Screenshot cache cleared"
@@ -1246,10 +1587,10 @@ def vision_screenshot_cache_config():
         - Updated cache statistics
     """
     try:
-        from vision.vision_service import get_screenshot_cache
+        vs = vision_api()
 
-        data = request.json or {}
-        cache = get_screenshot_cache()
+        data = request_data()
+        cache = vs.get_screenshot_cache()
 
         if "ttl_seconds" in data:
             cache.set_ttl(float(data["ttl_seconds"]))
@@ -1276,37 +1617,33 @@ def vision_screenshot_cached():
 
     Request body (all optional):
         - use_cache (bool): Use cached screenshot if available (default True)
+        - format (str): Override encoding ('jpeg', 'webp', 'png')
         - jpeg_quality (int): Override JPEG quality (1-100)
         - max_width (int): Override maximum width
         - max_height (int): Override maximum height
         - include_thumbnail (bool): Include a smaller preview
 
+    When the TTL cache misses, the fresh capture is fingerprinted; if the
+    screen has not changed since an earlier request with the same params,
+    the earlier encoding is reused (cache_hit=true, no encode).
+
     Returns:
         - screenshot: Base64 JPEG data with metadata
         - cache_hit: Whether this was served from cache
     """
     try:
-        from vision.vision_service import (
-            VisionConfig,
-            optimize_screenshot,
-            get_screenshot_cache,
-        )
-
-        data = request.json or {}
-        use_cache = data.get("use_cache", True)
-
-        # Get parameters
-        jpeg_quality = data.get("jpeg_quality", VisionConfig.jpeg_quality)
-        max_width = data.get("max_width", VisionConfig.max_width)
-        max_height = data.get("max_height", VisionConfig.max_height)
-        include_thumbnail = data.get(
-            "include_thumbnail", VisionConfig.include_thumbnail
-        )
-        thumbnail_max_size = data.get(
-            "thumbnail_max_size", VisionConfig.thumbnail_max_size
-        )
-
-        cache = get_screenshot_cache()
+        vs = vision_api()
+
+        req = ScreenshotRequest.from_request()
+        use_cache = req.use_cache
+        image_format = req.image_format
+        jpeg_quality = req.jpeg_quality
+        max_width = req.max_width
+        max_height = req.max_height
+        include_thumbnail = req.include_thumbnail
+        thumbnail_max_size = req.thumbnail_max_size
+
+        cache = vs.get_screenshot_cache()
         cache_hit = False
         optimized = None
 
@@ -1317,23 +1654,42 @@ def vision_screenshot_cached():
                 quality=jpeg_quality,
                 max_width=max_width,
                 max_height=max_height,
+                image_format=image_format,
             )
             if optimized:
                 cache_hit = True
 
-        start = time.time()
+        start = time.perf_counter_ns()
 
         if not optimized:
             # Take new screenshot
-            screenshot = ImageGrab.grab()
-            optimized = optimize_screenshot(
-                screenshot,
-                max_width=max_width,
-                max_height=max_height,
-                jpeg_quality=jpeg_quality,
-                include_thumbnail=include_thumbnail,
-                thumbnail_max_size=thumbnail_max_size,
+            screenshot = grab_screen_bgra()
+
+            # Unchanged screen: reuse the earlier encoding of the same pixels
+            params = (
+                jpeg_quality,
+                max_width,
+                max_height,
+                image_format,
+                thumbnail_max_size if include_thumbnail else None,
             )
+            frame_key = vs.frame_digest(screenshot)
+            if use_cache:
+                optimized = cache.get_for_frame(frame_key, *params)
+                cache_hit = optimized is not None
+
+            if not optimized:
+                optimized = vs.optimize_screenshot(
+                    screenshot,
+                    max_width=max_width,
+                    max_height=max_height,
+                    jpeg_quality=jpeg_quality,
+                    include_thumbnail=include_thumbnail,
+                    thumbnail_max_size=thumbnail_max_size,
+                    image_format=image_format,
+                )
+                cache.put_for_frame(optimized, frame_key, *params)
+
             # Store in cache
             cache.put(
                 optimized,
@@ -1341,13 +1697,14 @@ def vision_screenshot_cached():
                 quality=jpeg_quality,
                 max_width=max_width,
                 max_height=max_height,
+                image_format=image_format,
             )
 
-        elapsed = time.time() - start
+        elapsed = ms_since(start)
 
-        return success_response(
+        return fast_success_response(
             "vision_screenshot_cached",
-            elapsed_ms=int(elapsed * 1000),
+            elapsed_ms=elapsed,
             cache_hit=cache_hit,
             screenshot=optimized.to_dict(),
         )
@@ -1412,14 +1769,14 @@ def context_disable():
 def context_invalidate():
     """Invalidate cache for a specific window."""
     try:
-        data = request.get_json() or {}
+        data = request_data()
         window = data.get("window")
 
         if not window:
             return error_response("MISSING_PARAM", "window is required")
 
         ctx = get_context_manager()
-        ctx.cache.invalidate_window(window)
+        ctx.invalidate_window(window)
         return success_response(
             action="context_invalidate", window=window, message="Cache invalidated"
         )
@@ -1449,10 +1806,17 @@ def vision_stream(ws):
     max_height = request.args.get("max_height")
     if max_height:
         max_height = int(max_height)
+    # Binary JPEG frames instead of base64 text (opt-in, see streaming.py)
+    binary = _query_flag("binary")
 
     streamer = get_vision_streamer()
     streamer.stream_screenshots(
-        ws, fps=fps, quality=quality, max_width=max_width, max_height=max_height
+        ws,
+        fps=fps,
+        quality=quality,
+        max_width=max_width,
+        max_height=max_height,
+        binary=binary,
     )
 
 
@@ -1460,4 +1824,8 @@ def vision_stream(ws):
 
 if __name__ == "__main__":
     print("Starting Python Bridge (pywinauto) on port 5001...")
+    if os.environ.get("VISION_WARMUP", "1") != "0":
+        threading.Thread(target=warmup_vision, name="VisionWarmup", daemon=True).start()
+    # The dev server runs each request on its own thread (Flask's default), and
+    # vision calls release the GIL inside ORT/OCR, so they do not block input
     app.run(port=5001, host="127.0.0.1")
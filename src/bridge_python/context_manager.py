@@ -13,31 +13,59 @@ Version: 4.0
 """
 
 import hashlib
-import json
+import logging
+import queue
+import random
+import threading
 import time
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
-from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
 
+# Kept in its own module so it can be compiled with mypyc (see DEVELOPMENT.md)
+from response_compressor import ResponseCompressor
 
-@dataclass
+# Try to import xxhash (faster than hashlib for cache keys)
+_XXHASH_AVAILABLE = False
+
+try:
+    import xxhash
+
+    _XXHASH_AVAILABLE = True
+except ImportError:
+    pass
+
+
+def _hasher(digest_size: int = 8):
+    """
+    Incremental hasher (xxh3-64, blake2b fallback).
+
+    xxh3 always produces 8 bytes; slice the hexdigest when asking for less.
+    """
+    if _XXHASH_AVAILABLE:
+        return xxhash.xxh3_64()
+    return hashlib.blake2b(digest_size=digest_size)
+
+
+@dataclass(slots=True)
 class CacheEntry:
     """A cached response with metadata for invalidation."""
 
-    key: str
+    key: Hashable
     value: Any
     window_hash: str
     created_at: float
     ttl_seconds: float
     access_count: int = 0
-    last_accessed: float = field(default_factory=time.time)
+    last_accessed: float = field(default_factory=time.monotonic)
 
-    def is_expired(self) -> bool:
-        return time.time() - self.created_at > self.ttl_seconds
+    # Timestamps are time.monotonic(); callers pass one "now" per operation
+    def is_expired(self, now: float) -> bool:
+        return now - self.created_at > self.ttl_seconds
 
-    def touch(self):
+    def touch(self, now: float):
         self.access_count += 1
-        self.last_accessed = time.time()
+        self.last_accessed = now
 
 
 class SemanticCache:
@@ -47,12 +75,14 @@ class SemanticCache:
     Features:
     - TTL-based expiration
     - Window hash invalidation (cache invalidates when UI changes)
-    - LRU eviction for memory management
+    - LFU eviction for memory management (O(1); least recently used
+      among the least frequently used entries)
     - Semantic key normalization
     """
 
     DEFAULT_TTL = 30.0  # 30 seconds default TTL
     MAX_ENTRIES = 100  # Maximum cache entries
+    TTL_JITTER = 0.2  # +/-20% per entry, so a burst of entries does not expire at once
 
     # TTL by command type
     TTL_BY_COMMAND = {
@@ -67,16 +97,43 @@ class SemanticCache:
 
     def __init__(self, max_entries: int = MAX_ENTRIES):
         self.max_entries = max_entries
-        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._cache: Dict[Hashable, CacheEntry] = {}
+        # access_count -> keys with that count, oldest first (insertion-ordered
+        # dicts used as LRU lists); eviction takes the head of the lowest count
+        self._by_count: Dict[int, Dict[Hashable, None]] = {}
+        self._min_count = 0
         self._window_hashes: Dict[str, str] = {}  # window_selector -> hash
+        # window_hash -> keys of the entries cached under it
+        self._by_window: Dict[str, Set[Hashable]] = defaultdict(set)
         self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
 
-    def _normalize_key(self, action: str, params: Dict[str, Any]) -> str:
+    def _normalize_key(self, action: str, params: Dict[str, Any]) -> Hashable:
         """Create a normalized cache key from action and params."""
-        # Sort params for consistent hashing
-        sorted_params = json.dumps(params, sort_keys=True)
-        key_str = f"{action}:{sorted_params}"
-        return hashlib.md5(key_str.encode()).hexdigest()
+        # Parameterless commands (e.g. explore) are keyed by the action alone
+        if not params:
+            return action
+
+        # Flat params: sorted item tuple, no JSON encoding or hashing
+        try:
+            key = (action, tuple(sorted(params.items())))
+            hash(key)
+            return key
+        except TypeError:
+            pass
+
+        # Nested params (lists/dicts): hash sorted keys and value reprs
+        # directly, no intermediate JSON string
+        h = _hasher()
+        h.update(action.encode("utf-8"))
+        for name in sorted(params):
+            h.update(b"\x00")
+            h.update(name.encode("utf-8"))
+            h.update(b"=")
+            h.update(repr(params[name]).encode("utf-8"))
+        # Integer digest keys the dict directly (no hex string per lookup)
+        if _XXHASH_AVAILABLE:
+            return h.intdigest()
+        return int.from_bytes(h.digest(), "little")
 
     def _get_window_hash(self, window_selector: Optional[str]) -> str:
         """Get or compute window state hash."""
@@ -84,6 +141,40 @@ class SemanticCache:
             return "desktop"
         return self._window_hashes.get(window_selector, "unknown")
 
+    def _unlink(self, key: Hashable) -> CacheEntry:
+        """Drop an entry and its frequency bucket reference."""
+        entry = self._cache.pop(key)
+        bucket = self._by_count[entry.access_count]
+        del bucket[key]
+        if not bucket:
+            del self._by_count[entry.access_count]
+        return entry
+
+    def _remove(self, key: Hashable):
+        """Drop an entry and its frequency and window index references."""
+        entry = self._unlink(key)
+        keys = self._by_window.get(entry.window_hash)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_window[entry.window_hash]
+
+    def _invalidate_hash(self, window_hash: Optional[str]):
+        """Drop every entry cached under window_hash."""
+        for key in self._by_window.pop(window_hash, ()):
+            self._unlink(key)
+            self._stats["invalidations"] += 1
+
+    def _evict(self):
+        """Drop the least recently used of the least frequently used entries."""
+        bucket = self._by_count.get(self._min_count)
+        if not bucket:
+            # Stale minimum after removals outside the hit path
+            self._min_count = min(self._by_count)
+            bucket = self._by_count[self._min_count]
+        self._remove(next(iter(bucket)))
+        self._stats["evictions"] += 1
+
     def get(self, action: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
         """
         Try to get a cached response.
@@ -91,55 +182,89 @@ class SemanticCache:
         Returns:
             Tuple of (hit: bool, value: Any or None)
         """
+        hit, value, _ = self.get_with_key(action, params)
+        return (hit, value)
+
+    def get_with_key(
+        self, action: str, params: Dict[str, Any]
+    ) -> Tuple[bool, Any, Hashable]:
+        """
+        Like get(), but also returns the normalized key so a following
+        set_with_key() on a miss does not normalize the params again.
+
+        Returns:
+            Tuple of (hit: bool, value: Any or None, key)
+        """
         key = self._normalize_key(action, params)
 
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
             self._stats["misses"] += 1
-            return (False, None)
-
-        entry = self._cache[key]
+            return (False, None, key)
 
         # Check expiration
-        if entry.is_expired():
-            del self._cache[key]
+        now = time.monotonic()
+        if entry.is_expired(now):
+            self._remove(key)
             self._stats["misses"] += 1
-            return (False, None)
+            return (False, None, key)
 
         # Check window hash validity
         window_selector = params.get("window") or params.get("selector")
         current_hash = self._get_window_hash(window_selector)
         if entry.window_hash != current_hash and entry.window_hash != "desktop":
-            del self._cache[key]
+            self._remove(key)
             self._stats["invalidations"] += 1
-            return (False, None)
-
-        # Cache hit
-        entry.touch()
-        self._cache.move_to_end(key)  # LRU: move to end
+            return (False, None, key)
+
+        # Cache hit: move the key to the next frequency bucket
+        count = entry.access_count
+        bucket = self._by_count[count]
+        del bucket[key]
+        if not bucket:
+            del self._by_count[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        entry.touch(now)
+        self._by_count.setdefault(count + 1, {})[key] = None
         self._stats["hits"] += 1
-        return (True, entry.value)
+        return (True, entry.value, key)
 
     def set(self, action: str, params: Dict[str, Any], value: Any):
         """Store a response in cache."""
-        key = self._normalize_key(action, params)
+        self.set_with_key(self._normalize_key(action, params), action, params, value)
+
+    def set_with_key(
+        self, key: Hashable, action: str, params: Dict[str, Any], value: Any
+    ):
+        """Store a response under a key returned by get_with_key()."""
         ttl = self.TTL_BY_COMMAND.get(action, self.DEFAULT_TTL)
+        ttl *= 1.0 - self.TTL_JITTER + 2.0 * self.TTL_JITTER * random.random()
 
         window_selector = params.get("window") or params.get("selector")
         window_hash = self._get_window_hash(window_selector)
 
+        now = time.monotonic()
+
+        # Replacing an entry: drop the old one (and its index reference)
+        if key in self._cache:
+            self._remove(key)
+
         # Evict if at capacity
-        while len(self._cache) >= self.max_entries:
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
-            self._stats["evictions"] += 1
+        while self._cache and len(self._cache) >= self.max_entries:
+            self._evict()
 
         self._cache[key] = CacheEntry(
             key=key,
             value=value,
             window_hash=window_hash,
-            created_at=time.time(),
+            created_at=now,
             ttl_seconds=ttl,
+            last_accessed=now,
         )
+        self._by_window[window_hash].add(key)
+        self._by_count.setdefault(0, {})[key] = None
+        self._min_count = 0
 
     def update_window_hash(self, window_selector: str, new_hash: str):
         """Update window hash (invalidates related cache entries)."""
@@ -147,27 +272,18 @@ class SemanticCache:
         if old_hash != new_hash:
             self._window_hashes[window_selector] = new_hash
             # Invalidate entries for this window
-            keys_to_remove = []
-            for key, entry in self._cache.items():
-                if entry.window_hash == old_hash:
-                    keys_to_remove.append(key)
-            for key in keys_to_remove:
-                del self._cache[key]
-                self._stats["invalidations"] += 1
+            self._invalidate_hash(old_hash)
 
     def invalidate_window(self, window_selector: str):
         """Explicitly invalidate all cache entries for a window."""
-        window_hash = self._window_hashes.get(window_selector, "unknown")
-        keys_to_remove = [
-            k for k, v in self._cache.items() if v.window_hash == window_hash
-        ]
-        for key in keys_to_remove:
-            del self._cache[key]
-            self._stats["invalidations"] += 1
+        self._invalidate_hash(self._window_hashes.get(window_selector, "unknown"))
 
     def clear(self):
         """Clear all cache entries."""
         self._cache.clear()
+        self._by_count.clear()
+        self._min_count = 0
+        self._by_window.clear()
         self._window_hashes.clear()
 
     def get_stats(self) -> Dict[str, Any]:
@@ -181,123 +297,6 @@ class SemanticCache:
         }
 
 
-class ResponseCompressor:
-    """
-    Compresses verbose responses to reduce token consumption.
-
-    Strategies:
-    - Remove empty/null fields
-    - Truncate long text content
-    - Summarize large element lists
-    - Extract only essential properties
-    """
-
-    MAX_TEXT_LENGTH = 100
-    MAX_ELEMENTS_FULL = 10
-    MAX_ELEMENTS_SUMMARY = 50
-
-    # Essential fields by response type
-    ESSENTIAL_FIELDS = {
-        "element": ["name", "type", "id", "x", "y", "w", "h"],
-        "window": ["title", "bounds", "is_enabled"],
-        "summary": ["title", "element_count", "key_elements"],
-    }
-
-    @classmethod
-    def compress(
-        cls, response: Dict[str, Any], context: str = "default"
-    ) -> Dict[str, Any]:
-        """
-        Compress a response based on context.
-
-        Args:
-            response: The raw response from MainAgentService
-            context: Hint about what kind of response this is
-
-        Returns:
-            Compressed response
-        """
-        if not isinstance(response, dict):
-            return response
-
-        # Don't compress errors
-        if response.get("status") == "error":
-            return response
-
-        compressed = {}
-
-        for key, value in response.items():
-            if value is None or value == "" or value == []:
-                continue  # Skip empty values
-
-            if isinstance(value, str) and len(value) > cls.MAX_TEXT_LENGTH:
-                compressed[key] = value[: cls.MAX_TEXT_LENGTH] + "..."
-            elif isinstance(value, list) and len(value) > cls.MAX_ELEMENTS_FULL:
-                # Summarize large lists
-                compressed[key] = cls._compress_element_list(value)
-            elif isinstance(value, dict):
-                compressed[key] = cls._compress_dict(value)
-            else:
-                compressed[key] = value
-
-        return compressed
-
-    @classmethod
-    def _compress_element_list(cls, elements: List[Any]) -> Dict[str, Any]:
-        """Compress a list of elements to a summary."""
-        if not elements:
-            return {"count": 0, "elements": []}
-
-        # Take first N full elements
-        full_elements = elements[: cls.MAX_ELEMENTS_FULL]
-
-        # Compress each element
-        compressed_elements = [
-            cls._compress_element(e) if isinstance(e, dict) else e
-            for e in full_elements
-        ]
-
-        return {
-            "count": len(elements),
-            "showing": len(compressed_elements),
-            "elements": compressed_elements,
-        }
-
-    @classmethod
-    def _compress_element(cls, element: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract essential fields from an element."""
-        essential = {}
-        for field in cls.ESSENTIAL_FIELDS.get("element", []):
-            if field in element and element[field]:
-                value = element[field]
-                if isinstance(value, str) and len(value) > 50:
-                    value = value[:50] + "..."
-                essential[field] = value
-
-        # Add automation_id if present and different from name
-        if element.get("automation_id") and element.get("automation_id") != element.get(
-            "name"
-        ):
-            essential["id"] = element["automation_id"]
-
-        return essential if essential else element
-
-    @classmethod
-    def _compress_dict(cls, d: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively compress a dictionary."""
-        result = {}
-        for key, value in d.items():
-            if value is None or value == "" or value == []:
-                continue
-            if isinstance(value, dict):
-                result[key] = cls._compress_dict(value)
-            elif isinstance(value, list) and len(value) > 10:
-                result[key] = cls._compress_element_list(value)
-            else:
-                result[key] = value
-        return result
-
-
 class ProgressiveDisclosure:
     """
     Implements progressive disclosure pattern for AI agents.
@@ -314,50 +313,48 @@ class ProgressiveDisclosure:
         "detailed": 2,  # Full element tree with all properties
     }
 
+    LEVEL_NAMES = ("minimal", "standard", "detailed")  # index = level
+
+    # Per-window state packed into one int: level in the low byte,
+    # failure count above it (one dict lookup per request)
+    _LEVEL_MASK = 0xFF
+    _FAILURE_SHIFT = 8
+
     def __init__(self):
-        self._agent_context: Dict[str, int] = {}  # window -> disclosure level seen
-        self._failure_count: Dict[str, int] = {}  # track failures to auto-escalate
+        self._state: Dict[str, int] = {}  # window -> level | failures << 8
 
     def get_disclosure_level(self, window_selector: str) -> str:
         """Get current disclosure level for a window."""
-        level = self._agent_context.get(window_selector, 0)
-        failures = self._failure_count.get(window_selector, 0)
+        state = self._state.get(window_selector, 0)
+        level = state & self._LEVEL_MASK
+        failures = state >> self._FAILURE_SHIFT
 
         # Auto-escalate after failures
-        effective_level = min(level + failures, 2)
-
-        if effective_level == 0:
-            return "minimal"
-        elif effective_level == 1:
-            return "standard"
-        else:
-            return "detailed"
+        return self.LEVEL_NAMES[min(level + failures, 2)]
 
     def record_request(
         self, window_selector: str, explicit_level: Optional[str] = None
     ):
         """Record that agent made a request (auto-escalates disclosure)."""
+        state = self._state.get(window_selector, 0)
         if explicit_level and explicit_level in self.DISCLOSURE_LEVELS:
-            self._agent_context[window_selector] = self.DISCLOSURE_LEVELS[
-                explicit_level
-            ]
+            level = self.DISCLOSURE_LEVELS[explicit_level]
         else:
-            current = self._agent_context.get(window_selector, 0)
-            self._agent_context[window_selector] = min(current + 1, 2)
+            level = min((state & self._LEVEL_MASK) + 1, 2)
+        self._state[window_selector] = (state & ~self._LEVEL_MASK) | level
 
     def record_failure(self, window_selector: str):
         """Record that an operation failed (triggers more detail on next request)."""
-        current = self._failure_count.get(window_selector, 0)
-        self._failure_count[window_selector] = current + 1
+        self._state[window_selector] = self._state.get(window_selector, 0) + (
+            1 << self._FAILURE_SHIFT
+        )
 
     def reset(self, window_selector: Optional[str] = None):
         """Reset disclosure state."""
         if window_selector:
-            self._agent_context.pop(window_selector, None)
-            self._failure_count.pop(window_selector, None)
+            self._state.pop(window_selector, None)
         else:
-            self._agent_context.clear()
-            self._failure_count.clear()
+            self._state.clear()
 
 
 class WindowStateTracker:
@@ -377,42 +374,37 @@ class WindowStateTracker:
 
     def compute_hash(self, window_info: Dict[str, Any]) -> str:
         """Compute a state hash from window info."""
-        # Extract key state indicators
-        state_parts = [
-            str(window_info.get("bounds", "")),
-            str(window_info.get("element_count", 0)),
-            str(window_info.get("title", "")),
-        ]
+        # Key state indicators go straight into the hasher (no joined string)
+        h = _hasher(digest_size=6)
+        h.update(str(window_info.get("bounds", "")).encode("utf-8"))
+        h.update(b"|")
+        h.update(str(window_info.get("element_count", 0)).encode("utf-8"))
+        h.update(b"|")
+        h.update(str(window_info.get("title", "")).encode("utf-8"))
 
         # Include key element names if available
-        key_elements = window_info.get("key_elements", [])
-        if key_elements:
-            element_names = [e.get("name", "") for e in key_elements[:5]]
-            state_parts.extend(element_names)
+        for element in (window_info.get("key_elements") or [])[:5]:
+            h.update(b"|")
+            h.update(str(element.get("name", "")).encode("utf-8"))
 
-        state_str = "|".join(state_parts)
-        return hashlib.md5(state_str.encode()).hexdigest()[:12]
+        return h.hexdigest()[:12]
 
     def check_changed(self, window_selector: str, new_info: Dict[str, Any]) -> bool:
         """Check if window state has changed since last check."""
         new_hash = self.compute_hash(new_info)
         old_hash = self._state_hashes.get(window_selector)
 
-        if old_hash is None:
-            self._state_hashes[window_selector] = new_hash
-            self._last_check[window_selector] = time.time()
-            return False  # First check, not a change
-
-        changed = new_hash != old_hash
         self._state_hashes[window_selector] = new_hash
-        self._last_check[window_selector] = time.time()
+        self._last_check[window_selector] = time.monotonic()
 
-        return changed
+        if old_hash is None:
+            return False  # First check, not a change
+        return new_hash != old_hash
 
     def should_recheck(self, window_selector: str) -> bool:
         """Check if enough time has passed to recheck window state."""
-        last = self._last_check.get(window_selector, 0)
-        return time.time() - last > self._check_interval
+        last = self._last_check.get(window_selector)
+        return last is None or time.monotonic() - last > self._check_interval
 
     def get_hash(self, window_selector: str) -> Optional[str]:
         """Get current hash for a window."""
@@ -439,32 +431,36 @@ class ContextManager:
     """
 
     # Commands that should be cached
-    CACHEABLE_COMMANDS = {
-        "explore",
-        "explore_window",
-        "get_window_summary",
-        "get_interactive_elements",
-        "find_element",
-        "element_exists",
-        "get_element_brief",
-        "get_window_info",
-    }
+    CACHEABLE_COMMANDS = frozenset(
+        {
+            "explore",
+            "explore_window",
+            "get_window_summary",
+            "get_interactive_elements",
+            "find_element",
+            "element_exists",
+            "get_element_brief",
+            "get_window_info",
+        }
+    )
 
     # Commands that modify state (invalidate cache)
-    STATE_MODIFYING_COMMANDS = {
-        "click",
-        "double_click",
-        "right_click",
-        "type",
-        "hotkey",
-        "key_press",
-        "smart_click",
-        "smart_type",
-        "vision_click",
-        "close_window",
-        "minimize_window",
-        "maximize_window",
-    }
+    STATE_MODIFYING_COMMANDS = frozenset(
+        {
+            "click",
+            "double_click",
+            "right_click",
+            "type",
+            "hotkey",
+            "key_press",
+            "smart_click",
+            "smart_type",
+            "vision_click",
+            "close_window",
+            "minimize_window",
+            "maximize_window",
+        }
+    )
 
     def __init__(self):
         self.cache = SemanticCache()
@@ -472,6 +468,37 @@ class ContextManager:
         self.disclosure = ProgressiveDisclosure()
         self.state_tracker = WindowStateTracker()
         self._enabled = True
+        # Guards cache/disclosure state shared with the hash worker
+        self._lock = threading.Lock()
+        # (window_selector, window data) pairs hashed off the request path
+        self._hash_queue: "queue.SimpleQueue[Tuple[str, Dict[str, Any]]]" = (
+            queue.SimpleQueue()
+        )
+        self._hash_worker: Optional[threading.Thread] = None
+
+    def _queue_state_hash(self, window_selector: str, data: Dict[str, Any]):
+        """Hash a window summary and update the cache in the background."""
+        if self._hash_worker is None:
+            with self._lock:
+                if self._hash_worker is None:
+                    self._hash_worker = threading.Thread(
+                        target=self._run_hash_worker,
+                        name="ContextStateHash",
+                        daemon=True,
+                    )
+                    self._hash_worker.start()
+        self._hash_queue.put((window_selector, data))
+
+    def _run_hash_worker(self):
+        """Worker loop: compute state hashes, then invalidate under the lock"""
+        while True:
+            window_selector, data = self._hash_queue.get()
+            try:
+                new_hash = self.state_tracker.compute_hash(data)
+                with self._lock:
+                    self.cache.update_window_hash(window_selector, new_hash)
+            except Exception:
+                logging.exception("Window state hash update failed")
 
     def is_enabled(self) -> bool:
         return self._enabled
@@ -495,7 +522,24 @@ class ContextManager:
         if action not in self.CACHEABLE_COMMANDS:
             return (False, None)
 
-        return self.cache.get(action, params)
+        with self._lock:
+            return self.cache.get(action, params)
+
+    def get_cached_with_key(
+        self, action: str, params: Dict[str, Any]
+    ) -> Tuple[bool, Any, Optional[Hashable]]:
+        """
+        Like get_cached(), plus the cache key to pass to process_response()
+        as cache_key (None when the command is not cached).
+
+        Returns:
+            Tuple of (cache_hit: bool, response: Any or None, cache_key)
+        """
+        if not self._enabled or action not in self.CACHEABLE_COMMANDS:
+            return (False, None, None)
+
+        with self._lock:
+            return self.cache.get_with_key(action, params)
 
     def process_response(
         self,
@@ -503,6 +547,7 @@ class ContextManager:
         params: Dict[str, Any],
         response: Dict[str, Any],
         compress: bool = True,
+        cache_key: Optional[Hashable] = None,
     ) -> Dict[str, Any]:
         """
         Process and optionally cache a response.
@@ -514,6 +559,8 @@ class ContextManager:
             params: The parameters used
             response: The raw response from MainAgentService
             compress: Whether to compress the response
+            cache_key: Key from get_cached_with_key() for the same command
+                (skips normalizing the params again)
 
         Returns:
             Processed (possibly compressed) response
@@ -525,24 +572,29 @@ class ContextManager:
         if action in self.STATE_MODIFYING_COMMANDS:
             window_selector = params.get("window") or params.get("selector")
             if window_selector:
-                self.cache.invalidate_window(window_selector)
+                self.invalidate_window(window_selector)
 
         # Cache if appropriate
         if action in self.CACHEABLE_COMMANDS and response.get("status") == "success":
-            self.cache.set(action, params, response)
-
-            # Update window state hash if we have summary info
+            with self._lock:
+                if cache_key is None:
+                    self.cache.set(action, params, response)
+                else:
+                    self.cache.set_with_key(cache_key, action, params, response)
+
+            # Update window state hash if we have summary info; hashing and
+            # the invalidation it triggers run on the hash worker
             if action in ("get_window_summary", "explore_window"):
                 window_selector = params.get("selector") or params.get("window")
                 if window_selector and "data" in response:
-                    new_hash = self.state_tracker.compute_hash(response.get("data", {}))
-                    self.cache.update_window_hash(window_selector, new_hash)
+                    self._queue_state_hash(window_selector, response.get("data", {}))
 
         # Track failures for progressive disclosure
         if response.get("status") == "error":
             window_selector = params.get("window") or params.get("selector")
             if window_selector:
-                self.disclosure.record_failure(window_selector)
+                with self._lock:
+                    self.disclosure.record_failure(window_selector)
 
         # Compress if requested
         if compress:
@@ -550,14 +602,21 @@ class ContextManager:
 
         return response
 
+    def invalidate_window(self, window_selector: str):
+        """Invalidate all cache entries for a window."""
+        with self._lock:
+            self.cache.invalidate_window(window_selector)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get context manager statistics."""
-        return {"enabled": self._enabled, "cache": self.cache.get_stats()}
+        with self._lock:
+            return {"enabled": self._enabled, "cache": self.cache.get_stats()}
 
     def clear(self):
         """Clear all caches and state."""
-        self.cache.clear()
-        self.disclosure.reset()
+        with self._lock:
+            self.cache.clear()
+            self.disclosure.reset()
 
 
 # Singleton instance for use across the bridge
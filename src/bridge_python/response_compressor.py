@@ -0,0 +1,170 @@
+"""
+Response compression for the context manager
+
+ResponseCompressor walks agent responses and keeps only what an agent needs
+(essential element fields, truncated text, summarized element lists). It is
+fully annotated and has no dependencies beyond the standard library, so the
+module can be compiled with mypyc for a faster recursive walk; the plain
+Python module is used when no compiled build is present.
+"""
+
+from typing import Any, ClassVar, Dict, List, Tuple
+
+
+class ResponseCompressor:
+    """
+    Compresses verbose responses to reduce token consumption.
+
+    Strategies:
+    - Remove empty/null fields
+    - Truncate long text content
+    - Summarize large element lists
+    - Extract only essential properties
+    """
+
+    MAX_TEXT_LENGTH: ClassVar[int] = 100
+    MAX_FIELD_LENGTH: ClassVar[int] = 50  # per element field
+    MAX_ELEMENTS_FULL: ClassVar[int] = 10
+    MAX_ELEMENTS_SUMMARY: ClassVar[int] = 50
+    # Responses with at most this many leaf values are checked, not rebuilt
+    SMALL_RESPONSE_KEYS: ClassVar[int] = 5
+
+    # Essential fields by response type
+    ESSENTIAL_FIELDS: ClassVar[Dict[str, List[str]]] = {
+        "element": ["name", "type", "id", "x", "y", "w", "h"],
+        "window": ["title", "bounds", "is_enabled"],
+        "summary": ["title", "element_count", "key_elements"],
+    }
+    # ESSENTIAL_FIELDS["element"], resolved once for _compress_element
+    _ELEMENT_FIELDS: ClassVar[Tuple[str, ...]] = tuple(ESSENTIAL_FIELDS["element"])
+
+    @classmethod
+    def compress(
+        cls, response: Dict[str, Any], context: str = "default"
+    ) -> Dict[str, Any]:
+        """
+        Compress a response based on context.
+
+        Args:
+            response: The raw response from MainAgentService
+            context: Hint about what kind of response this is
+
+        Returns:
+            Compressed response
+        """
+        if not isinstance(response, dict):
+            return response
+
+        # Don't compress errors
+        if response.get("status") == "error":
+            return response
+
+        # Small response compression would only copy: return it as-is
+        if len(response) <= cls.SMALL_RESPONSE_KEYS and all(
+            cls._is_kept_leaf(v) for v in response.values()
+        ):
+            return response
+
+        compressed: Dict[str, Any] = {}
+
+        for key, value in response.items():
+            # One type check per value; empty strings/lists are skipped
+            if value is None:
+                continue
+
+            if isinstance(value, str):
+                if not value:
+                    continue
+                if len(value) > cls.MAX_TEXT_LENGTH:
+                    value = f"{value[: cls.MAX_TEXT_LENGTH]}..."
+                compressed[key] = value
+            elif isinstance(value, list):
+                if not value:
+                    continue
+                # Summarize large lists (only the shown elements are walked)
+                if len(value) > cls.MAX_ELEMENTS_FULL:
+                    value = cls._compress_element_list(value)
+                compressed[key] = value
+            elif isinstance(value, dict):
+                compressed[key] = cls._compress_dict(value)
+            else:
+                compressed[key] = value
+
+        return compressed
+
+    @classmethod
+    def _is_kept_leaf(cls, value: Any) -> bool:
+        """True for a value compress() would copy unchanged (no walk needed)."""
+        if value is None or isinstance(value, (list, dict)):
+            return False
+        if isinstance(value, str):
+            return 0 < len(value) <= cls.MAX_TEXT_LENGTH
+        return True
+
+    @classmethod
+    def _compress_element_list(cls, elements: List[Any]) -> Dict[str, Any]:
+        """Compress a list of elements to a summary."""
+        count = len(elements)
+        if not count:
+            return {"count": 0, "elements": []}
+
+        # Slice first, so only the shown elements are compressed
+        compressed_elements = [
+            cls._compress_element(e) if isinstance(e, dict) else e
+            for e in elements[: cls.MAX_ELEMENTS_FULL]
+        ]
+
+        return {
+            "count": count,
+            "showing": min(count, cls.MAX_ELEMENTS_FULL),
+            "elements": compressed_elements,
+        }
+
+    @classmethod
+    def _compress_element(cls, element: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract essential fields from an element."""
+        essential: Dict[str, Any] = {}
+        for name in cls._ELEMENT_FIELDS:
+            value = element.get(name)
+            if value:
+                if isinstance(value, str) and len(value) > cls.MAX_FIELD_LENGTH:
+                    value = f"{value[: cls.MAX_FIELD_LENGTH]}..."
+                essential[name] = value
+
+        # Add automation_id if present and different from name
+        automation_id = element.get("automation_id")
+        if automation_id and automation_id != element.get("name"):
+            essential["id"] = automation_id
+
+        return essential if essential else element
+
+    @classmethod
+    def _compress_dict(cls, d: Dict[str, Any]) -> Dict[str, Any]:
+        """Recursively compress a dictionary."""
+        # Leaf dicts (e.g. bounds) with nothing to drop are returned as-is,
+        # without a recursive walk or a copy
+        if not any(
+            v is None or isinstance(v, (dict, list)) or (isinstance(v, str) and not v)
+            for v in d.values()
+        ):
+            return d
+
+        result: Dict[str, Any] = {}
+        for key, value in d.items():
+            # Dispatch on type; emptiness is checked only for str/list
+            if value is None:
+                continue
+            if isinstance(value, dict):
+                result[key] = cls._compress_dict(value)
+            elif isinstance(value, list):
+                if not value:
+                    continue
+                if len(value) > cls.MAX_ELEMENTS_FULL:
+                    value = cls._compress_element_list(value)
+                result[key] = value
+            elif isinstance(value, str):
+                if value:
+                    result[key] = value
+            else:
+                result[key] = value
+        return result
@@ -1,11 +1,27 @@
 """
 Vision module for Windows Desktop Automation v4.0
 Provides AI-powered UI element detection using OmniParser + Windows OCR
+
+Submodules are imported lazily so that lightweight helpers (e.g. vision.capture)
+can be used without loading ONNX Runtime and the OCR engines.
 """
 
-from .detector import VisionDetector
-from .ocr import WindowsOCR
-from .vision_service import VisionService
+import importlib
+
+_LAZY_EXPORTS = {
+    "VisionDetector": ".detector",
+    "WindowsOCR": ".ocr",
+    "VisionService": ".vision_service",
+}
 
 __all__ = ["VisionDetector", "WindowsOCR", "VisionService"]
 __version__ = "4.0.0"
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
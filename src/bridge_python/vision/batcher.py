@@ -0,0 +1,153 @@
+"""
+DetectionBatcher - Coalesces concurrent OmniParser requests into batched passes
+
+Flask serves requests on worker threads. When several /vision/detect calls
+arrive within a few milliseconds, running them one by one pays the model's
+per-call overhead each time. The batcher collects screenshots for up to
+max_queue_time (or until max_batch_size is reached) and hands them to
+VisionService.detect_elements_batch() in one go. It only waits when there is
+concurrency to exploit: a lone request on an idle batcher runs immediately.
+
+A single worker thread owns the model, so at most one batch runs at a time.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+
+class DetectionBatcher:
+    """
+    Thread-based request coalescer in front of VisionService.
+
+    Usage:
+        batcher = DetectionBatcher(service)
+        elements = batcher.detect(screenshot)  # blocks until the batch completes
+    """
+
+    def __init__(
+        self,
+        service,
+        max_batch_size: int = 8,
+        max_queue_time: float = 0.015,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            service: VisionService providing detect_elements_batch()
+            max_batch_size: Maximum screenshots per batched call
+            max_queue_time: Seconds to wait for more requests after the first one
+        """
+        self._service = service
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._queue: "queue.Queue[Tuple[Image.Image, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "max_batch": 0}
+        # Size of the previous batch: > 1 means requests are arriving together
+        self._last_batch = 0
+
+    def _ensure_worker(self):
+        """Start the worker thread on first use"""
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="DetectionBatcher", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, image: Image.Image) -> Future:
+        """
+        Queue a screenshot for detection.
+
+        Returns:
+            Future resolving to the List[UIElement] for this image
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((image, future))
+        return future
+
+    def detect(self, image: Image.Image, timeout: Optional[float] = None):
+        """Queue a screenshot and wait for its detections"""
+        return self.submit(image).result(timeout=timeout)
+
+    def _collect(self) -> List[Tuple[Image.Image, Future]]:
+        """
+        Block for one request, then gather more until full or timed out.
+
+        Requests already queued (e.g. those that arrived during the previous
+        batch) are taken without waiting. The worker lingers for
+        max_queue_time only when that found company or the previous batch
+        had several requests; a lone request on an idle batcher is
+        dispatched at once instead of paying the wait.
+        """
+        items = [self._queue.get()]
+        while len(items) < self.max_batch_size:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if len(items) == 1 and self._last_batch <= 1:
+            return items
+
+        deadline = time.monotonic() + self.max_queue_time
+
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _run(self):
+        """Worker loop: run each collected batch through the service"""
+        while True:
+            items = self._collect()
+            # Skip requests whose caller has already given up
+            items = [
+                (img, fut) for img, fut in items if fut.set_running_or_notify_cancel()
+            ]
+            if not items:
+                continue
+
+            self._last_batch = len(items)
+            self._stats["requests"] += len(items)
+            self._stats["batches"] += 1
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(items))
+
+            try:
+                results = self._service.detect_elements_batch(
+                    [img for img, _ in items]
+                )
+            except Exception as e:
+                logging.exception("Batched detection failed")
+                for _, fut in items:
+                    fut.set_exception(e)
+                continue
+
+            for (_, fut), elements in zip(items, results):
+                fut.set_result(elements)
+
+    def get_stats(self) -> dict:
+        """Batching statistics"""
+        stats = dict(self._stats)
+        stats["avg_batch"] = (
+            round(stats["requests"] / stats["batches"], 2) if stats["batches"] else 0
+        )
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_queue_time_ms"] = int(self.max_queue_time * 1000)
+        return stats
@@ -0,0 +1,253 @@
+"""
+Screen capture helpers for the vision layer
+
+Backends, fastest first:
+- dxcam: DXGI Desktop Duplication. Frames come from the GPU as BGRA arrays
+  without a GDI BitBlt, and an unchanged desktop costs nothing to re-read.
+- mss: BitBlt via ctypes (no PIL grab path). mss handles are not
+  thread-safe, so each Flask worker thread keeps its own instance.
+- PIL.ImageGrab as the last resort.
+"""
+
+import struct
+import threading
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageGrab
+
+# Try to import dxcam (DXGI Desktop Duplication)
+_DXCAM_AVAILABLE = False
+
+try:
+    import dxcam
+
+    _DXCAM_AVAILABLE = True
+except ImportError:
+    pass
+
+# Try to import mss (faster capture than ImageGrab)
+_MSS_AVAILABLE = False
+
+try:
+    import mss
+
+    _MSS_AVAILABLE = True
+except ImportError:
+    pass
+
+_tls = threading.local()
+
+# One duplication per output: dxcam state is shared and guarded by a lock
+_camera = None
+_camera_lock = threading.Lock()
+_last_frame: Optional[np.ndarray] = None
+
+
+def _get_sct():
+    """Get the mss instance bound to the current thread"""
+    sct = getattr(_tls, "sct", None)
+    if sct is None:
+        sct = mss.mss()
+        _tls.sct = sct
+    return sct
+
+
+def _grab_mss(bbox: Optional[Tuple[int, int, int, int]]):
+    """Grab with the thread's mss instance; returns the raw ScreenShot"""
+    sct = _get_sct()
+    if bbox:
+        left, top, right, bottom = bbox
+        area = {
+            "left": left,
+            "top": top,
+            "width": right - left,
+            "height": bottom - top,
+        }
+    else:
+        area = sct.monitors[1]
+    return sct.grab(area)
+
+
+def _grab_dxcam() -> Optional[np.ndarray]:
+    """
+    Full primary-monitor BGRA frame via DXGI, or None if DXGI is unusable.
+
+    dxcam returns None when nothing changed since the previous grab; the
+    previous frame is returned then, so callers always get pixels.
+    """
+    global _DXCAM_AVAILABLE, _camera, _last_frame
+
+    with _camera_lock:
+        try:
+            if _camera is None:
+                _camera = dxcam.create(output_color="BGRA")
+                if _camera is None:
+                    raise RuntimeError("no DXGI output")
+            frame = _camera.grab()
+        except Exception:
+            # No duplication available (e.g. RDP session, no GPU output)
+            _DXCAM_AVAILABLE = False
+            return None
+
+        if frame is not None:
+            _last_frame = frame
+        return _last_frame
+
+
+def _grab_bgra(bbox: Optional[Tuple[int, int, int, int]]) -> Optional[np.ndarray]:
+    """
+    Capture as an (H, W, 4) BGRA array with the fastest available backend.
+
+    Regions of a DXGI frame are views (no copy). Returns None when only
+    ImageGrab is available.
+    """
+    if _DXCAM_AVAILABLE:
+        frame = _grab_dxcam()
+        if frame is not None:
+            if bbox:
+                left, top, right, bottom = bbox
+                return frame[top:bottom, left:right]
+            return frame
+
+    if _MSS_AVAILABLE:
+        shot = _grab_mss(bbox)
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(
+            shot.height, shot.width, 4
+        )
+
+    return None
+
+
+def grab_screen(bbox: Optional[Tuple[int, int, int, int]] = None) -> Image.Image:
+    """
+    Capture the primary monitor, or only a region of it.
+
+    Args:
+        bbox: Optional (left, top, right, bottom) box in screen coordinates.
+              Only these pixels are copied when given.
+
+    Returns:
+        PIL Image in RGB mode
+    """
+    bgra = _grab_bgra(bbox)
+    if bgra is None:
+        return ImageGrab.grab(bbox=bbox)
+
+    height, width = bgra.shape[:2]
+    # Decode BGRA straight into an RGB image (single pass, no intermediate copy)
+    return Image.frombuffer(
+        "RGB", (width, height), np.ascontiguousarray(bgra), "raw", "BGRX"
+    )
+
+
+def grab_screen_array(bbox: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+    """
+    Capture the screen as an (H, W, 3) RGB ndarray.
+
+    With dxcam/mss this is a strided view over the captured BGRA buffer, so
+    no pixel is copied until a consumer (tile normalization, OCR encode)
+    reads it.
+
+    Args:
+        bbox: Optional (left, top, right, bottom) box in screen coordinates
+
+    Returns:
+        (H, W, 3) uint8 RGB array (may be non-contiguous)
+    """
+    bgra = _grab_bgra(bbox)
+    if bgra is None:
+        return np.asarray(ImageGrab.grab(bbox=bbox).convert("RGB"))
+    return bgra[:, :, 2::-1]
+
+
+def grab_screen_bgra(bbox: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+    """
+    Capture the screen as an (H, W, 4) BGRA ndarray, the grabber's native
+    layout. Encoders that take BGRA (libjpeg-turbo) need no color conversion.
+
+    Args:
+        bbox: Optional (left, top, right, bottom) box in screen coordinates
+
+    Returns:
+        (H, W, 4) uint8 BGRA array (may be non-contiguous for regions)
+    """
+    bgra = _grab_bgra(bbox)
+    if bgra is None:
+        rgba = np.asarray(ImageGrab.grab(bbox=bbox).convert("RGBA"))
+        return rgba[:, :, [2, 1, 0, 3]]
+    return bgra
+
+
+@lru_cache(maxsize=8)
+def bmp_header(width: int, height: int) -> bytes:
+    """
+    54-byte header for an uncompressed top-down 32-bit BMP.
+
+    A negative height marks the rows as top-down, so the BGRA capture buffer
+    can follow the header unchanged (no row flip, no padding).
+    """
+    image_size = width * height * 4
+    return struct.pack(
+        "<2sIHHIIiiHHIIiiII",
+        b"BM",
+        54 + image_size,  # file size
+        0,
+        0,
+        54,  # pixel data offset
+        40,  # BITMAPINFOHEADER size
+        width,
+        -height,
+        1,  # planes
+        32,  # bits per pixel
+        0,  # BI_RGB
+        image_size,
+        2835,  # 72 DPI
+        2835,
+        0,
+        0,
+    )
+
+
+def grab_screen_bmp(bbox: Optional[Tuple[int, int, int, int]] = None) -> bytes:
+    """
+    Capture the screen as a raw BMP file (no compression, no base64).
+
+    With dxcam/mss this is the captured BGRA buffer behind a cached header,
+    so the only cost beyond the grab is one memory copy.
+
+    Args:
+        bbox: Optional (left, top, right, bottom) box in screen coordinates
+
+    Returns:
+        BMP file bytes
+    """
+    bgra = _grab_bgra(bbox)
+    if bgra is None:
+        image = ImageGrab.grab(bbox=bbox).convert("RGB")
+        return bmp_header(*image.size) + image.tobytes("raw", "BGRX")
+
+    height, width = bgra.shape[:2]
+    return b"".join((bmp_header(width, height), np.ascontiguousarray(bgra).data))
+
+
+def get_screen_size() -> Optional[Tuple[int, int]]:
+    """
+    (width, height) of the primary monitor without capturing it.
+
+    Returns None when only ImageGrab is available (no cheap way to ask).
+    """
+    if _DXCAM_AVAILABLE and _last_frame is not None:
+        return _last_frame.shape[1], _last_frame.shape[0]
+    if _MSS_AVAILABLE:
+        monitor = _get_sct().monitors[1]
+        return monitor["width"], monitor["height"]
+    return None
+
+
+def get_capture_backend() -> str:
+    """Name of the capture backend in use"""
+    if _DXCAM_AVAILABLE:
+        return "dxcam"
+    return "mss" if _MSS_AVAILABLE else "imagegrab"
@@ -0,0 +1,146 @@
+"""
+CaptureWorker - Single capture/encode thread for screenshot endpoints
+
+Screenshot requests hand their parameters to one worker thread and wait on a
+Future. Requests that arrive while a capture is in progress are served by
+the next capture together: the screen is grabbed once and encoded once per
+distinct parameter set, instead of every Flask thread grabbing and encoding
+the same pixels side by side.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from .capture import grab_screen_bgra
+from .vision_service import OptimizedScreenshot, optimize_screenshot
+
+# (max_width, max_height, jpeg_quality, include_thumbnail, thumbnail_max_size,
+#  image_format, encode_base64) - positional arguments of optimize_screenshot
+CaptureParams = Tuple
+
+
+class CaptureWorker:
+    """
+    Thread that captures and encodes screenshots on behalf of endpoints.
+
+    Usage:
+        worker = get_capture_worker()
+        optimized = worker.screenshot(max_width=1920, max_height=1080)
+    """
+
+    def __init__(self):
+        self._queue: "queue.SimpleQueue[Tuple[CaptureParams, Future]]" = (
+            queue.SimpleQueue()
+        )
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "captures": 0, "encodes": 0}
+
+    def _ensure_worker(self):
+        """Start the worker thread on first use"""
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="CaptureWorker", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, params: CaptureParams) -> Future:
+        """
+        Queue a screenshot request.
+
+        Returns:
+            Future resolving to an OptimizedScreenshot
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((params, future))
+        return future
+
+    def screenshot(
+        self,
+        max_width: Optional[int] = None,
+        max_height: Optional[int] = None,
+        jpeg_quality: Optional[int] = None,
+        include_thumbnail: bool = False,
+        thumbnail_max_size: int = 400,
+        image_format: Optional[str] = None,
+        encode_base64: bool = True,
+        timeout: Optional[float] = 10.0,
+    ) -> OptimizedScreenshot:
+        """Capture and encode a screenshot (same arguments as optimize_screenshot)"""
+        params = (
+            max_width,
+            max_height,
+            jpeg_quality,
+            include_thumbnail,
+            thumbnail_max_size,
+            image_format,
+            encode_base64,
+        )
+        return self.submit(params).result(timeout=timeout)
+
+    def _collect(self) -> List[Tuple[CaptureParams, Future]]:
+        """Block for one request, then take everything else already queued"""
+        items = [self._queue.get()]
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _run(self):
+        """Worker loop: one capture per round, one encode per distinct params"""
+        while True:
+            items = [
+                (params, fut)
+                for params, fut in self._collect()
+                if fut.set_running_or_notify_cancel()
+            ]
+            if not items:
+                continue
+
+            self._stats["requests"] += len(items)
+            self._stats["captures"] += 1
+
+            try:
+                screenshot = grab_screen_bgra()
+            except Exception as e:
+                logging.exception("Screenshot capture failed")
+                for _, fut in items:
+                    fut.set_exception(e)
+                continue
+
+            encoded: Dict[CaptureParams, OptimizedScreenshot] = {}
+            for params, fut in items:
+                try:
+                    if params not in encoded:
+                        encoded[params] = optimize_screenshot(screenshot, *params)
+                        self._stats["encodes"] += 1
+                    fut.set_result(encoded[params])
+                except Exception as e:
+                    fut.set_exception(e)
+
+    def get_stats(self) -> dict:
+        """Capture statistics"""
+        return dict(self._stats)
+
+
+# Global capture worker singleton
+_capture_worker: Optional[CaptureWorker] = None
+_capture_worker_lock = threading.Lock()
+
+
+def get_capture_worker() -> CaptureWorker:
+    """Get or create the singleton CaptureWorker instance."""
+    global _capture_worker
+    if _capture_worker is None:
+        with _capture_worker_lock:
+            if _capture_worker is None:
+                _capture_worker = CaptureWorker()
+    return _capture_worker
@@ -3,15 +3,27 @@ VisionDetector - OmniParser ONNX wrapper for UI element detection
 Detects clickable UI elements in screenshots using the OmniParser icon detection model
 """
 
+import logging
 import os
+import threading
+import time
 import numpy as np
 import onnxruntime as ort
 from PIL import Image
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, Iterator, List, Dict, Tuple, Optional, Union
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import io
 import base64
 
+from . import nms
+from .quantize import int8_path
+
+
+def default_intra_op_threads() -> int:
+    """Intra-op thread count for batch-1 inference: half the cores, at most 4"""
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
 
 @dataclass
 class Detection:
@@ -63,43 +75,219 @@ class VisionDetector:
     # OmniParser preprocessor settings
     MODEL_INPUT_SIZE = 640  # Longest edge
     RESCALE_FACTOR = 1.0 / 255.0  # 0.00392156862745098
+    MAX_NMS_CANDIDATES = 300  # Highest-scoring boxes considered by NMS
+
+    # Accelerated providers in order of preference. DirectML (onnxruntime-directml)
+    # runs on any DX12 GPU or iGPU; OpenVINO (onnxruntime-openvino) speeds up
+    # Intel CPUs/iGPUs. Whatever the installed build lacks is skipped.
+    PREFERRED_PROVIDERS = (
+        "CUDAExecutionProvider",
+        "DmlExecutionProvider",
+        "OpenVINOExecutionProvider",
+    )
 
     def __init__(
-        self, model_path: Optional[str] = None, confidence_threshold: float = 0.15
+        self,
+        model_path: Optional[str] = None,
+        confidence_threshold: float = 0.15,
+        intra_op_num_threads: Optional[int] = None,
+        inter_op_num_threads: int = 1,
+        providers: Optional[List[str]] = None,
     ):
         """
         Initialize the VisionDetector.
 
         Args:
-            model_path: Path to OmniParser ONNX model. If None, uses default location.
+            model_path: Path to OmniParser ONNX model. If None, uses
+                ORT_OMNIPARSER_PATH or the default location (its int8 build
+                from vision.quantize, when present and running on CPU).
             confidence_threshold: Minimum confidence for detections (0-1)
+            intra_op_num_threads: Threads per operator. If None, uses
+                VISION_ORT_THREADS or min(4, half the logical cores).
+            inter_op_num_threads: Threads across operators (only used by
+                parallel execution mode, the session runs sequentially)
+            providers: Execution providers in priority order. If None, uses
+                VISION_ORT_PROVIDERS (comma-separated) or the fastest ones
+                this onnxruntime build offers.
         """
+        if providers is None and os.environ.get("VISION_ORT_PROVIDERS"):
+            providers = [
+                p.strip() for p in os.environ["VISION_ORT_PROVIDERS"].split(",")
+            ]
+        self.providers = providers
+
+        if model_path is None:
+            model_path = os.environ.get("ORT_OMNIPARSER_PATH")
+
         if model_path is None:
             # Default path relative to this file
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             model_path = os.path.join(
                 base_dir, "models", "omniparser-icon_detect_fp16.onnx"
             )
+            # Int8 weights halve CPU latency (VNNI dot products); GPU providers
+            # have no int8 conv kernels and keep the fp16 model
+            quantized = int8_path(model_path)
+            if os.path.exists(quantized) and self._select_providers() == [
+                "CPUExecutionProvider"
+            ]:
+                model_path = quantized
 
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"OmniParser model not found at: {model_path}")
 
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
+        if intra_op_num_threads is None:
+            intra_op_num_threads = int(
+                os.environ.get("VISION_ORT_THREADS", default_intra_op_threads())
+            )
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
         self._session: Optional[ort.InferenceSession] = None
+        self._session_lock = threading.Lock()
+        # Model I/O metadata, read once from the session on load so inference
+        # does not cross into ORT for it on every frame
+        self._input_dtype = np.float32
+        self._input_name = ""
+        self._output_names: List[str] = []
+        self._dynamic_batch = False
+        # Per-thread input tensor + IOBinding, reused across frames
+        self._local = threading.local()
+
+    def _select_providers(self) -> List[str]:
+        """Requested or fastest available providers, always keeping CPU fallback"""
+        available = ort.get_available_providers()
+        candidates = self.providers or self.PREFERRED_PROVIDERS
+        providers = [
+            p for p in candidates if p in available and p != "CPUExecutionProvider"
+        ]
+        providers.append("CPUExecutionProvider")
+        return providers
+
+    def _optimized_model_path(self, providers: List[str]) -> str:
+        """
+        Where the optimized graph for this model is cached.
+
+        ORT_ENABLE_ALL output may contain provider- and version-specific
+        fused nodes, so the file name is keyed by both.
+        """
+        provider = providers[0].replace("ExecutionProvider", "").lower()
+        root, _ = os.path.splitext(self.model_path)
+        return f"{root}.ort{ort.__version__}-{provider}.opt.onnx"
+
+    def _session_options(
+        self, level: ort.GraphOptimizationLevel, providers: List[str]
+    ) -> ort.SessionOptions:
+        """
+        SessionOptions tuned for batch-1 latency.
+
+        ORT's default of one intra-op thread per physical core spends more on
+        waking threads than it saves on a single 640x640 image; a few threads
+        with sequential execution is faster and leaves cores for capture and
+        encoding.
+        """
+        options = ort.SessionOptions()
+        options.graph_optimization_level = level
+        options.intra_op_num_threads = self.intra_op_num_threads
+        options.inter_op_num_threads = self.inter_op_num_threads
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # The export leaves batch, height and width symbolic. Inputs are
+        # always letterboxed to 640x640, so pinning those two lets ORT
+        # resolve shapes at load time; batch stays free for detect_batch.
+        options.add_free_dimension_override_by_name("height", self.MODEL_INPUT_SIZE)
+        options.add_free_dimension_override_by_name("width", self.MODEL_INPUT_SIZE)
+        if "DmlExecutionProvider" in providers:
+            # DirectML does not support memory pattern optimization
+            options.enable_mem_pattern = False
+        return options
+
+    def _create_session(self, providers: List[str]) -> ort.InferenceSession:
+        """
+        Build the session, reusing the optimized graph from a previous run.
+
+        The first launch runs the full graph optimization and saves the result
+        next to the model; later launches load that file with optimization
+        off. A cache that is stale (older than the model) or fails to load is
+        rebuilt, and a read-only model directory just means no caching.
+        """
+        cache_path = self._optimized_model_path(providers)
+        if os.environ.get("ORT_OPTIMIZED_CACHE", "1") != "0":
+            if os.path.exists(cache_path) and os.path.getmtime(
+                cache_path
+            ) >= os.path.getmtime(self.model_path):
+                options = self._session_options(
+                    ort.GraphOptimizationLevel.ORT_DISABLE_ALL, providers
+                )
+                try:
+                    session = ort.InferenceSession(
+                        cache_path, sess_options=options, providers=providers
+                    )
+                    logging.debug(f"Loaded optimized OmniParser graph {cache_path}")
+                    return session
+                except Exception as e:
+                    logging.warning(f"Discarding optimized model cache: {e}")
+
+            options = self._session_options(
+                ort.GraphOptimizationLevel.ORT_ENABLE_ALL, providers
+            )
+            options.optimized_model_filepath = cache_path
+            try:
+                return ort.InferenceSession(
+                    self.model_path, sess_options=options, providers=providers
+                )
+            except Exception as e:
+                logging.warning(f"Could not write optimized model cache: {e}")
+
+        options = self._session_options(
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL, providers
+        )
+        return ort.InferenceSession(
+            self.model_path, sess_options=options, providers=providers
+        )
 
     @property
     def session(self) -> ort.InferenceSession:
-        """Lazy load the ONNX session"""
+        """
+        Lazy load the ONNX session.
+
+        One session is shared by all Flask worker threads (InferenceSession.run
+        is thread-safe); the lock keeps concurrent first requests from each
+        building their own session and CUDA context.
+        """
         if self._session is None:
-            # Use CPU provider for compatibility
-            self._session = ort.InferenceSession(
-                self.model_path, providers=["CPUExecutionProvider"]
-            )
+            with self._session_lock:
+                if self._session is None:
+                    start = time.time()
+                    session = self._create_session(self._select_providers())
+                    # A model exported with a float16 input is fed float16
+                    # directly (half the input bytes, no Cast on ORT's side).
+                    # The bundled model declares float32 and casts internally.
+                    model_input = session.get_inputs()[0]
+                    if model_input.type == "tensor(float16)":
+                        self._input_dtype = np.float16
+                    self._input_name = model_input.name
+                    self._output_names = [session.get_outputs()[0].name]
+                    self._dynamic_batch = not isinstance(model_input.shape[0], int)
+                    self._session = session
+                    elapsed_ms = (time.time() - start) * 1000
+                    logging.debug(
+                        f"OmniParser session created in {elapsed_ms:.0f} ms "
+                        f"(thread {threading.current_thread().name}, "
+                        f"providers {self._session.get_providers()}, "
+                        f"intra-op threads {self.intra_op_num_threads}, "
+                        f"input {np.dtype(self._input_dtype).name})"
+                    )
         return self._session
 
+    @property
+    def input_dtype(self) -> type:
+        """NumPy dtype of the model input tensor (loads the session)"""
+        _ = self.session
+        return self._input_dtype
+
     def _preprocess_image(
-        self, image: Image.Image
+        self, image: Union[Image.Image, np.ndarray], out: Optional[np.ndarray] = None
     ) -> Tuple[np.ndarray, float, float, int, int]:
         """
         Preprocess image for OmniParser model.
@@ -109,11 +297,33 @@ class VisionDetector:
         then pad with gray to fill the square.
 
         Args:
-            image: PIL Image in RGB format
+            image: PIL Image in RGB format, or (H, W, 3) RGB ndarray
+            out: (1, 3, 640, 640) tensor of the model input dtype to write
+                into instead of allocating one
 
         Returns:
             Tuple of (preprocessed_array, scale_x, scale_y, pad_x, pad_y)
         """
+        size = self.MODEL_INPUT_SIZE
+        if out is None:
+            out = np.empty((1, 3, size, size), dtype=self.input_dtype)
+
+        if isinstance(image, np.ndarray):
+            height, width = image.shape[:2]
+            if width == height == size:
+                # Exact-size tile: normalize + HWC->CHW straight from the
+                # frame buffer into the input tensor (single pixel pass)
+                np.multiply(
+                    image.transpose(2, 0, 1),
+                    np.float32(self.RESCALE_FACTOR),
+                    out=out[0],
+                    casting="unsafe",
+                )
+                return out, 1.0, 1.0, 0, 0
+            image = Image.fromarray(image)
+
+        if image.mode != "RGB":
+            image = image.convert("RGB")
         original_width, original_height = image.size
 
         # Calculate scale to fit within MODEL_INPUT_SIZE while maintaining aspect ratio
@@ -124,46 +334,46 @@ class VisionDetector:
         new_width = int(original_width * scale)
         new_height = int(original_height * scale)
 
-        # Resize image
-        resized = image.resize((new_width, new_height), Image.Resampling.BILINEAR)
-
-        # Create square canvas with gray background (114 is standard YOLO padding)
-        canvas = Image.new(
-            "RGB", (self.MODEL_INPUT_SIZE, self.MODEL_INPUT_SIZE), (114, 114, 114)
-        )
-
         # Calculate padding to center the image
         pad_x = (self.MODEL_INPUT_SIZE - new_width) // 2
         pad_y = (self.MODEL_INPUT_SIZE - new_height) // 2
 
-        # Paste resized image onto canvas
-        canvas.paste(resized, (pad_x, pad_y))
-
-        # Convert to numpy and normalize
-        img_array = np.array(canvas, dtype=np.float32)
-        img_array = img_array * self.RESCALE_FACTOR
-
-        # Transpose from HWC to CHW format
-        img_array = np.transpose(img_array, (2, 0, 1))
+        # Resize image
+        resized = np.asarray(
+            image.resize((new_width, new_height), Image.Resampling.BILINEAR)
+        )
 
-        # Add batch dimension
-        img_array = np.expand_dims(img_array, axis=0)
+        # Letterbox, normalize and HWC->CHW in one pass: only the borders
+        # get the gray padding (114 is standard YOLO padding) and the resized
+        # pixels are scaled straight into their centered window
+        gray = np.float32(114) * np.float32(self.RESCALE_FACTOR)
+        bottom, right = pad_y + new_height, pad_x + new_width
+        out[0, :, :pad_y] = gray
+        out[0, :, bottom:] = gray
+        out[0, :, pad_y:bottom, :pad_x] = gray
+        out[0, :, pad_y:bottom, right:] = gray
+        np.multiply(
+            resized.transpose(2, 0, 1),
+            np.float32(self.RESCALE_FACTOR),
+            out=out[0, :, pad_y:bottom, pad_x:right],
+            casting="unsafe",
+        )
 
         # Calculate scale factor to convert back to original resolution
         # We use the same scale for both axes since we maintain aspect ratio
         inverse_scale = 1.0 / scale
 
-        return img_array, inverse_scale, inverse_scale, pad_x, pad_y
+        return out, inverse_scale, inverse_scale, pad_x, pad_y
 
-    def _postprocess_output(
+    def _postprocess_arrays(
         self,
         output: np.ndarray,
         scale: float,
         pad_x: int,
         pad_y: int,
-    ) -> List[Detection]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Convert model output to Detection objects.
+        Convert model output to detection arrays.
 
         The model outputs YOLO-style format: [batch, 5, num_boxes]
         where 5 = [x_center, y_center, width, height, confidence]
@@ -175,127 +385,215 @@ class VisionDetector:
             pad_y: Y padding added during preprocessing
 
         Returns:
-            List of Detection objects
+            (boxes, scores): (N, 4) int64 [x, y, width, height] rows (center
+            and size in original resolution, like Detection) and (N,) float64
+            confidences, highest first
         """
-        # Output shape: [1, 5, N] where N is number of detection boxes
-        # Transpose to [N, 5] for easier processing
-        predictions = output[0].T  # [N, 5]
-
-        detections = []
-        for pred in predictions:
-            x_center, y_center, width, height, confidence = pred
-
-            if confidence < self.confidence_threshold:
-                continue
+        # Output shape: [1, 5, N] where N is number of detection boxes.
+        # Filter by confidence on whole columns first; only the survivors
+        # (typically tens out of thousands) are scaled and suppressed
+        preds = output[0]
+        keep = np.flatnonzero(preds[4] >= self.confidence_threshold)
+        if keep.size == 0:
+            return np.empty((0, 4), dtype=np.int64), np.empty(0)
+        if keep.size > self.MAX_NMS_CANDIDATES:
+            # Bound NMS work when the model is unsure (low thresholds can let
+            # thousands through): keep the top-K by score, in original order
+            top = np.argpartition(-preds[4, keep], self.MAX_NMS_CANDIDATES - 1)
+            keep = np.sort(keep[top[: self.MAX_NMS_CANDIDATES]])
+        x_center, y_center, width, height, confidence = preds.take(
+            keep, axis=1
+        ).astype(np.float64)
+
+        # Remove padding offset and scale to original resolution
+        # (astype truncates toward zero, like int())
+        boxes = np.stack(
+            (x_center - pad_x, y_center - pad_y, width, height), axis=1
+        )
+        boxes = (boxes * scale).astype(np.int64)
 
-            # Remove padding offset and scale to original resolution
-            x = int((x_center - pad_x) * scale)
-            y = int((y_center - pad_y) * scale)
-            w = int(width * scale)
-            h = int(height * scale)
+        # Skip detections that are mostly in the padding area, then sort by
+        # confidence (highest first; stable, like list.sort)
+        inside = np.flatnonzero((boxes[:, 0] >= 0) & (boxes[:, 1] >= 0))
+        order = inside[np.argsort(-confidence[inside], kind="stable")]
+        boxes, confidence = boxes[order], confidence[order]
 
-            # Skip detections that are mostly in the padding area
-            if x < 0 or y < 0:
-                continue
+        # Apply NMS (Non-Maximum Suppression) to remove overlapping boxes,
+        # on [left, top, right, bottom] edges (same as Detection.bounds)
+        half = boxes[:, 2:] // 2
+        edges = np.concatenate((boxes[:, :2] - half, boxes[:, :2] + half), axis=1)
+        keep = nms.nms(edges, confidence, iou_threshold=0.5)
 
-            detections.append(
-                Detection(x=x, y=y, width=w, height=h, confidence=float(confidence))
-            )
+        return boxes[keep], confidence[keep]
 
-        # Sort by confidence (highest first)
-        detections.sort(key=lambda d: d.confidence, reverse=True)
+    def _postprocess_output(
+        self,
+        output: np.ndarray,
+        scale: float,
+        pad_x: int,
+        pad_y: int,
+    ) -> List[Detection]:
+        """
+        Convert model output to Detection objects.
 
-        # Apply NMS (Non-Maximum Suppression) to remove overlapping boxes
-        detections = self._apply_nms(detections, iou_threshold=0.5)
+        Same arguments as _postprocess_arrays; Detection objects are only
+        created here, for the boxes that survived NMS.
 
-        return detections
+        Returns:
+            List of Detection objects
+        """
+        boxes, scores = self._postprocess_arrays(output, scale, pad_x, pad_y)
+        return [
+            Detection(x=x, y=y, width=w, height=h, confidence=c)
+            for (x, y, w, h), c in zip(boxes.tolist(), scores.tolist())
+        ]
 
-    def _apply_nms(
-        self, detections: List[Detection], iou_threshold: float = 0.5
-    ) -> List[Detection]:
+    def detect(self, image: Union[Image.Image, np.ndarray]) -> List[Detection]:
         """
-        Apply Non-Maximum Suppression to remove overlapping detections.
+        Detect UI elements in an image.
 
         Args:
-            detections: List of Detection objects (already sorted by confidence)
-            iou_threshold: IoU threshold for suppression
+            image: PIL Image (will be converted to RGB if needed) or RGB ndarray
 
         Returns:
-            Filtered list of detections
+            List of Detection objects with coordinates in original resolution
         """
-        if len(detections) <= 1:
-            return detections
+        output, scale_x, pad_x, pad_y = self._infer(image)
 
-        kept = []
-        suppressed = set()
-
-        for i, det in enumerate(detections):
-            if i in suppressed:
-                continue
-
-            kept.append(det)
+        # Postprocess - use scale_x (same as scale_y) and padding info
+        detections = self._postprocess_output(output, scale_x, pad_x, pad_y)
 
-            # Suppress overlapping detections
-            for j in range(i + 1, len(detections)):
-                if j in suppressed:
-                    continue
+        return detections
 
-                iou = self._calculate_iou(det, detections[j])
-                if iou > iou_threshold:
-                    suppressed.add(j)
+    def _infer(
+        self, image: Union[Image.Image, np.ndarray]
+    ) -> Tuple[np.ndarray, float, int, int]:
+        """Preprocess into this thread's bound input and run the model once"""
+        # Ensure RGB format
+        if isinstance(image, Image.Image) and image.mode != "RGB":
+            image = image.convert("RGB")
 
-        return kept
+        # Preprocess straight into this thread's bound input tensor
+        input_tensor, binding = self._bound_input()
+        _, scale, _, pad_x, pad_y = self._preprocess_image(image, input_tensor)
 
-    def _calculate_iou(self, det1: Detection, det2: Detection) -> float:
-        """Calculate Intersection over Union between two detections"""
-        l1, t1, r1, b1 = det1.bounds
-        l2, t2, r2, b2 = det2.bounds
+        # Run inference
+        self.session.run_with_iobinding(binding)
+        return binding.copy_outputs_to_cpu()[0], scale, pad_x, pad_y
 
-        # Calculate intersection
-        left = max(l1, l2)
-        top = max(t1, t2)
-        right = min(r1, r2)
-        bottom = min(b1, b2)
+    def detect_arrays(
+        self, image: Union[Image.Image, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Detect UI elements, returning arrays instead of Detection objects.
 
-        if left >= right or top >= bottom:
-            return 0.0
+        For callers that keep processing the boxes with NumPy.
 
-        intersection = (right - left) * (bottom - top)
+        Args:
+            image: PIL Image (will be converted to RGB if needed) or RGB ndarray
 
-        # Calculate union
-        area1 = (r1 - l1) * (b1 - t1)
-        area2 = (r2 - l2) * (b2 - t2)
-        union = area1 + area2 - intersection
+        Returns:
+            (boxes, scores): (N, 4) int64 [x, y, width, height] rows (center
+            and size in original resolution) and (N,) confidences, highest first
+        """
+        output, scale, pad_x, pad_y = self._infer(image)
+        return self._postprocess_arrays(output, scale, pad_x, pad_y)
 
-        return intersection / union if union > 0 else 0.0
+    def _bound_input(self) -> Tuple[np.ndarray, "ort.IOBinding"]:
+        """
+        This thread's reusable input tensor and the IOBinding that feeds it.
 
-    def detect(self, image: Image.Image) -> List[Detection]:
+        The OrtValue wraps the NumPy buffer's memory, so preprocessing writes
+        the frame where ORT reads it: no per-frame 4.9 MB allocation and no
+        copy into an ORT-owned tensor. One per thread because the session is
+        shared by all Flask workers.
         """
-        Detect UI elements in an image.
+        bound = getattr(self._local, "bound", None)
+        if bound is None:
+            session = self.session
+            size = self.MODEL_INPUT_SIZE
+            tensor = np.empty((1, 3, size, size), dtype=self._input_dtype)
+            value = ort.OrtValue.ortvalue_from_numpy(tensor)
+            binding = session.io_binding()
+            binding.bind_ortvalue_input(self._input_name, value)
+            binding.bind_output(self._output_names[0])
+            # The OrtValue is kept alongside so the binding never dangles
+            bound = self._local.bound = (tensor, binding, value)
+        return bound[0], bound[1]
+
+    def _run(self, input_tensor: np.ndarray) -> np.ndarray:
+        """Run the model and return its detection output (the only one fetched)"""
+        session = self.session
+        return session.run(self._output_names, {self._input_name: input_tensor})[0]
+
+    def _supports_batching(self) -> bool:
+        """True if the model accepts a dynamic batch dimension"""
+        _ = self.session
+        return self._dynamic_batch
+
+    def detect_batch(
+        self, images: List[Union[Image.Image, np.ndarray]]
+    ) -> List[List[Detection]]:
+        """
+        Detect UI elements in several images with as few model calls as possible.
+
+        Images are stacked into a single (N, 3, H, W) forward pass when the model
+        has a dynamic batch dimension; otherwise they are run one by one.
 
         Args:
-            image: PIL Image (will be converted to RGB if needed)
+            images: PIL Images (converted to RGB if needed) or RGB ndarrays
 
         Returns:
-            List of Detection objects with coordinates in original resolution
+            One list of Detection objects per input image, in input order
         """
-        # Ensure RGB format
-        if image.mode != "RGB":
-            image = image.convert("RGB")
-
-        # Preprocess - now returns 5 values including padding
-        input_tensor, scale_x, scale_y, pad_x, pad_y = self._preprocess_image(image)
+        if not images:
+            return []
+
+        if len(images) > 1 and self._supports_batching():
+            # Each image is preprocessed into its slot of one batch tensor
+            # (no per-image tensors, no concatenate copy)
+            size = self.MODEL_INPUT_SIZE
+            batch = np.empty((len(images), 3, size, size), dtype=self.input_dtype)
+            prepared = [
+                self._preprocess_image(img, batch[i : i + 1])
+                for i, img in enumerate(images)
+            ]
+            output = self._run(batch)
+            return [
+                self._postprocess_output(output[i : i + 1], scale, pad_x, pad_y)
+                for i, (_, scale, _, pad_x, pad_y) in enumerate(prepared)
+            ]
+
+        return [self.detect(img) for img in images]
+
+    def detect_stream(
+        self,
+        grab: Callable[[], Union[Image.Image, np.ndarray]],
+        frames: Optional[int] = None,
+    ) -> Iterator[Tuple[Union[Image.Image, np.ndarray], List[Detection]]]:
+        """
+        Detect on successive frames, capturing the next one during inference.
 
-        # Get model input/output names
-        input_name = self.session.get_inputs()[0].name
+        Capture and inference are independent, so while the model runs on
+        frame N a helper thread already grabs frame N+1: throughput is bounded
+        by the slower of the two instead of their sum.
 
-        # Run inference
-        outputs = self.session.run(None, {input_name: input_tensor})
-
-        # Postprocess - use scale_x (same as scale_y) and padding info
-        detections = self._postprocess_output(outputs[0], scale_x, pad_x, pad_y)
+        Args:
+            grab: Callable returning the next frame (e.g. capture.grab_screen)
+            frames: Number of frames to process (None: until the caller stops)
 
-        return detections
+        Yields:
+            (frame, detections) for each captured frame, in capture order
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="DetectGrab") as pool:
+            pending = pool.submit(grab)
+            count = 0
+            while frames is None or count < frames:
+                frame = pending.result()
+                count += 1
+                if frames is None or count < frames:
+                    pending = pool.submit(grab)
+                yield frame, self.detect(frame)
 
     def detect_from_bytes(self, image_bytes: bytes) -> List[Detection]:
         """
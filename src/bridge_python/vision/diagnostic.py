@@ -12,7 +12,7 @@ import os
 # Add parent to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from vision.detector import VisionDetector, Detection
+from vision.detector import VisionDetector, Detection, default_intra_op_threads
 
 
 def run_diagnostic():
@@ -71,6 +71,24 @@ def run_diagnostic():
     print(f"    Output shape: {outputs[0].shape}")
     results["inference_ms"] = t_inference
 
+    # 4b. Intra-op thread sweep (batch-1 latency per thread count)
+    print("\n[4b] Intra-op Thread Sweep...")
+    print(f"    Default: {default_intra_op_threads()} threads")
+    sweep = {}
+    for threads in (1, 2, 4, 8):
+        if threads > (os.cpu_count() or 1):
+            break
+        candidate = VisionDetector(
+            model_path=detector.model_path, intra_op_num_threads=threads
+        )
+        candidate.session.run(None, {input_name: input_tensor})  # warm-up
+        t0 = time.perf_counter()
+        for _ in range(5):
+            candidate.session.run(None, {input_name: input_tensor})
+        sweep[threads] = (time.perf_counter() - t0) * 1000 / 5
+        print(f"    {threads} threads: {sweep[threads]:.1f}ms")
+    results["thread_sweep_ms"] = sweep
+
     # 5. Raw output analysis
     print("\n[5] Raw Model Output Analysis...")
     raw_output = outputs[0]
@@ -118,6 +136,30 @@ def run_diagnostic():
     results["full_pipeline_ms"] = t_full
     results["detections_th01"] = len(detections)
 
+    # 7b. Batched vs one-by-one detection (single ORT run for the batch)
+    print("\n[7b] Batched Detection (4 frames)...")
+    frames = [screenshot] * 4
+    t0 = time.perf_counter()
+    for frame in frames:
+        detector.detect(frame)
+    t_loop = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    detector.detect_batch(frames)
+    t_batch = (time.perf_counter() - t0) * 1000
+    print(f"    Dynamic batch: {detector._supports_batching()}")
+    print(f"    One by one: {t_loop:.1f}ms, batched: {t_batch:.1f}ms")
+    results["batch4_ms"] = t_batch
+
+    # 7c. Capture overlapped with inference (next grab runs during detect)
+    print("\n[7c] Pipelined Capture + Detection (10 frames)...")
+    t0 = time.perf_counter()
+    for _ in detector.detect_stream(ImageGrab.grab, frames=10):
+        pass
+    t_stream = (time.perf_counter() - t0) * 1000
+    print(f"    {t_stream / 10:.1f}ms/frame ({10000 / t_stream:.1f} FPS)")
+    print(f"    Sequential estimate: {t_screenshot + t_full:.1f}ms/frame")
+    results["pipelined_frame_ms"] = t_stream / 10
+
     if detections:
         print("\n    Detected elements:")
         for i, d in enumerate(detections[:10]):
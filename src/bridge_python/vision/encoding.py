@@ -0,0 +1,220 @@
+"""
+Image encoding helpers for agent vision screenshots
+
+JPEG goes through libjpeg-turbo (PyTurboJPEG) when installed, which encodes
+straight from the RGB pixel buffer without PIL's save pipeline. Capture
+frames can be passed as ndarrays (RGB, or BGRA straight from the grabber)
+so the JPEG path never builds a PIL image. WebP and PNG use PIL; PNG is written with a low zlib level because payload size is
+dominated by the image content, not the DEFLATE effort.
+"""
+
+import io
+import queue
+from functools import lru_cache, partial
+from typing import Optional, Union
+
+import numpy as np
+from PIL import Image
+
+# Try to import PyTurboJPEG (faster JPEG encoding than PIL)
+_TURBOJPEG_AVAILABLE = False
+_tjpeg = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGRA, TJPF_RGB, TJSAMP_420
+
+    _tjpeg = TurboJPEG()
+    _TURBOJPEG_AVAILABLE = True
+except (ImportError, RuntimeError, OSError):
+    # RuntimeError/OSError: Python package present but libjpeg-turbo missing
+    pass
+
+# Try to import pybase64 (SIMD base64, runtime AVX2/AVX-512 dispatch)
+_PYBASE64_AVAILABLE = False
+
+try:
+    import pybase64
+
+    _PYBASE64_AVAILABLE = True
+except ImportError:
+    import base64
+
+# Try to import py-cpuinfo (reports the SIMD extensions of this CPU)
+_CPUINFO_AVAILABLE = False
+
+try:
+    import cpuinfo
+
+    _CPUINFO_AVAILABLE = True
+except ImportError:
+    pass
+
+SUPPORTED_FORMATS = ("jpeg", "webp", "png")
+
+# SIMD levels relevant to the JPEG/base64 codecs, best first
+_SIMD_LEVELS = ("avx512vbmi", "avx512bw", "avx2", "sse4_2", "ssse3")
+
+# PNG zlib level: 1 is several times faster than the default 6
+PNG_COMPRESS_LEVEL = 1
+
+# Reusable PIL output buffers: a few per process, oversized ones dropped
+BUFFER_POOL_SIZE = 4
+BUFFER_MAX_BYTES = 8 * 1024 * 1024
+
+_buffer_pool: "queue.SimpleQueue[io.BytesIO]" = queue.SimpleQueue()
+
+
+def normalize_format(image_format: Optional[str]) -> str:
+    """Validate an image format name ('jpg' is accepted as 'jpeg')"""
+    fmt = (image_format or "jpeg").lower()
+    if fmt == "jpg":
+        fmt = "jpeg"
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"Invalid image format: {image_format}. "
+            f"Must be one of {', '.join(SUPPORTED_FORMATS)}"
+        )
+    return fmt
+
+
+@lru_cache(maxsize=32)
+def jpeg_encoder(quality: int, channels: int = 3):
+    """
+    libjpeg-turbo encode call specialized for one quality and pixel layout.
+
+    Requests use a handful of qualities, so the bound call (quality, pixel
+    format, 4:2:0 subsampling) is built once per combination and reused.
+
+    Args:
+        quality: JPEG quality 1-100
+        channels: 3 for RGB input, 4 for BGRA input
+
+    Returns:
+        Callable taking a C-contiguous ndarray and returning JPEG bytes
+    """
+    return partial(
+        _tjpeg.encode,
+        quality=quality,
+        pixel_format=TJPF_BGRA if channels == 4 else TJPF_RGB,
+        jpeg_subsample=TJSAMP_420,
+    )
+
+
+def to_image(image: Union[Image.Image, np.ndarray]) -> Image.Image:
+    """
+    Wrap a frame as a PIL Image.
+
+    Accepts a PIL Image (returned as is), an (H, W, 3) RGB ndarray or an
+    (H, W, 4) BGRA ndarray as produced by vision.capture.grab_screen_bgra().
+    """
+    if isinstance(image, Image.Image):
+        return image
+    if image.shape[2] == 4:
+        height, width = image.shape[:2]
+        return Image.frombuffer(
+            "RGB", (width, height), np.ascontiguousarray(image), "raw", "BGRX"
+        )
+    return Image.fromarray(image)
+
+
+def encode_image(
+    image: Union[Image.Image, np.ndarray],
+    image_format: str = "jpeg",
+    quality: int = 75,
+) -> bytes:
+    """
+    Encode a frame to compressed bytes.
+
+    Args:
+        image: PIL Image (converted to RGB if needed), (H, W, 3) RGB ndarray
+            or (H, W, 4) BGRA ndarray
+        image_format: 'jpeg', 'webp' or 'png'
+        quality: Quality 1-100 (ignored for PNG)
+
+    Returns:
+        Encoded image bytes
+    """
+    fmt = normalize_format(image_format)
+
+    if isinstance(image, np.ndarray):
+        if fmt == "jpeg" and _TURBOJPEG_AVAILABLE:
+            # libjpeg-turbo converts BGRA/RGB itself; no PIL round-trip
+            encode = jpeg_encoder(quality, image.shape[2])
+            return encode(np.ascontiguousarray(image))
+        image = to_image(image)
+
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    if fmt == "jpeg" and _TURBOJPEG_AVAILABLE:
+        return jpeg_encoder(quality)(np.asarray(image))
+
+    return _save_with_pil(image, fmt, quality)
+
+
+def _save_with_pil(image: Image.Image, fmt: str, quality: int) -> bytes:
+    """
+    Encode through PIL into a pooled BytesIO.
+
+    Buffers are rewound, not truncated (truncating shrinks the allocation),
+    so a reused buffer already has room for a typical screenshot.
+    """
+    try:
+        buffer = _buffer_pool.get_nowait()
+        buffer.seek(0)
+    except queue.Empty:
+        buffer = io.BytesIO()
+
+    if fmt == "jpeg":
+        image.save(buffer, format="JPEG", quality=quality)
+    elif fmt == "webp":
+        # method=0 is the fastest WebP encoder setting
+        image.save(buffer, format="WEBP", quality=quality, method=0)
+    else:
+        image.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+
+    size = buffer.tell()
+    with buffer.getbuffer() as view, view[:size] as written:
+        data = bytes(written)
+
+    if size <= BUFFER_MAX_BYTES and _buffer_pool.qsize() < BUFFER_POOL_SIZE:
+        _buffer_pool.put(buffer)
+    return data
+
+
+def b64encode_str(data: bytes) -> str:
+    """Base64-encode bytes straight to a str (SIMD codec when available)"""
+    if _PYBASE64_AVAILABLE:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("ascii")
+
+
+@lru_cache(maxsize=1)
+def get_capabilities() -> dict:
+    """
+    Codec and CPU capabilities, detected once per process.
+
+    pybase64 and libjpeg-turbo pick their SIMD kernels at runtime
+    themselves; this reports what they will find.
+    """
+    caps = {
+        "jpeg_encoder": get_encoder_backend(),
+        "base64": (
+            pybase64.get_version() if _PYBASE64_AVAILABLE else "stdlib (scalar)"
+        ),
+        "cpu": None,
+        "simd": [],
+        "best_simd": None,
+    }
+    if _CPUINFO_AVAILABLE:
+        info = cpuinfo.get_cpu_info()
+        flags = set(info.get("flags", []))
+        caps["cpu"] = info.get("brand_raw")
+        caps["simd"] = [level for level in _SIMD_LEVELS if level in flags]
+        caps["best_simd"] = caps["simd"][0] if caps["simd"] else "scalar"
+    return caps
+
+
+def get_encoder_backend() -> str:
+    """Name of the JPEG encoder in use"""
+    return "turbojpeg" if _TURBOJPEG_AVAILABLE else "pil"
@@ -0,0 +1,114 @@
+"""
+Non-Maximum Suppression for detection boxes
+
+Greedy NMS over (N, 4) [left, top, right, bottom] boxes. Uses a Numba-compiled
+kernel when numba is installed and a vectorized NumPy loop otherwise; both
+return the same indices as the original per-pair Python implementation.
+"""
+
+import numpy as np
+
+# Try to import numba (JIT-compiled kernel)
+_NUMBA_AVAILABLE = False
+
+try:
+    from numba import njit
+
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    pass
+
+
+def _nms_numpy(
+    boxes: np.ndarray, order: np.ndarray, iou_threshold: float
+) -> np.ndarray:
+    """Greedy NMS, one vectorized IoU row per kept box"""
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = []
+
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        left = np.maximum(boxes[i, 0], boxes[rest, 0])
+        top = np.maximum(boxes[i, 1], boxes[rest, 1])
+        w = np.minimum(boxes[i, 2], boxes[rest, 2]) - left
+        h = np.minimum(boxes[i, 3], boxes[rest, 3]) - top
+        inter = np.maximum(w, 0.0) * np.maximum(h, 0.0)
+        union = areas[i] + areas[rest] - inter
+
+        # Suppress when inter / union > threshold, as a multiply-compare with
+        # no division and no zero-union guard (boxes have non-negative size,
+        # so inter > 0 implies union > 0, and inter == 0 never suppresses)
+        order = rest[inter <= iou_threshold * union]
+
+    return np.asarray(keep, dtype=np.int64)
+
+
+if _NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def _nms_numba(boxes, order, iou_threshold):
+        n = order.shape[0]
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        suppressed = np.zeros(n, dtype=np.bool_)
+        keep = np.empty(n, dtype=np.int64)
+        count = 0
+
+        for ii in range(n):
+            if suppressed[ii]:
+                continue
+            i = order[ii]
+            keep[count] = i
+            count += 1
+
+            for jj in range(ii + 1, n):
+                if suppressed[jj]:
+                    continue
+                j = order[jj]
+                w = min(boxes[i, 2], boxes[j, 2]) - max(boxes[i, 0], boxes[j, 0])
+                h = min(boxes[i, 3], boxes[j, 3]) - max(boxes[i, 1], boxes[j, 1])
+                if w <= 0 or h <= 0:
+                    continue
+                inter = w * h
+                union = areas[i] + areas[j] - inter
+                if inter > iou_threshold * union:
+                    suppressed[jj] = True
+
+        return keep[:count]
+
+
+def nms(
+    boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.5
+) -> np.ndarray:
+    """
+    Greedy Non-Maximum Suppression.
+
+    Args:
+        boxes: (N, 4) array of [left, top, right, bottom]
+        scores: (N,) confidence scores
+        iou_threshold: Boxes with IoU above this against a kept box are dropped
+
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    order = np.argsort(-np.asarray(scores), kind="stable")
+    if order.size <= 1:
+        # Nothing to suppress: skip the kernel call and the float64 copy
+        return order.astype(np.int64)
+    boxes = np.ascontiguousarray(boxes, dtype=np.float64)
+
+    if _NUMBA_AVAILABLE:
+        return _nms_numba(boxes, order, float(iou_threshold))
+    return _nms_numpy(boxes, order, iou_threshold)
+
+
+def warmup():
+    """Compile (or load the cached) Numba kernel ahead of the first request"""
+    nms(np.zeros((2, 4)), np.zeros(2))
+
+
+def get_nms_backend() -> str:
+    """Name of the NMS implementation in use"""
+    return "numba" if _NUMBA_AVAILABLE else "numpy"
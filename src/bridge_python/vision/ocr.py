@@ -1,12 +1,16 @@
 """
 WindowsOCR - Windows.Media.Ocr wrapper for text recognition
-Uses Windows 10/11 built-in OCR capabilities via subprocess
+Uses Windows 10/11 built-in OCR capabilities via a long-lived PowerShell worker
 """
 
 import subprocess
+import hashlib
 import json
 import os
+import struct
 import tempfile
+import threading
+import time
 from PIL import Image
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
@@ -53,8 +57,13 @@ class TextRegion:
         }
 
 
-# PowerShell script for Windows.Media.Ocr
-OCR_POWERSHELL_SCRIPT = """
+# str.translate table deleting ASCII control characters (U+0000-U+001F, U+007F)
+_CONTROL_CHARS = dict.fromkeys([*range(0x20), 0x7F])
+
+
+# PowerShell prelude for Windows.Media.Ocr: loads the WinRT types, creates the
+# engine once and defines Get-OcrJson (encoded image stream -> JSON words)
+_OCR_POWERSHELL_PRELUDE = """
 Add-Type -AssemblyName System.Runtime.WindowsRuntime
 $null = [Windows.Media.Ocr.OcrEngine, Windows.Foundation, ContentType = WindowsRuntime]
 $null = [Windows.Graphics.Imaging.BitmapDecoder, Windows.Foundation, ContentType = WindowsRuntime]
@@ -70,59 +79,204 @@ function Await($WinRtTask, $ResultType) {
     $netTask.Result
 }
 
-$imagePath = $args[0]
-$stream = [System.IO.File]::OpenRead($imagePath)
-$randomAccessStream = [System.IO.WindowsRuntimeStreamExtensions]::AsRandomAccessStream($stream)
-
-$decoder = Await ([Windows.Graphics.Imaging.BitmapDecoder]::CreateAsync($randomAccessStream)) ([Windows.Graphics.Imaging.BitmapDecoder])
-$softwareBitmap = Await ($decoder.GetSoftwareBitmapAsync()) ([Windows.Graphics.Imaging.SoftwareBitmap])
-
 $ocrEngine = [Windows.Media.Ocr.OcrEngine]::TryCreateFromUserProfileLanguages()
 if ($ocrEngine -eq $null) {
     $ocrEngine = [Windows.Media.Ocr.OcrEngine]::TryCreateFromLanguage("en-US")
 }
 
-$ocrResult = Await ($ocrEngine.RecognizeAsync($softwareBitmap)) ([Windows.Media.Ocr.OcrResult])
-
-$results = @()
-foreach ($line in $ocrResult.Lines) {
-    foreach ($word in $line.Words) {
-        $rect = $word.BoundingRect
-        $results += @{
-            text = $word.Text
-            left = [int]$rect.X
-            top = [int]$rect.Y
-            width = [int]$rect.Width
-            height = [int]$rect.Height
+function Get-OcrJson($stream) {
+    $stream.Position = 0
+    $randomAccessStream = [System.IO.WindowsRuntimeStreamExtensions]::AsRandomAccessStream($stream)
+
+    $decoder = Await ([Windows.Graphics.Imaging.BitmapDecoder]::CreateAsync($randomAccessStream)) ([Windows.Graphics.Imaging.BitmapDecoder])
+    $softwareBitmap = Await ($decoder.GetSoftwareBitmapAsync()) ([Windows.Graphics.Imaging.SoftwareBitmap])
+
+    $ocrResult = Await ($ocrEngine.RecognizeAsync($softwareBitmap)) ([Windows.Media.Ocr.OcrResult])
+
+    $results = @()
+    foreach ($line in $ocrResult.Lines) {
+        foreach ($word in $line.Words) {
+            $rect = $word.BoundingRect
+            $results += @{
+                text = $word.Text
+                left = [int]$rect.X
+                top = [int]$rect.Y
+                width = [int]$rect.Width
+                height = [int]$rect.Height
+            }
         }
     }
+
+    # @() keeps a single word an array (never a bare object)
+    ConvertTo-Json -InputObject @($results) -Compress
 }
+"""
 
+# PowerShell script for Windows.Media.Ocr (one image per process)
+OCR_POWERSHELL_SCRIPT = (
+    _OCR_POWERSHELL_PRELUDE
+    + """
+# JPEG bytes arrive on stdin (no temp file round-trip)
+$stdin = [Console]::OpenStandardInput()
+$stream = New-Object System.IO.MemoryStream
+$stdin.CopyTo($stream)
+Get-OcrJson $stream
 $stream.Close()
-ConvertTo-Json -InputObject $results -Compress
 """
+)
+
+# Long-lived variant: each request on stdin is a 4-byte little-endian length
+# followed by that many JPEG bytes, each reply is one line of JSON on stdout.
+# Exits when stdin is closed.
+OCR_WORKER_SCRIPT = (
+    _OCR_POWERSHELL_PRELUDE
+    + """
+[Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false
+$reader = New-Object System.IO.BinaryReader([Console]::OpenStandardInput())
+$stdout = [Console]::Out
+
+while ($true) {
+    try {
+        $length = $reader.ReadInt32()
+    } catch {
+        break
+    }
+    $stream = New-Object System.IO.MemoryStream(, $reader.ReadBytes($length))
+    try {
+        $json = Get-OcrJson $stream
+    } catch {
+        $json = ConvertTo-Json -InputObject @{ error = "$($_.Exception.Message)" } -Compress
+    }
+    $stream.Close()
+    $stdout.WriteLine($json)
+    $stdout.Flush()
+}
+"""
+)
+
+
+def _script_file(name: str, script: str) -> str:
+    """
+    Path of a PowerShell script in the per-user cache, written only if missing.
+
+    The file name carries a hash of the content, so a changed script gets a
+    new file instead of being rewritten under a running bridge, and nothing
+    is written into the (possibly read-only) package directory. Outside
+    Windows, or without LOCALAPPDATA, the temp directory is used.
+    """
+    digest = hashlib.sha1(script.encode("utf-8")).hexdigest()[:8]
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    path = os.path.join(base, "windows-automation-skill", f"{name}_{digest}.ps1")
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write aside and rename, so a concurrent reader never sees half a file
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(script)
+        os.replace(partial, path)
+    return path
 
 
 class WindowsOCR:
     """
     Windows.Media.Ocr based text recognition.
 
-    Uses the built-in Windows 10/11 OCR engine via PowerShell.
-    This has zero additional dependencies and excellent accuracy.
+    Uses the built-in Windows 10/11 OCR engine in-process through the winrt
+    projection when it is installed, otherwise via PowerShell (zero
+    additional dependencies). Both give the same excellent accuracy.
     """
 
-    def __init__(self):
-        """Initialize WindowsOCR"""
+    # Seconds one OCR round-trip may take before the worker is killed
+    TIMEOUT = 30.0
+
+    def __init__(self, prefer_winrt: bool = True):
+        """
+        Initialize WindowsOCR.
+
+        Args:
+            prefer_winrt: Call Windows.Media.Ocr in-process when the winrt
+                (or winsdk) package is installed
+        """
+        # In-process engine: no subprocess, no JSON round-trip
+        self._winrt = None
+        if prefer_winrt:
+            from .ocr_native import get_winrt_ocr
+
+            self._winrt = get_winrt_ocr()
+
         self._script_path: str = ""
+        self._worker_script_path: str = ""
         self._create_script()
+        # Long-lived PowerShell process, started on first use. Process start
+        # and WinRT assembly loading (~200-400ms) are paid once, not per call.
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
 
     def _create_script(self):
-        """Create the PowerShell script file"""
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        self._script_path = os.path.join(script_dir, "_ocr_script.ps1")
+        """Locate (writing on first use) the PowerShell script files"""
+        self._script_path = _script_file("ocr_script", OCR_POWERSHELL_SCRIPT)
+        self._worker_script_path = _script_file("ocr_worker", OCR_WORKER_SCRIPT)
+
+    def _ensure_worker(self) -> subprocess.Popen:
+        """Start the PowerShell worker unless it is running (caller holds the lock)"""
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                [
+                    "powershell",
+                    "-NoProfile",
+                    "-ExecutionPolicy",
+                    "Bypass",
+                    "-File",
+                    self._worker_script_path,
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._proc
+
+    def _request(self, data: bytes) -> str:
+        """
+        Send one encoded image to the worker and return its JSON reply.
 
-        with open(self._script_path, "w", encoding="utf-8") as f:
-            f.write(OCR_POWERSHELL_SCRIPT)
+        A worker that died while idle is restarted once; one that does not
+        answer within TIMEOUT is killed so later requests get a fresh one.
+        """
+        with self._lock:
+            for _ in range(2):
+                proc = self._ensure_worker()
+                watchdog = threading.Timer(self.TIMEOUT, proc.kill)
+                watchdog.start()
+                start = time.monotonic()
+                try:
+                    proc.stdin.write(struct.pack("<I", len(data)))
+                    proc.stdin.write(data)
+                    proc.stdin.flush()
+                    line = proc.stdout.readline()
+                except OSError:
+                    line = b""
+                finally:
+                    watchdog.cancel()
+
+                if line:
+                    return line.decode("utf-8", errors="replace")
+
+                proc.kill()
+                self._proc = None
+                if time.monotonic() - start >= self.TIMEOUT:
+                    raise RuntimeError("OCR failed: timed out")
+
+        raise RuntimeError("OCR failed: PowerShell worker exited")
+
+    def close(self):
+        """Stop the PowerShell worker (it exits when its stdin closes)"""
+        with self._lock:
+            if self._proc is not None:
+                try:
+                    self._proc.stdin.close()
+                except OSError:
+                    pass
+                self._proc = None
 
     def recognize(self, image: Image.Image) -> List[TextRegion]:
         """
@@ -134,92 +288,54 @@ class WindowsOCR:
         Returns:
             List of TextRegion objects with detected text and positions
         """
-        # Save image to temp file - use JPEG for ~60ms faster save
+        if self._winrt is not None:
+            # Raise like the PowerShell path does, rather than returning []
+            return self._winrt.recognize(image, raise_errors=True)
+
+        # Encode in memory and pipe to PowerShell - use JPEG for ~60ms faster save
         # JPEG is ~5x faster to save than PNG with negligible quality loss for OCR
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-            temp_path = tmp.name
-            # Convert to RGB if needed (JPEG doesn't support RGBA)
-            if image.mode == "RGBA":
-                image = image.convert("RGB")
-            image.save(tmp, format="JPEG", quality=90)
+        # Convert to RGB if needed (JPEG doesn't support RGBA)
+        if image.mode == "RGBA":
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+
+        return self._parse_regions(self._request(buffer.getvalue()))
+
+    @staticmethod
+    def _parse_regions(output: str) -> List[TextRegion]:
+        """Convert the script's JSON output to TextRegion objects"""
+        output = output.strip()
+        if not output or output == "[]":
+            return []
+
+        # Sanitize output - remove any control characters that might have slipped through
+        output = output.translate(_CONTROL_CHARS)
 
         try:
-            # Run PowerShell OCR with UTF-8 encoding
-            result = subprocess.run(
-                [
-                    "powershell",
-                    "-ExecutionPolicy",
-                    "Bypass",
-                    "-File",
-                    self._script_path,
-                    temp_path,
-                ],
-                capture_output=True,
-                timeout=30,
-                encoding="utf-8",
-                errors="replace",  # Replace undecodable chars with ?
+            raw_results = json.loads(output)
+        except json.JSONDecodeError as e:
+            # Log the problematic output for debugging
+            import logging
+
+            logging.warning(f"OCR JSON parse error: {e}")
+            logging.debug(f"Problematic output (first 500 chars): {output[:500]}")
+            return []
+
+        if isinstance(raw_results, dict) and "error" in raw_results:
+            raise RuntimeError(f"OCR failed: {raw_results['error']}")
+
+        # Convert to TextRegion objects (the script always emits an array)
+        return [
+            TextRegion(
+                text=r.get("text", ""),
+                x=r["left"] + r["width"] // 2,
+                y=r["top"] + r["height"] // 2,
+                width=r["width"],
+                height=r["height"],
             )
-
-            if result.returncode != 0:
-                stderr = result.stderr or ""
-                raise RuntimeError(f"OCR failed: {stderr}")
-
-            # Parse JSON output
-            stdout = result.stdout or ""
-            output = stdout.strip()
-            if not output or output == "[]":
-                return []
-
-            # Sanitize output - remove any control characters that might have slipped through
-            import re
-
-            output = re.sub(r"[\x00-\x1f\x7f]", "", output)
-
-            try:
-                raw_results = json.loads(output)
-            except json.JSONDecodeError as e:
-                # Log the problematic output for debugging
-                import logging
-
-                logging.warning(f"OCR JSON parse error: {e}")
-                logging.debug(f"Problematic output (first 500 chars): {output[:500]}")
-                return []
-
-            # Convert to TextRegion objects
-            regions = []
-            for r in raw_results:
-                # Handle single result (not array)
-                if isinstance(r, str):
-                    r = raw_results
-                    regions.append(
-                        TextRegion(
-                            text=r.get("text", ""),
-                            x=r["left"] + r["width"] // 2,
-                            y=r["top"] + r["height"] // 2,
-                            width=r["width"],
-                            height=r["height"],
-                        )
-                    )
-                    break
-                else:
-                    regions.append(
-                        TextRegion(
-                            text=r.get("text", ""),
-                            x=r["left"] + r["width"] // 2,
-                            y=r["top"] + r["height"] // 2,
-                            width=r["width"],
-                            height=r["height"],
-                        )
-                    )
-
-            return regions
-
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+            for r in raw_results
+        ]
 
     def recognize_from_file(self, file_path: str) -> List[TextRegion]:
         """
@@ -272,11 +388,28 @@ class WindowsOCR:
 
 # Singleton instance
 _ocr_instance: Optional[WindowsOCR] = None
+_ocr_instance_lock = threading.Lock()
 
 
 def get_ocr() -> WindowsOCR:
-    """Get or create the singleton WindowsOCR instance"""
+    """Get or create the singleton WindowsOCR instance (owns the PowerShell worker)"""
     global _ocr_instance
     if _ocr_instance is None:
-        _ocr_instance = WindowsOCR()
+        with _ocr_instance_lock:
+            if _ocr_instance is None:
+                _ocr_instance = WindowsOCR()
     return _ocr_instance
+
+
+# PowerShell-only instance, for callers that need a path independent of WinRT
+_powershell_ocr_instance: Optional[WindowsOCR] = None
+
+
+def get_powershell_ocr() -> WindowsOCR:
+    """Get or create the singleton WindowsOCR that always uses the PowerShell worker"""
+    global _powershell_ocr_instance
+    if _powershell_ocr_instance is None:
+        with _ocr_instance_lock:
+            if _powershell_ocr_instance is None:
+                _powershell_ocr_instance = WindowsOCR(prefer_winrt=False)
+    return _powershell_ocr_instance
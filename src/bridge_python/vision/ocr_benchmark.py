@@ -3,108 +3,187 @@ OCR Benchmark - Compare Windows.Media.Ocr vs RapidOCR performance
 """
 
 import time
-from PIL import ImageGrab
+import timeit
+import numpy as np
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 # Add parent to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from vision.capture import get_capture_backend, grab_screen
 
-def benchmark_ocr():
-    print("=" * 70)
-    print("OCR Performance Benchmark: Windows.Media.Ocr vs RapidOCR")
-    print("=" * 70)
+# Timed runs per engine (after warmup)
+REPEAT = 10
 
-    # Capture screenshot
-    print("\n[1] Capturing screenshot...")
-    t0 = time.perf_counter()
-    screenshot = ImageGrab.grab()
-    t_capture = (time.perf_counter() - t0) * 1000
-    print(
-        f"    Screenshot: {screenshot.size[0]}x{screenshot.size[1]} in {t_capture:.1f}ms"
+
+def _time_ms(fn, repeat: int = REPEAT) -> np.ndarray:
+    """Wall time of each fn() call, in milliseconds"""
+    return np.array(timeit.Timer(fn).repeat(repeat=repeat, number=1)) * 1000
+
+
+def _format_stats(times: np.ndarray) -> str:
+    """Mean and tail percentiles of a timing array"""
+    p50, p95, p99 = np.percentile(times, [50, 95, 99])
+    return (
+        f"mean {times.mean():.1f}ms, p50 {p50:.1f}ms, "
+        f"p95 {p95:.1f}ms, p99 {p99:.1f}ms"
     )
 
-    # ==================== WINDOWS OCR ====================
-    print("\n" + "=" * 70)
-    print("[2] Windows.Media.Ocr (PowerShell subprocess)")
-    print("=" * 70)
 
+def prepare_windows(screenshot, log: List[str]) -> Tuple[object, list]:
+    """
+    Start the PowerShell worker and run one untimed warmup.
+
+    Args:
+        screenshot: PIL Image to recognize
+        log: Report lines are appended here (printed by the caller)
+
+    Returns:
+        (engine or None on failure, regions from the warmup run)
+    """
     try:
         from vision.ocr import WindowsOCR
 
-        windows_ocr = WindowsOCR()
+        # PowerShell baseline: WindowsOCR() alone would run in-process WinRT
+        windows_ocr = WindowsOCR(prefer_winrt=False)
 
         # Warmup
-        print("    Warmup run...")
-        _ = windows_ocr.recognize(screenshot)
-
-        # Benchmark runs
-        times_windows = []
-        for i in range(3):
-            t0 = time.perf_counter()
-            regions_windows = windows_ocr.recognize(screenshot)
-            elapsed = (time.perf_counter() - t0) * 1000
-            times_windows.append(elapsed)
-            print(f"    Run {i + 1}: {elapsed:.1f}ms - {len(regions_windows)} regions")
-
-        avg_windows = sum(times_windows) / len(times_windows)
-        print(f"\n    AVERAGE: {avg_windows:.1f}ms")
-        print(f"    Text regions: {len(regions_windows)}")
-
-        # Sample text
-        sample_texts = [r.text for r in regions_windows[:10]]
-        print(f"    Sample text: {sample_texts}")
+        log.append("    Warmup run...")
+        return windows_ocr, windows_ocr.recognize(screenshot)
 
     except Exception as e:
-        print(f"    ERROR: {e}")
-        avg_windows = None
-        regions_windows = []
+        log.append(f"    ERROR: {e}")
+        return None, []
 
-    # ==================== RAPIDOCR ====================
-    print("\n" + "=" * 70)
-    print("[3] RapidOCR (ONNX Runtime)")
-    print("=" * 70)
 
+def prepare_rapid(screenshot, log: List[str]) -> Tuple[object, list]:
+    """
+    Load the RapidOCR models with one untimed first run.
+
+    Args:
+        screenshot: PIL Image to recognize
+        log: Report lines are appended here (printed by the caller)
+
+    Returns:
+        (engine or None on failure, regions from the first run)
+    """
     try:
         from vision.ocr_rapid import RapidOCREngine
 
-        print("    Loading RapidOCR engine (first time includes model load)...")
-        t0 = time.perf_counter()
+        log.append("    Loading RapidOCR engine (first time includes model load)...")
         rapid_ocr = RapidOCREngine()
+        log.append(f"    Intra-op threads: {rapid_ocr.intra_op_num_threads}")
 
         # First run (includes model loading)
         t_load_start = time.perf_counter()
         regions_rapid = rapid_ocr.recognize(screenshot)
         t_first = (time.perf_counter() - t_load_start) * 1000
-        print(
+        log.append(
             f"    First run (with model load): {t_first:.1f}ms - {len(regions_rapid)} regions"
         )
+        return rapid_ocr, regions_rapid
+
+    except Exception as e:
+        import traceback
 
-        # Benchmark runs (models already loaded)
-        times_rapid = []
-        for i in range(3):
-            t0 = time.perf_counter()
-            regions_rapid = rapid_ocr.recognize(screenshot)
-            elapsed = (time.perf_counter() - t0) * 1000
-            times_rapid.append(elapsed)
-            print(f"    Run {i + 1}: {elapsed:.1f}ms - {len(regions_rapid)} regions")
+        log.append(f"    ERROR: {e}")
+        log.append(traceback.format_exc())
+        return None, []
 
-        avg_rapid = sum(times_rapid) / len(times_rapid)
-        print(f"\n    AVERAGE: {avg_rapid:.1f}ms")
-        print(f"    Text regions: {len(regions_rapid)}")
 
-        # Sample text
-        sample_texts = [r.text for r in regions_rapid[:10]]
-        print(f"    Sample text: {sample_texts}")
+def time_engine(engine, screenshot, regions: list, log: List[str]) -> Optional[float]:
+    """
+    REPEAT timed runs of a prepared engine.
 
+    Args:
+        engine: Object with recognize(image), or None if preparing it failed
+        screenshot: PIL Image to recognize
+        regions: Regions from the warmup run (for the report)
+        log: Report lines are appended here (printed by the caller)
+
+    Returns:
+        Mean ms, or None on failure
+    """
+    if engine is None:
+        return None
+
+    try:
+        times = _time_ms(lambda: engine.recognize(screenshot))
     except Exception as e:
-        import traceback
+        log.append(f"    ERROR: {e}")
+        return None
 
-        print(f"    ERROR: {e}")
-        traceback.print_exc()
-        avg_rapid = None
-        regions_rapid = []
+    log.append(f"\n    {REPEAT} runs: {_format_stats(times)}")
+    log.append(f"    Text regions: {len(regions)}")
+
+    # Sample text
+    sample_texts = [r.text for r in regions[:10]]
+    log.append(f"    Sample text: {sample_texts}")
+    return float(times.mean())
+
+
+def bench_windows(screenshot, log: List[str]) -> Tuple[Optional[float], list]:
+    """Warmup plus REPEAT timed runs of Windows.Media.Ocr: (mean ms, regions)"""
+    windows_ocr, regions = prepare_windows(screenshot, log)
+    return time_engine(windows_ocr, screenshot, regions, log), regions
+
+
+def bench_rapid(screenshot, log: List[str]) -> Tuple[Optional[float], list]:
+    """Model load plus REPEAT timed runs of RapidOCR: (mean ms, regions)"""
+    rapid_ocr, regions = prepare_rapid(screenshot, log)
+    return time_engine(rapid_ocr, screenshot, regions, log), regions
+
+
+def benchmark_ocr(parallel: bool = True):
+    """
+    Compare Windows.Media.Ocr and RapidOCR on one screenshot.
+
+    Args:
+        parallel: Overlap the PowerShell worker start with RapidOCR's model
+            load. The timed runs always go one engine at a time, since both
+            engines compete for the same CPU cores.
+    """
+    print("=" * 70)
+    print("OCR Performance Benchmark: Windows.Media.Ocr vs RapidOCR")
+    print("=" * 70)
+
+    # Capture screenshot
+    print("\n[1] Capturing screenshot...")
+    t0 = time.perf_counter()
+    screenshot = grab_screen()
+    t_capture = (time.perf_counter() - t0) * 1000
+    print(
+        f"    Screenshot: {screenshot.size[0]}x{screenshot.size[1]} in {t_capture:.1f}ms"
+        f" ({get_capture_backend()})"
+    )
+
+    # Warmups on their own threads; nothing is timed yet
+    windows_log: List[str] = []
+    rapid_log: List[str] = []
+    with ThreadPoolExecutor(max_workers=2 if parallel else 1) as pool:
+        windows_future = pool.submit(prepare_windows, screenshot, windows_log)
+        rapid_future = pool.submit(prepare_rapid, screenshot, rapid_log)
+        windows_ocr, regions_windows = windows_future.result()
+        rapid_ocr, regions_rapid = rapid_future.result()
+
+    # Timed runs one engine at a time, so they never share the CPU
+    avg_windows = time_engine(windows_ocr, screenshot, regions_windows, windows_log)
+    avg_rapid = time_engine(rapid_ocr, screenshot, regions_rapid, rapid_log)
+
+    # ==================== WINDOWS OCR ====================
+    print("\n" + "=" * 70)
+    print("[2] Windows.Media.Ocr (PowerShell subprocess)")
+    print("=" * 70)
+    print("\n".join(windows_log))
+
+    # ==================== RAPIDOCR ====================
+    print("\n" + "=" * 70)
+    print("[3] RapidOCR (ONNX Runtime)")
+    print("=" * 70)
+    print("\n".join(rapid_log))
 
     # ==================== COMPARISON ====================
     print("\n" + "=" * 70)
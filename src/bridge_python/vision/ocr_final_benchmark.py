@@ -3,12 +3,42 @@ Final OCR Benchmark - Compare all optimization strategies
 """
 
 import time
-from PIL import ImageGrab
+import timeit
+import numpy as np
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from vision.capture import grab_screen
+
+# Timed runs per method (after warmup)
+REPEAT = 10
+
+
+def _time_ms(fn, setup="pass", repeat: int = REPEAT) -> np.ndarray:
+    """Wall time of each fn() call in milliseconds (setup runs untimed before each)"""
+    timer = timeit.Timer(fn, setup=setup)
+    return np.array(timer.repeat(repeat=repeat, number=1)) * 1000
+
+
+def _stats(times: np.ndarray) -> dict:
+    """Mean and tail percentiles of a timing array"""
+    p50, p95, p99 = np.percentile(times, [50, 95, 99])
+    return {
+        "avg_ms": float(times.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
+
+
+def _format_stats(result: dict) -> str:
+    return (
+        f"mean {result['avg_ms']:.0f}ms, p50 {result['p50_ms']:.0f}ms, "
+        f"p95 {result['p95_ms']:.0f}ms, p99 {result['p99_ms']:.0f}ms"
+    )
+
 
 def run_final_benchmark():
     print("=" * 70)
@@ -16,32 +46,29 @@ def run_final_benchmark():
     print("=" * 70)
 
     # Capture screenshot
-    screenshot = ImageGrab.grab()
+    screenshot = grab_screen()
     print(f"Screenshot: {screenshot.size[0]}x{screenshot.size[1]}")
 
     results = {}
 
     # ==================== ORIGINAL WINDOWS OCR ====================
-    print("\n[1] Original Windows OCR (PNG)...")
+    print("\n[1] Original Windows OCR (PowerShell worker)...")
     from vision.ocr import WindowsOCR
 
-    original_ocr = WindowsOCR()
+    # PowerShell baseline: WindowsOCR() alone would run in-process WinRT
+    original_ocr = WindowsOCR(prefer_winrt=False)
 
     # Warmup
-    _ = original_ocr.recognize(screenshot)
+    regions = original_ocr.recognize(screenshot)
 
-    times = []
-    for i in range(3):
-        t0 = time.perf_counter()
-        regions = original_ocr.recognize(screenshot)
-        times.append((time.perf_counter() - t0) * 1000)
+    times = _time_ms(lambda: original_ocr.recognize(screenshot))
 
     results["original"] = {
-        "avg_ms": sum(times) / len(times),
+        **_stats(times),
         "regions": len(regions),
-        "name": "Original (PNG)",
+        "name": "Original (PS)",
     }
-    print(f"    Avg: {results['original']['avg_ms']:.0f}ms, Regions: {len(regions)}")
+    print(f"    {_format_stats(results['original'])}, Regions: {len(regions)}")
 
     # ==================== OPTIMIZED OCR (JPEG) ====================
     print("\n[2] Optimized OCR (JPEG + Cache)...")
@@ -56,19 +83,17 @@ def run_final_benchmark():
     print(f"    First run (no cache): {t_first:.0f}ms, Regions: {len(regions_opt)}")
 
     # Subsequent runs (fresh, no cache)
-    times = []
-    for i in range(3):
-        optimized_ocr.clear_cache()
-        t0 = time.perf_counter()
-        regions_opt = optimized_ocr.recognize(screenshot, use_cache=False)
-        times.append((time.perf_counter() - t0) * 1000)
+    times = _time_ms(
+        lambda: optimized_ocr.recognize(screenshot, use_cache=False),
+        setup=optimized_ocr.clear_cache,
+    )
 
     results["optimized"] = {
-        "avg_ms": sum(times) / len(times),
+        **_stats(times),
         "regions": len(regions_opt),
         "name": "Optimized (JPEG)",
     }
-    print(f"    Avg (no cache): {results['optimized']['avg_ms']:.0f}ms")
+    print(f"    No cache: {_format_stats(results['optimized'])}")
 
     # With cache
     optimized_ocr.clear_cache()
@@ -91,25 +116,18 @@ def run_final_benchmark():
     # Define taskbar region (bottom of screen)
     taskbar_region = (0, 1040, 1920, 40)  # x, y, width, height
 
-    times = []
-    for i in range(3):
-        t0 = time.perf_counter()
-        regions_taskbar = optimized_ocr.recognize_region(
-            screenshot,
-            taskbar_region[0],
-            taskbar_region[1],
-            taskbar_region[2],
-            taskbar_region[3],
-        )
-        times.append((time.perf_counter() - t0) * 1000)
+    regions_taskbar = optimized_ocr.recognize_region(screenshot, *taskbar_region)
+    times = _time_ms(
+        lambda: optimized_ocr.recognize_region(screenshot, *taskbar_region)
+    )
 
     results["region_taskbar"] = {
-        "avg_ms": sum(times) / len(times),
+        **_stats(times),
         "regions": len(regions_taskbar),
         "name": "Region (taskbar)",
     }
     print(
-        f"    Avg: {results['region_taskbar']['avg_ms']:.0f}ms, Regions: {len(regions_taskbar)}"
+        f"    {_format_stats(results['region_taskbar'])}, Regions: {len(regions_taskbar)}"
     )
 
     # ==================== SMALL REGION OCR ====================
@@ -117,27 +135,83 @@ def run_final_benchmark():
 
     small_region = (100, 100, 400, 200)
 
-    times = []
-    for i in range(3):
-        t0 = time.perf_counter()
-        regions_small = optimized_ocr.recognize_region(
-            screenshot,
-            small_region[0],
-            small_region[1],
-            small_region[2],
-            small_region[3],
-        )
-        times.append((time.perf_counter() - t0) * 1000)
+    regions_small = optimized_ocr.recognize_region(screenshot, *small_region)
+    times = _time_ms(lambda: optimized_ocr.recognize_region(screenshot, *small_region))
 
     results["region_small"] = {
-        "avg_ms": sum(times) / len(times),
+        **_stats(times),
         "regions": len(regions_small),
         "name": "Region (400x200)",
     }
     print(
-        f"    Avg: {results['region_small']['avg_ms']:.0f}ms, Regions: {len(regions_small)}"
+        f"    {_format_stats(results['region_small'])}, Regions: {len(regions_small)}"
     )
 
+    # ==================== BATCHED REGION OCR ====================
+    print("\n[4b] Both regions in one batched call...")
+
+    batch_regions = [taskbar_region, small_region]
+    batched = optimized_ocr.recognize_regions(screenshot, batch_regions)
+    # Clear the cache before each run so every region is really recognized
+    times = _time_ms(
+        lambda: optimized_ocr.recognize_regions(screenshot, batch_regions),
+        setup=optimized_ocr.clear_cache,
+    )
+
+    results["region_batch"] = {
+        **_stats(times),
+        "regions": sum(len(found) for found in batched),
+        "name": "Regions (batched)",
+        "notes": f"1 call, {len(batch_regions)} crops",
+    }
+    print(f"    {_format_stats(results['region_batch'])}")
+
+    # ==================== RAPIDOCR EXECUTION PROVIDERS ====================
+    print("\n[5] RapidOCR (ONNX Runtime CPU / DirectML / int8)...")
+    import onnxruntime as ort
+    from vision.ocr_rapid import RapidOCREngine
+
+    rapid_configs = [("rapid_cpu", "RapidOCR (CPU)", {}, "CPU EP")]
+    if "DmlExecutionProvider" in ort.get_available_providers():
+        rapid_configs.append(
+            ("rapid_dml", "RapidOCR (DirectML)", {"use_dml": True}, "DirectML EP")
+        )
+    else:
+        print("    DirectML not available (pip install onnxruntime-directml)")
+
+    from vision.quantize import rapidocr_int8_paths
+
+    int8_models = rapidocr_int8_paths()
+    if int8_models:
+        rapid_configs.append(
+            ("rapid_int8", "RapidOCR (CPU int8)", int8_models, "INT8 weights")
+        )
+    else:
+        print("    No int8 models (python -m vision.quantize --rapidocr)")
+
+    for key, name, options, notes in rapid_configs:
+        try:
+            rapid_ocr = RapidOCREngine(**options)
+
+            # Two untimed runs: the first loads the models, the second
+            # fills the provider's kernel cache
+            rapid_ocr.recognize(screenshot)
+            regions_rapid = rapid_ocr.recognize(screenshot)
+            times = _time_ms(lambda: rapid_ocr.recognize(screenshot))
+        except Exception as e:
+            print(f"    {name}: ERROR {e}")
+            continue
+
+        results[key] = {
+            **_stats(times),
+            "regions": len(regions_rapid),
+            "name": name,
+            "notes": notes,
+        }
+        print(
+            f"    {name}: {_format_stats(results[key])}, Regions: {len(regions_rapid)}"
+        )
+
     # ==================== SUMMARY ====================
     print("\n" + "=" * 70)
     print("PERFORMANCE SUMMARY")
@@ -150,15 +224,19 @@ def run_final_benchmark():
     )
     print(f"  |---------------------|----------|---------|---------|-----------------|")
 
-    for key in ["original", "optimized", "cached", "region_taskbar", "region_small"]:
+    rows = ["original", "optimized", "cached"]
+    rows += ["region_taskbar", "region_small", "region_batch"]
+    rows += [key for key, *_ in rapid_configs if key in results]
+
+    for key in rows:
         r = results[key]
         speedup = baseline / r["avg_ms"] if r["avg_ms"] > 0 else float("inf")
-        notes = ""
+        notes = r.get("notes", "")
         if key == "optimized":
             notes = f"~{baseline - r['avg_ms']:.0f}ms saved"
         elif key == "cached":
             notes = "Cache hit"
-        elif "region" in key:
+        elif key.startswith("region_") and not notes:
             notes = "Partial screen"
 
         print(
@@ -10,10 +10,12 @@ Requirements:
 Performance Target: ~300ms (vs ~530ms with PowerShell)
 """
 
+import asyncio
+import importlib
 import os
 import sys
+import threading
 import time
-import tempfile
 from typing import List, Optional
 from dataclasses import dataclass
 from PIL import Image
@@ -63,16 +65,28 @@ class NativeOCR:
 
             # Import WinRT types
             # Note: Windows.Media.Ocr requires Windows 10+
-            from System import Uri, Array, Byte
+            from System import Array, Byte, IntPtr
+            from System.Runtime.InteropServices import Marshal
 
             # Try to load Windows.Media.Ocr
             try:
-                # For WinRT APIs, we need to use the winrt package or
-                # access via COM interop
-                import asyncio
+                # Add the CLR references once; per-call AddReference and
+                # imports are pure overhead on every frame
+                clr.AddReference("System.IO")
+                clr.AddReference("System.Drawing")
+                from System.Drawing import Bitmap, Rectangle
+                from System.Drawing.Imaging import ImageLockMode, PixelFormat
 
                 # Store references for later use
                 self._clr = clr
+                self._Array = Array
+                self._Byte = Byte
+                self._IntPtr = IntPtr
+                self._Marshal = Marshal
+                self._Bitmap = Bitmap
+                self._Rectangle = Rectangle
+                self._ImageLockMode = ImageLockMode
+                self._PixelFormat = PixelFormat
                 self._initialized = True
 
             except Exception as e:
@@ -127,66 +141,58 @@ class NativeOCR:
         This is the experimental native implementation.
         """
         # For now, we'll use a hybrid approach:
-        # Save image and use Windows Runtime via COM
-
-        # Save image to temp file
-        with tempfile.NamedTemporaryFile(suffix=".bmp", delete=False) as tmp:
-            temp_path = tmp.name
-            # Save as BMP for faster loading (no compression)
-            if image.mode == "RGBA":
-                image = image.convert("RGB")
-            image.save(tmp, format="BMP")
-
-        try:
-            # Use Windows Script Host for faster OCR access
-            # This is still not fully native but avoids PowerShell startup
-            regions = self._ocr_via_com(temp_path)
-            return regions
-        finally:
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-
-    def _ocr_via_com(self, image_path: str) -> List[TextRegion]:
+        # Hand the raw pixels to Windows Runtime via COM (no temp file,
+        # no BMP encode/read-back)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        width, height = image.size
+        raw = image.tobytes("raw", "BGR")
+
+        # Use Windows Script Host for faster OCR access
+        # This is still not fully native but avoids PowerShell startup
+        return self._ocr_via_com(width, height, raw)
+
+    def _ocr_via_com(self, width: int, height: int, raw: bytes) -> List[TextRegion]:
         """
         Access Windows OCR via COM interop.
 
         This uses the Windows.Media.Ocr API through .NET interop.
+
+        Args:
+            width: Image width in pixels
+            height: Image height in pixels
+            raw: Packed 24-bit BGR pixels, top-down rows
         """
         try:
-            import clr
-            import System
-            from System import Array, Byte, IO
-            from System.Threading.Tasks import Task
-
             # Try to use Windows.Graphics.Imaging and Windows.Media.Ocr
             # These are WinRT APIs that require special handling
-
-            # For embedded Python, we may need to use a different approach
-            # Let's try the Windows.Storage approach
-
-            clr.AddReference("System.IO")
-            clr.AddReference("System.Runtime")
-
-            # Read image bytes
-            with open(image_path, "rb") as f:
-                image_bytes = f.read()
+            # (CLR references and types are cached by _initialize)
 
             # Convert to .NET array
-            byte_array = Array[Byte](image_bytes)
+            byte_array = self._Array[self._Byte](raw)
 
             # Unfortunately, full WinRT async API access requires more setup
             # For now, return empty and let the benchmark show the limitation
 
             # Alternative: Use System.Drawing for faster processing
             try:
-                clr.AddReference("System.Drawing")
-                from System.Drawing import Bitmap
-
-                bitmap = Bitmap(image_path)
-                width = bitmap.Width
-                height = bitmap.Height
+                bitmap = self._Bitmap(width, height, self._PixelFormat.Format24bppRgb)
+                data = bitmap.LockBits(
+                    self._Rectangle(0, 0, width, height),
+                    self._ImageLockMode.WriteOnly,
+                    bitmap.PixelFormat,
+                )
+                try:
+                    row = width * 3
+                    if data.Stride == row:
+                        self._Marshal.Copy(byte_array, 0, data.Scan0, len(raw))
+                    else:
+                        # GDI+ pads rows to 4 bytes
+                        for y in range(height):
+                            dest = self._IntPtr.Add(data.Scan0, y * data.Stride)
+                            self._Marshal.Copy(byte_array, y * row, dest, row)
+                finally:
+                    bitmap.UnlockBits(data)
                 bitmap.Dispose()
 
                 # We successfully loaded via .NET - this proves the path works
@@ -203,29 +209,47 @@ class NativeOCR:
             return []
 
 
+def _import_winrt(namespace: str):
+    """Import a WinRT namespace from winrt-runtime 3.x, or the older winsdk projection"""
+    try:
+        return importlib.import_module(f"winrt.{namespace}")
+    except ImportError:
+        return importlib.import_module(f"winsdk.{namespace}")
+
+
 class WinRTOCR:
     """
     Alternative approach using winrt-runtime package.
 
     This provides cleaner access to Windows Runtime APIs.
     Install with: pip install winrt-runtime winrt-Windows.Media.Ocr
+    winrt-Windows.Graphics.Imaging winrt-Windows.Storage.Streams
+    winrt-Windows.Globalization (or: pip install winsdk)
     """
 
     def __init__(self):
         self._available = False
         self._engine = None
         self._init_error = None
+        self._loop = None
         self._check_availability()
 
+        if self._available:
+            # One persistent loop for every sync call, instead of fetching (or
+            # creating) a loop and re-entering run_until_complete each time
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=self._loop.run_forever, name="winrt-ocr-loop", daemon=True
+            ).start()
+
     def _check_availability(self):
         """Check if winrt packages are available"""
         try:
-            # Try to import winrt packages (new API format for winrt-runtime 3.x)
-            from winrt.windows.media.ocr import OcrEngine
-            from winrt.windows.graphics.imaging import BitmapDecoder, SoftwareBitmap
-            from winrt.windows.storage import StorageFile, FileAccessMode
-            from winrt.windows.storage.streams import RandomAccessStream
-            from winrt.windows.globalization import Language
+            # Try to import winrt packages (winrt-runtime 3.x, or winsdk)
+            OcrEngine = _import_winrt("windows.media.ocr").OcrEngine
+            _import_winrt("windows.graphics.imaging")
+            _import_winrt("windows.storage.streams")
+            Language = _import_winrt("windows.globalization").Language
 
             # Create OCR engine for English (en-US)
             try:
@@ -255,86 +279,159 @@ class WinRTOCR:
     def get_error(self) -> Optional[str]:
         return self._init_error
 
-    async def recognize_async(self, image: Image.Image) -> List[TextRegion]:
+    async def recognize_async(
+        self, image: Image.Image, raise_errors: bool = False
+    ) -> List[TextRegion]:
         """
         Async OCR recognition using WinRT.
 
         Must be called from an async context.
+
+        Args:
+            image: PIL Image
+            raise_errors: Raise on failure instead of returning [], so callers
+                can tell "no text" from "OCR failed"
         """
         if not self._available:
+            if raise_errors:
+                raise RuntimeError(f"WinRT OCR unavailable: {self._init_error}")
             return []
 
         try:
-            from winrt.windows.graphics.imaging import BitmapDecoder, SoftwareBitmap
-            from winrt.windows.storage import StorageFile, FileAccessMode
-
-            # Save image to temp file
-            with tempfile.NamedTemporaryFile(suffix=".bmp", delete=False) as tmp:
-                temp_path = tmp.name
-                if image.mode == "RGBA":
-                    image = image.convert("RGB")
-                image.save(tmp, format="BMP")
-
-            try:
-                # Open file
-                file = await StorageFile.get_file_from_path_async(temp_path)
-                stream = await file.open_async(FileAccessMode.READ)  # Read mode
-
-                # Decode image
-                decoder = await BitmapDecoder.create_async(stream)
-                bitmap = await decoder.get_software_bitmap_async()
-
-                # Run OCR
-                result = await self._engine.recognize_async(bitmap)
-
-                # Convert results
-                regions = []
-                for line in result.lines:
-                    for word in line.words:
-                        rect = word.bounding_rect
-                        regions.append(
-                            TextRegion(
-                                text=word.text,
-                                x=int(rect.x + rect.width / 2),
-                                y=int(rect.y + rect.height / 2),
-                                width=int(rect.width),
-                                height=int(rect.height),
-                                confidence=1.0,
-                            )
+            bitmap = self._to_software_bitmap(image)
+
+            # Run OCR
+            result = await self._engine.recognize_async(bitmap)
+
+            # Convert results
+            regions = []
+            for line in result.lines:
+                for word in line.words:
+                    rect = word.bounding_rect
+                    regions.append(
+                        TextRegion(
+                            text=word.text,
+                            x=int(rect.x + rect.width / 2),
+                            y=int(rect.y + rect.height / 2),
+                            width=int(rect.width),
+                            height=int(rect.height),
+                            confidence=1.0,
                         )
+                    )
 
-                return regions
-
-            finally:
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+            return regions
 
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"WinRT OCR error: {e}")
             return []
 
-    def recognize(self, image: Image.Image) -> List[TextRegion]:
+    @staticmethod
+    def _to_software_bitmap(image: Image.Image):
+        """
+        Copy the pixels straight into a BGRA8 SoftwareBitmap.
+
+        No file, no encode/decode pass and no lossy round-trip: the packed
+        BGRA bytes go through a DataWriter into an IBuffer, and from there
+        into the bitmap.
+        """
+        imaging = _import_winrt("windows.graphics.imaging")
+        streams = _import_winrt("windows.storage.streams")
+
+        if image.mode != "RGBA":
+            image = image.convert("RGBA")
+        pixels = image.tobytes("raw", "BGRA")
+
+        writer = streams.DataWriter()
+        writer.write_bytes(pixels)
+        buffer = writer.detach_buffer()
+
+        width, height = image.size
+        return imaging.SoftwareBitmap.create_copy_from_buffer(
+            buffer,
+            imaging.BitmapPixelFormat.BGRA8,
+            width,
+            height,
+            imaging.BitmapAlphaMode.PREMULTIPLIED,
+        )
+
+    async def recognize_many_async(
+        self, images: List[Image.Image], return_exceptions: bool = False
+    ) -> list:
+        """
+        OCR several images concurrently.
+
+        Each image's RecognizeAsync is in flight at the same time, so the
+        wall time is roughly that of the slowest image, not the sum.
+
+        Args:
+            images: PIL Images
+            return_exceptions: Put the exception in place of a failed image's
+                result instead of an empty list
+
+        Returns:
+            One list of TextRegion objects (or exception) per image
+        """
+        return list(
+            await asyncio.gather(
+                *(self.recognize_async(img, return_exceptions) for img in images),
+                return_exceptions=return_exceptions,
+            )
+        )
+
+    def _run(self, coro):
+        """Run a coroutine on the background event loop and wait for it"""
+        if self._loop is None:
+            # Engine unavailable: recognize_async returns [] without awaiting
+            return asyncio.run(coro)
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def recognize(
+        self, image: Image.Image, raise_errors: bool = False
+    ) -> List[TextRegion]:
         """
         Sync wrapper for OCR recognition.
         """
-        import asyncio
+        return self._run(self.recognize_async(image, raise_errors))
 
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+    def recognize_many(
+        self, images: List[Image.Image], return_exceptions: bool = False
+    ) -> list:
+        """
+        Sync wrapper for recognize_many_async (results in input order).
+        """
+        return self._run(self.recognize_many_async(images, return_exceptions))
+
+
+# Shared WinRTOCR instance (None when the projection is not usable)
+_winrt_ocr: Optional[WinRTOCR] = None
+_winrt_ocr_checked = False
+_winrt_ocr_lock = threading.Lock()
 
-        return loop.run_until_complete(self.recognize_async(image))
+
+def get_winrt_ocr() -> Optional[WinRTOCR]:
+    """Get the singleton WinRTOCR instance, or None if WinRT OCR is unavailable"""
+    global _winrt_ocr, _winrt_ocr_checked
+    if not _winrt_ocr_checked:
+        with _winrt_ocr_lock:
+            if not _winrt_ocr_checked:
+                ocr = WinRTOCR()
+                _winrt_ocr = ocr if ocr.is_available() else None
+                _winrt_ocr_checked = True
+    return _winrt_ocr
 
 
 def test_native_ocr():
     """Test native OCR implementation"""
-    from PIL import ImageGrab
     import time
 
+    # Handle both relative and absolute imports
+    try:
+        from vision.capture import grab_screen
+    except ImportError:
+        from capture import grab_screen
+
     print("=" * 60)
     print("Native OCR Test (pythonnet)")
     print("=" * 60)
@@ -346,7 +443,7 @@ def test_native_ocr():
     if native.is_available():
         print("    [OK] NativeOCR initialized successfully")
 
-        screenshot = ImageGrab.grab()
+        screenshot = grab_screen()
 
         t0 = time.perf_counter()
         regions = native.recognize(screenshot)
@@ -363,7 +460,7 @@ def test_native_ocr():
     if winrt_ocr.is_available():
         print("    [OK] WinRTOCR initialized successfully")
 
-        screenshot = ImageGrab.grab()
+        screenshot = grab_screen()
 
         t0 = time.perf_counter()
         regions = winrt_ocr.recognize(screenshot)
@@ -383,7 +480,7 @@ def test_native_ocr():
             from ocr import WindowsOCR
 
         ps_ocr = WindowsOCR()
-        screenshot = ImageGrab.grab()
+        screenshot = grab_screen()
 
         t0 = time.perf_counter()
         regions = ps_ocr.recognize(screenshot)
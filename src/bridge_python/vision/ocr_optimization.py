@@ -6,6 +6,7 @@ import time
 from PIL import ImageGrab, Image
 import sys
 import os
+from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -47,19 +48,18 @@ def test_windows_ocr_optimization():
             "Bypass",
             "-File",
             ocr._script_path,
-            temp_path,
         ],
+        # The script reads the encoded image from stdin
+        input=Path(temp_path).read_bytes(),
         capture_output=True,
         timeout=30,
-        encoding="utf-8",
-        errors="replace",
     )
     t_ps = (time.perf_counter() - t0) * 1000
     print(f"    PowerShell execution: {t_ps:.1f}ms")
 
     # Step 3: Parse JSON
     t0 = time.perf_counter()
-    output = result.stdout.strip()
+    output = result.stdout.decode("utf-8", errors="replace").strip()
     if output:
         import re
 
@@ -90,14 +90,13 @@ def test_windows_ocr_optimization():
             "Bypass",
             "-File",
             ocr._script_path,
-            temp_path,
         ],
+        # The script reads the encoded image from stdin
+        input=Path(temp_path).read_bytes(),
         capture_output=True,
         timeout=30,
-        encoding="utf-8",
-        errors="replace",
     )
-    output = result.stdout.strip()
+    output = result.stdout.decode("utf-8", errors="replace").strip()
     if output:
         import re
 
@@ -127,14 +126,13 @@ def test_windows_ocr_optimization():
             "Bypass",
             "-File",
             ocr._script_path,
-            temp_path,
         ],
+        # The script reads the encoded image from stdin
+        input=Path(temp_path).read_bytes(),
         capture_output=True,
         timeout=30,
-        encoding="utf-8",
-        errors="replace",
     )
-    output = result.stdout.strip()
+    output = result.stdout.decode("utf-8", errors="replace").strip()
     if output:
         import re
 
@@ -164,14 +162,13 @@ def test_windows_ocr_optimization():
             "Bypass",
             "-File",
             ocr._script_path,
-            temp_path,
         ],
+        # The script reads the encoded image from stdin
+        input=Path(temp_path).read_bytes(),
         capture_output=True,
         timeout=30,
-        encoding="utf-8",
-        errors="replace",
     )
-    output = result.stdout.strip()
+    output = result.stdout.decode("utf-8", errors="replace").strip()
     if output:
         import re
 
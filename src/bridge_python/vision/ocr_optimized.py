@@ -6,34 +6,28 @@ Optimizations implemented:
 2. Region-based OCR (only scan specific areas)
 3. Caching with smart invalidation
 4. Parallel OCR for multiple regions
-5. JPEG format fallback for PowerShell (if WinRT unavailable)
+5. PowerShell worker fallback (if WinRT is unavailable or fails)
 """
 
-import subprocess
-import json
-import os
-import tempfile
 import hashlib
 import time
 from PIL import Image
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from concurrent.futures import ThreadPoolExecutor
 import threading
 
-from .ocr import TextRegion, OCR_POWERSHELL_SCRIPT
+from .ocr import TextRegion, get_powershell_ocr
 
 # Try to import WinRT OCR engine (3x faster than PowerShell)
 _WINRT_AVAILABLE = False
 _winrt_ocr_instance = None
 
 try:
-    from .ocr_native import WinRTOCR
+    from .ocr_native import get_winrt_ocr
 
-    _test_winrt = WinRTOCR()
-    if _test_winrt.is_available():
-        _WINRT_AVAILABLE = True
-        _winrt_ocr_instance = _test_winrt
+    _winrt_ocr_instance = get_winrt_ocr()
+    _WINRT_AVAILABLE = _winrt_ocr_instance is not None
 except ImportError:
     pass
 except Exception:
@@ -59,9 +53,6 @@ class OptimizedOCR:
             cache_ttl: Cache time-to-live in seconds
             prefer_winrt: Use WinRT OCR if available (3x faster)
         """
-        self._script_path: str = ""
-        self._create_script()
-
         # WinRT OCR engine (preferred - 3x faster)
         self._use_winrt = prefer_winrt and _WINRT_AVAILABLE
         self._winrt_ocr = _winrt_ocr_instance if self._use_winrt else None
@@ -74,14 +65,6 @@ class OptimizedOCR:
         # Thread pool for parallel OCR
         self._executor = ThreadPoolExecutor(max_workers=4)
 
-    def _create_script(self):
-        """Create the PowerShell script file"""
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        self._script_path = os.path.join(script_dir, "_ocr_script.ps1")
-
-        with open(self._script_path, "w", encoding="utf-8") as f:
-            f.write(OCR_POWERSHELL_SCRIPT)
-
     def _get_image_hash(self, image: Image.Image) -> str:
         """Get a quick hash of image for caching"""
         # Sample pixels for fast hash (not full image)
@@ -135,105 +118,33 @@ class OptimizedOCR:
             if cached is not None:
                 return cached
 
-        # Use WinRT OCR if available (3x faster than PowerShell)
-        if self._use_winrt and self._winrt_ocr:
-            try:
-                regions = self._winrt_ocr.recognize(image)
-                if use_cache and cache_key:
-                    self._store_cache(cache_key, regions)
-                return regions
-            except Exception:
-                # Fall back to PowerShell on error
-                pass
+        try:
+            regions = self._recognize_uncached(image)
+        except Exception:
+            # Failures are not cached, so the next call retries
+            return []
 
-        # Fallback: PowerShell OCR
-        return self._recognize_powershell(image, use_cache, cache_key)
+        if use_cache and cache_key:
+            self._store_cache(cache_key, regions)
+        return regions
 
-    def _recognize_powershell(
-        self,
-        image: Image.Image,
-        use_cache: bool = True,
-        cache_key: Optional[str] = None,
-    ) -> List[TextRegion]:
+    def _recognize_uncached(self, image: Image.Image) -> List[TextRegion]:
         """
-        Recognize text using PowerShell subprocess (fallback method).
+        OCR one image, bypassing the cache. Raises when OCR fails, so an error
+        is never mistaken for (and cached as) "no text".
         """
-        # Save as JPEG (faster than PNG)
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-            temp_path = tmp.name
-            if image.mode == "RGBA":
-                image = image.convert("RGB")
-            image.save(tmp, format="JPEG", quality=90)
-
-        try:
-            result = subprocess.run(
-                [
-                    "powershell",
-                    "-ExecutionPolicy",
-                    "Bypass",
-                    "-File",
-                    self._script_path,
-                    temp_path,
-                ],
-                capture_output=True,
-                timeout=30,
-                encoding="utf-8",
-                errors="replace",
-            )
-
-            if result.returncode != 0:
-                return []
-
-            output = result.stdout.strip()
-            if not output or output == "[]":
-                return []
-
-            import re
-
-            output = re.sub(r"[\x00-\x1f\x7f]", "", output)
-
-            try:
-                raw_results = json.loads(output)
-            except json.JSONDecodeError:
-                return []
-
-            regions = []
-            for r in raw_results:
-                if isinstance(r, str):
-                    r = raw_results
-                    regions.append(
-                        TextRegion(
-                            text=r.get("text", ""),
-                            x=r["left"] + r["width"] // 2,
-                            y=r["top"] + r["height"] // 2,
-                            width=r["width"],
-                            height=r["height"],
-                        )
-                    )
-                    break
-                else:
-                    regions.append(
-                        TextRegion(
-                            text=r.get("text", ""),
-                            x=r["left"] + r["width"] // 2,
-                            y=r["top"] + r["height"] // 2,
-                            width=r["width"],
-                            height=r["height"],
-                        )
-                    )
-
-            # Store in cache
-            if use_cache and cache_key:
-                self._store_cache(cache_key, regions)
-
-            return regions
-
-        finally:
+        # Use WinRT OCR if available (3x faster than PowerShell)
+        if self._use_winrt and self._winrt_ocr:
             try:
-                os.unlink(temp_path)
-            except:
+                return self._winrt_ocr.recognize(image, raise_errors=True)
+            except Exception:
+                # Fall back to the PowerShell worker on error
                 pass
 
+        # Fallback: a PowerShell-only WindowsOCR (get_ocr() would use the same
+        # in-process WinRT engine again)
+        return get_powershell_ocr().recognize(image)
+
     def recognize_region(
         self,
         image: Image.Image,
@@ -252,19 +163,99 @@ class OptimizedOCR:
 
         Returns:
             List of TextRegion objects with adjusted coordinates
+
+        Raises:
+            Exception: If OCR of the region fails
         """
-        # Crop to region
-        region = image.crop((x, y, x + width, y + height))
+        return self._recognize_crops(
+            image, [(x, y, width, height)], raise_errors=True
+        )[0]
 
-        # OCR the region
-        regions = self.recognize(region, use_cache=True)
+    def _recognize_crops(
+        self,
+        image: Image.Image,
+        regions: List[Tuple[int, int, int, int]],
+        raise_errors: bool = False,
+    ) -> List[List[TextRegion]]:
+        """
+        OCR several (x, y, width, height) crops concurrently.
 
-        # Adjust coordinates back to full image space
-        for r in regions:
-            r.x += x
-            r.y += y
+        Cache hits are served directly. With WinRT the misses are recognized
+        with one asyncio.gather over RecognizeAsync; crops WinRT fails on (or
+        all misses, without WinRT) run on the thread pool. Returns one list
+        per region, in region order and in full-image coordinates (cached
+        TextRegions are copied, not shifted).
 
-        return regions
+        Only successful results are cached. A failed crop raises when
+        raise_errors is set, and otherwise yields [] for this call only.
+        """
+        crops = [image.crop((x, y, x + w, y + h)) for x, y, w, h in regions]
+        keys = [self._get_image_hash(crop) for crop in crops]
+        results: List[Optional[List[TextRegion]]] = [
+            self._check_cache(key) for key in keys
+        ]
+        pending = [i for i, found in enumerate(results) if found is None]
+
+        if pending and self._use_winrt and self._winrt_ocr and len(pending) > 1:
+            try:
+                fresh = self._winrt_ocr.recognize_many(
+                    [crops[i] for i in pending], return_exceptions=True
+                )
+            except Exception:
+                # Fall back to per-crop recognition
+                fresh = [None] * len(pending)
+
+            retry = []
+            for i, found in zip(pending, fresh):
+                if isinstance(found, list):
+                    self._store_cache(keys[i], found)
+                    results[i] = found
+                else:
+                    retry.append(i)
+            pending = retry
+
+        if pending:
+            futures = [
+                self._executor.submit(self._recognize_uncached, crops[i])
+                for i in pending
+            ]
+            for i, future in zip(pending, futures):
+                try:
+                    found = future.result(timeout=30)
+                except Exception:
+                    if raise_errors:
+                        raise
+                    # Not cached: a transient failure must not hide the text
+                    results[i] = []
+                    continue
+                self._store_cache(keys[i], found)
+                results[i] = found
+
+        return [
+            [replace(r, x=r.x + x, y=r.y + y) for r in found]
+            for (x, y, _, _), found in zip(regions, results)
+        ]
+
+    def recognize_regions(
+        self,
+        image: Image.Image,
+        regions: List[Tuple[int, int, int, int]],
+    ) -> List[List[TextRegion]]:
+        """
+        OCR several regions in one batched call.
+
+        With WinRT all crops are in flight in a single gather instead of one
+        round-trip per region.
+
+        Args:
+            image: Full PIL Image
+            regions: List of (x, y, width, height) tuples
+
+        Returns:
+            One list of TextRegion objects per region, in region order,
+            with full-image coordinates
+        """
+        return self._recognize_crops(image, regions)
 
     def recognize_regions_parallel(
         self,
@@ -281,23 +272,7 @@ class OptimizedOCR:
         Returns:
             Combined list of TextRegion objects
         """
-
-        def ocr_region(region_coords):
-            x, y, w, h = region_coords
-            return self.recognize_region(image, x, y, w, h)
-
-        # Submit all regions for parallel processing
-        futures = [self._executor.submit(ocr_region, r) for r in regions]
-
-        # Collect results
-        all_regions = []
-        for future in futures:
-            try:
-                all_regions.extend(future.result(timeout=30))
-            except Exception:
-                pass
-
-        return all_regions
+        return [r for found in self._recognize_crops(image, regions) for r in found]
 
     def find_text_fast(
         self,
@@ -308,7 +283,8 @@ class OptimizedOCR:
         """
         Fast text search with optional region hints.
 
-        If hint_regions provided, only searches those areas first.
+        If hint_regions provided, those areas are OCR'd concurrently first
+        and the match from the earliest hint wins.
         Falls back to full image if not found.
 
         Args:
@@ -323,8 +299,7 @@ class OptimizedOCR:
 
         # Try hint regions first
         if hint_regions:
-            for x, y, w, h in hint_regions:
-                regions = self.recognize_region(image, x, y, w, h)
+            for regions in self._recognize_crops(image, hint_regions):
                 for r in regions:
                     if search_lower in r.text.lower():
                         return r
@@ -0,0 +1,127 @@
+"""
+Model quantization helper - int8 weight quantization for ONNX models
+
+Produces a `<name>_int8.onnx` file next to the source model using ONNX
+Runtime's dynamic (weight-only) quantization. No calibration data is needed.
+
+Usage:
+    python -m vision.quantize path/to/model.onnx [output.onnx]
+    python -m vision.quantize --rapidocr [output_dir]
+"""
+
+import os
+import sys
+from typing import Dict, Optional
+
+# Where the int8 RapidOCR det/cls/rec models are written (site-packages may
+# not be writable, and the fp32 originals stay untouched)
+RAPIDOCR_INT8_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "rapidocr"
+)
+
+
+def int8_path(model_path: str) -> str:
+    """Path of the int8 variant for a model ('x_fp16.onnx' -> 'x_int8.onnx')"""
+    base, ext = os.path.splitext(model_path)
+    for suffix in ("_fp16", "_fp32"):
+        if base.endswith(suffix):
+            base = base[: -len(suffix)]
+            break
+    return f"{base}_int8{ext}"
+
+
+def quantize_model(model_path: str, output_path: Optional[str] = None) -> str:
+    """
+    Quantize an ONNX model's weights to int8.
+
+    Args:
+        model_path: Source ONNX model
+        output_path: Destination (default: int8_path(model_path))
+
+    Returns:
+        Path of the quantized model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_path = output_path or int8_path(model_path)
+    quantize_dynamic(model_path, output_path, weight_type=QuantType.QInt8)
+    return output_path
+
+
+def rapidocr_model_paths() -> Dict[str, str]:
+    """Paths of the det/cls/rec models bundled with rapidocr_onnxruntime"""
+    import rapidocr_onnxruntime
+
+    models_dir = os.path.join(os.path.dirname(rapidocr_onnxruntime.__file__), "models")
+    paths = {}
+    for name in sorted(os.listdir(models_dir)):
+        if not name.endswith(".onnx") or "_int8" in name:
+            continue
+        for model in ("det", "cls", "rec"):
+            if f"_{model}" in name:
+                paths.setdefault(model, os.path.join(models_dir, name))
+    return paths
+
+
+def rapidocr_int8_paths(
+    output_dir: str = RAPIDOCR_INT8_DIR,
+) -> Optional[Dict[str, str]]:
+    """
+    RapidOCR keyword arguments for the int8 models, if all three exist.
+
+    Returns:
+        {"det_model_path": ..., "cls_model_path": ..., "rec_model_path": ...},
+        or None when quantize_rapidocr has not been run
+    """
+    if not os.path.isdir(output_dir):
+        return None
+
+    kwargs = {}
+    for name in os.listdir(output_dir):
+        for model in ("det", "cls", "rec"):
+            if f"_{model}" in name and name.endswith("_int8.onnx"):
+                kwargs[f"{model}_model_path"] = os.path.join(output_dir, name)
+    return kwargs if len(kwargs) == 3 else None
+
+
+def quantize_rapidocr(output_dir: str = RAPIDOCR_INT8_DIR) -> Dict[str, str]:
+    """
+    Quantize RapidOCR's det, cls and rec models to int8.
+
+    Args:
+        output_dir: Directory for the '<name>_int8.onnx' files
+
+    Returns:
+        Model name ('det', 'cls', 'rec') -> quantized model path
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    return {
+        model: quantize_model(
+            src, os.path.join(output_dir, os.path.basename(int8_path(src)))
+        )
+        for model, src in rapidocr_model_paths().items()
+    }
+
+
+def _report(src: str, out: str):
+    print(
+        f"Quantized {src} ({os.path.getsize(src) / 1e6:.1f} MB) -> "
+        f"{out} ({os.path.getsize(out) / 1e6:.1f} MB)"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    if sys.argv[1] == "--rapidocr":
+        output_dir = sys.argv[2] if len(sys.argv) > 2 else RAPIDOCR_INT8_DIR
+        sources = rapidocr_model_paths()
+        for model, out in quantize_rapidocr(output_dir).items():
+            _report(sources[model], out)
+        sys.exit(0)
+
+    src = sys.argv[1]
+    dst = sys.argv[2] if len(sys.argv) > 2 else None
+    _report(src, quantize_model(src, dst))
@@ -0,0 +1,177 @@
+"""
+Parallel Lanczos downscaling for captured frames
+
+Separable Lanczos-3 resample of (H, W, C) uint8 arrays. With numba installed
+both passes run as compiled kernels spread over all cores with prange
+(Pillow's resize is single-threaded); otherwise, and for frames too small to
+amortize the dispatch, lanczos_resize returns None and the caller keeps using
+Pillow.
+
+The float intermediate (and the output, when the caller asks for it) lives in
+per-thread scratch buffers that are reused while the frame size stays the
+same, so the capture worker and stream producer stop allocating multi-MB
+arrays on every frame.
+"""
+
+import math
+import threading
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Try to import numba (JIT-compiled kernels)
+_NUMBA_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    pass
+
+# Below this many source pixels (e.g. a 1920x40 taskbar strip) thread
+# dispatch costs more than Pillow's single-threaded resize
+MIN_PARALLEL_PIXELS = 512 * 512
+
+LANCZOS_SUPPORT = 3.0
+
+_scratch = threading.local()
+
+
+def scratch_buffer(name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+    """
+    Uninitialized array owned by the calling thread, reused across calls.
+
+    The previous contents are overwritten by the next call with the same
+    name, so the result must not outlive the caller's current frame.
+    """
+    buffers = _scratch.__dict__
+    buf = buffers.get(name)
+    if buf is None or buf.shape != shape or buf.dtype != dtype:
+        buf = np.empty(shape, dtype=dtype)
+        buffers[name] = buf
+    return buf
+
+
+def _lanczos(x: np.ndarray) -> np.ndarray:
+    """Lanczos-3 window, zero outside [-3, 3]"""
+    return np.where(
+        np.abs(x) < LANCZOS_SUPPORT,
+        np.sinc(x) * np.sinc(x / LANCZOS_SUPPORT),
+        0.0,
+    )
+
+
+@lru_cache(maxsize=16)
+def _coefficients(
+    in_size: int, out_size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-output-pixel filter taps, computed the way Pillow does.
+
+    Returns:
+        (start, count, weights): first source index and number of taps for
+        each output pixel, and an (out_size, max_taps) float32 weight table
+        normalized per row
+    """
+    scale = in_size / out_size
+    filterscale = max(scale, 1.0)
+    support = LANCZOS_SUPPORT * filterscale
+    taps = int(math.ceil(support)) * 2 + 1
+
+    centers = (np.arange(out_size) + 0.5) * scale
+    start = np.maximum((centers - support + 0.5).astype(np.int64), 0)
+    stop = np.minimum((centers + support + 0.5).astype(np.int64), in_size)
+    count = np.minimum(stop - start, taps)
+
+    offsets = np.arange(taps)
+    x = (start[:, None] + offsets[None, :] - centers[:, None] + 0.5) / filterscale
+    weights = _lanczos(x)
+    weights[offsets[None, :] >= count[:, None]] = 0.0
+    total = weights.sum(axis=1, keepdims=True)
+    weights /= np.where(total != 0.0, total, 1.0)
+
+    return start, count, weights.astype(np.float32)
+
+
+if _NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _resample_horizontal(src, channels, start, count, weights, out):
+        for y in prange(src.shape[0]):
+            for x in range(out.shape[1]):
+                s = start[x]
+                for ch in range(channels):
+                    acc = 0.0
+                    for i in range(count[x]):
+                        acc += src[y, s + i, ch] * weights[x, i]
+                    out[y, x, ch] = acc
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _resample_vertical(tmp, channels, start, count, weights, out):
+        for y in prange(out.shape[0]):
+            s = start[y]
+            for x in range(out.shape[1]):
+                for ch in range(channels):
+                    acc = 0.0
+                    for i in range(count[y]):
+                        acc += tmp[s + i, x, ch] * weights[y, i]
+                    acc += 0.5
+                    if acc < 0.0:
+                        acc = 0.0
+                    elif acc > 255.0:
+                        acc = 255.0
+                    out[y, x, ch] = np.uint8(acc)
+                # Padding/alpha channel of BGRA frames is not resampled
+                for ch in range(channels, out.shape[2]):
+                    out[y, x, ch] = 255
+
+
+def lanczos_resize(
+    image: np.ndarray, size: Tuple[int, int], scratch: bool = False
+) -> Optional[np.ndarray]:
+    """
+    Resize an (H, W, C) uint8 frame with the parallel Lanczos kernels.
+
+    Args:
+        image: RGB or BGRA frame (may be non-contiguous)
+        size: Output (width, height)
+        scratch: Write into the thread's scratch output buffer instead of a
+            new array (valid until this thread's next scratch resize)
+
+    Returns:
+        Resized (height, width, C) uint8 array, or None when numba is not
+        installed or the frame is too small to benefit
+    """
+    if not _NUMBA_AVAILABLE or image.ndim != 3:
+        return None
+    height, width, depth = image.shape
+    if height * width < MIN_PARALLEL_PIXELS:
+        return None
+
+    out_width, out_height = size
+    channels = min(depth, 3)
+    x_start, x_count, x_weights = _coefficients(width, out_width)
+    y_start, y_count, y_weights = _coefficients(height, out_height)
+
+    tmp = scratch_buffer("resize_tmp", (height, out_width, channels), np.float32)
+    _resample_horizontal(image, channels, x_start, x_count, x_weights, tmp)
+    out_shape = (out_height, out_width, depth)
+    if scratch:
+        out = scratch_buffer("resize_out", out_shape, np.uint8)
+    else:
+        out = np.empty(out_shape, dtype=np.uint8)
+    _resample_vertical(tmp, channels, y_start, y_count, y_weights, out)
+    return out
+
+
+def warmup():
+    """Compile (or load the cached) Numba kernels ahead of the first request"""
+    side = int(math.sqrt(MIN_PARALLEL_PIXELS))
+    lanczos_resize(np.zeros((side, side, 4), dtype=np.uint8), (side // 2, side // 2))
+
+
+def get_resize_backend() -> str:
+    """Name of the large-frame resize implementation in use"""
+    return "numba" if _NUMBA_AVAILABLE else "pillow"
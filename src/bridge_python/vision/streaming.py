@@ -1,18 +1,151 @@
 """
 Vision Streaming - WebSocket-based real-time screenshot streaming
+
+All /vision/stream clients share one FrameBroadcaster: a single thread
+captures at the fastest requested rate and encodes each frame once per
+distinct (quality, max_width, max_height), so N viewers cost one capture.
+
+Clients connecting with ?binary=1 receive each JPEG as a binary frame plus a
+small JSON text frame with the frame metadata about once per second; frames
+for those params are then never base64-encoded unless a text client shares
+them.
 """
 
+import json
 import time
 import logging
-from PIL import ImageGrab
-from .vision_service import VisionConfig, optimize_screenshot, get_screenshot_cache
+import threading
+from typing import Dict, Optional, Tuple
+
+from .capture import grab_screen_bgra
+from .vision_service import OptimizedScreenshot, VisionConfig, optimize_screenshot
+
+# (quality, max_width, max_height)
+StreamParams = Tuple[int, int, int]
+
+# Seconds between metadata text frames for binary clients
+METADATA_INTERVAL = 1.0
+
+
+class FrameBroadcaster:
+    """
+    Single-producer, multi-consumer screenshot source.
+
+    The producer thread runs only while there are subscribers. Each encoded
+    frame is kept as the latest frame for its params, so a new subscriber
+    gets a frame immediately and slower subscribers simply skip frames.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        # sub_id -> (params, interval, binary)
+        self._subscribers: Dict[int, Tuple[StreamParams, float, bool]] = {}
+        self._frames: Dict[StreamParams, Tuple[int, OptimizedScreenshot]] = {}
+        self._seq = 0
+        self._next_id = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, params: StreamParams, fps: int, binary: bool = False) -> int:
+        """Register a consumer and start the producer if needed"""
+        with self._cond:
+            sub_id = self._next_id
+            self._next_id += 1
+            self._subscribers[sub_id] = (params, 1.0 / fps, binary)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="FrameBroadcaster", daemon=True
+                )
+                self._thread.start()
+            return sub_id
+
+    def unsubscribe(self, sub_id: int):
+        """Remove a consumer; the producer stops after the last one leaves"""
+        with self._cond:
+            self._subscribers.pop(sub_id, None)
+            wanted = {params for params, _, _ in self._subscribers.values()}
+            for params in list(self._frames):
+                if params not in wanted:
+                    del self._frames[params]
+
+    def next_frame(
+        self,
+        params: StreamParams,
+        after_seq: int,
+        timeout: float = 2.0,
+        needs_text: bool = False,
+    ) -> Optional[Tuple[int, OptimizedScreenshot]]:
+        """
+        Wait for a frame newer than after_seq.
+
+        Args:
+            params: Stream params of the caller
+            after_seq: Sequence number of the last frame the caller sent
+            timeout: Seconds to wait
+            needs_text: Only return frames with base64 data. Frames encoded
+                while only binary clients used these params have empty data.
+
+        Returns:
+            (seq, frame), or None if nothing suitable arrived within timeout
+        """
+
+        def ready() -> bool:
+            seq, frame = self._frames.get(params, (-1, None))
+            return seq > after_seq and (not needs_text or bool(frame.data))
+
+        with self._cond:
+            if self._cond.wait_for(ready, timeout):
+                return self._frames[params]
+        return None
+
+    def _run(self):
+        """Producer loop: capture once, encode once per distinct params"""
+        while True:
+            frame_start = time.time()
+            with self._cond:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+                interval = min(i for _, i, _ in self._subscribers.values())
+                # params -> whether any text client needs base64
+                wanted: Dict[StreamParams, bool] = {}
+                for params, _, binary in self._subscribers.values():
+                    wanted[params] = wanted.get(params, False) or not binary
+
+            encoded = {}
+            try:
+                screenshot = grab_screen_bgra()
+                for params, needs_text in wanted.items():
+                    quality, max_width, max_height = params
+                    encoded[params] = optimize_screenshot(
+                        screenshot,
+                        max_width=max_width,
+                        max_height=max_height,
+                        jpeg_quality=quality,
+                        encode_base64=needs_text,
+                    )
+            except Exception:
+                logging.exception("Stream capture failed")
+
+            with self._cond:
+                self._seq += 1
+                for params, frame in encoded.items():
+                    self._frames[params] = (self._seq, frame)
+                self._cond.notify_all()
+
+            # Run at the fastest subscriber's rate
+            sleep_time = interval - (time.time() - frame_start)
+            if sleep_time > 0:
+                time.sleep(sleep_time)
 
 
 class VisionStreamer:
     """Handles real-time screenshot streaming over WebSockets."""
 
+    def __init__(self):
+        self.broadcaster = FrameBroadcaster()
+
     def stream_screenshots(
-        self, ws, fps=5, quality=None, max_width=None, max_height=None
+        self, ws, fps=5, quality=None, max_width=None, max_height=None, binary=False
     ):
         """
         Stream screenshots over WebSocket.
@@ -23,6 +156,8 @@ class VisionStreamer:
             quality: JPEG quality override
             max_width: Max width override
             max_height: Max height override
+            binary: Send raw JPEG bytes as binary frames, with a JSON metadata
+                text frame about once per second, instead of base64 text
         """
         # Apply defaults and clamp FPS
         fps = max(1, min(30, fps))
@@ -30,42 +165,60 @@ class VisionStreamer:
         quality = quality or VisionConfig.jpeg_quality
         max_width = max_width or VisionConfig.max_width
         max_height = max_height or VisionConfig.max_height
-        cache = get_screenshot_cache()
+        params = (quality, max_width, max_height)
 
-        logging.info(f"Starting screenshot stream: {fps} FPS, quality={quality}")
+        logging.info(
+            f"Starting screenshot stream: {fps} FPS, quality={quality}, "
+            f"binary={binary}"
+        )
 
+        sub_id = self.broadcaster.subscribe(params, fps, binary)
+        seq = -1
+        last_metadata = 0.0
         try:
             while True:
                 frame_start = time.time()
 
-                # Try cache first, capture if miss
-                optimized = cache.get(
-                    quality=quality, max_width=max_width, max_height=max_height
+                latest = self.broadcaster.next_frame(
+                    params, seq, needs_text=not binary
                 )
-                if not optimized:
-                    screenshot = ImageGrab.grab()
-                    optimized = optimize_screenshot(
-                        screenshot,
-                        max_width=max_width,
-                        max_height=max_height,
-                        jpeg_quality=quality,
-                    )
-                    cache.put(
-                        optimized,
-                        quality=quality,
-                        max_width=max_width,
-                        max_height=max_height,
-                    )
-
-                ws.send(optimized.data)
+                if latest:
+                    seq, frame = latest
+                    if not binary:
+                        if frame.data:
+                            ws.send(frame.data)
+                    else:
+                        if frame_start - last_metadata >= METADATA_INTERVAL:
+                            ws.send(_metadata_message(frame))
+                            last_metadata = frame_start
+                        ws.send(frame.raw)
 
-                # Maintain target FPS
+                # Maintain target FPS (frames produced meanwhile are skipped)
                 sleep_time = interval - (time.time() - frame_start)
                 if sleep_time > 0:
                     time.sleep(sleep_time)
 
         except Exception as e:
             logging.info(f"Stream closed: {e}")
+        finally:
+            self.broadcaster.unsubscribe(sub_id)
+
+
+def _metadata_message(frame: OptimizedScreenshot) -> str:
+    """JSON text frame describing the binary frames that follow"""
+    return json.dumps(
+        {
+            "type": "metadata",
+            "width": frame.width,
+            "height": frame.height,
+            "original_width": frame.original_width,
+            "original_height": frame.original_height,
+            "format": frame.format,
+            "quality": frame.quality,
+            "size_bytes": frame.size_bytes,
+            "timestamp": frame.timestamp,
+        }
+    )
 
 
 _streamer = VisionStreamer()
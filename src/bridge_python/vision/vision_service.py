@@ -16,19 +16,31 @@ v4.3 - Screenshot Caching
 - Thread-safe with configurable TTL and max entries
 """
 
+import numpy as np
 from PIL import Image
 from typing import List, Dict, Tuple, Optional, Union
 from dataclasses import dataclass, field
-import io
-import base64
 import os
 import time
 import hashlib
 import threading
+from collections import OrderedDict
 
 from .detector import VisionDetector, Detection, get_detector
 from .ocr import WindowsOCR, TextRegion, get_ocr
 from .ocr_optimized import OptimizedOCR, get_optimized_ocr
+from .encoding import b64encode_str, encode_image, normalize_format, to_image
+from . import nms, resize
+
+# Try to import xxhash (faster frame digests than blake2b)
+_XXHASH_AVAILABLE = False
+
+try:
+    import xxhash
+
+    _XXHASH_AVAILABLE = True
+except ImportError:
+    pass
 
 
 # =========================================================================
@@ -71,12 +83,16 @@ class ScreenshotCache:
         self.ttl_seconds = ttl_seconds
         self.max_entries = max_entries
         self._cache: Dict[str, CachedScreenshot] = {}
+        # Encoded screenshots keyed by frame content (no TTL: same pixels and
+        # params always encode to the same bytes)
+        self._by_frame: "OrderedDict[Tuple, OptimizedScreenshot]" = OrderedDict()
         self._lock = threading.RLock()
         self._stats = {
             "hits": 0,
             "misses": 0,
             "evictions": 0,
             "stores": 0,
+            "frame_hits": 0,
         }
 
     def _make_key(
@@ -85,6 +101,7 @@ class ScreenshotCache:
         quality: int = 75,
         max_width: int = 1920,
         max_height: int = 1080,
+        image_format: str = "jpeg",
     ) -> str:
         """
         Generate cache key for a screenshot request.
@@ -94,6 +111,7 @@ class ScreenshotCache:
             quality: JPEG quality setting
             max_width: Maximum width after resize
             max_height: Maximum height after resize
+            image_format: Encoding format
 
         Returns:
             String cache key
@@ -104,6 +122,7 @@ class ScreenshotCache:
             )
         else:
             key_data = f"full:w{max_width}:h{max_height}:q{quality}"
+        key_data += f":{image_format}"
         return hashlib.md5(key_data.encode()).hexdigest()[:16]
 
     def get(
@@ -112,6 +131,7 @@ class ScreenshotCache:
         quality: int = 75,
         max_width: int = 1920,
         max_height: int = 1080,
+        image_format: str = "jpeg",
     ) -> Optional["OptimizedScreenshot"]:
         """
         Get a cached screenshot if available and not expired.
@@ -121,11 +141,12 @@ class ScreenshotCache:
             quality: JPEG quality
             max_width: Max width
             max_height: Max height
+            image_format: Encoding format
 
         Returns:
             OptimizedScreenshot if cache hit, None otherwise
         """
-        key = self._make_key(region, quality, max_width, max_height)
+        key = self._make_key(region, quality, max_width, max_height, image_format)
         now = time.time()
 
         with self._lock:
@@ -153,6 +174,7 @@ class ScreenshotCache:
         quality: int = 75,
         max_width: int = 1920,
         max_height: int = 1080,
+        image_format: str = "jpeg",
     ) -> str:
         """
         Store a screenshot in the cache.
@@ -163,11 +185,12 @@ class ScreenshotCache:
             quality: JPEG quality
             max_width: Max width
             max_height: Max height
+            image_format: Encoding format
 
         Returns:
             Cache key used for storage
         """
-        key = self._make_key(region, quality, max_width, max_height)
+        key = self._make_key(region, quality, max_width, max_height, image_format)
 
         with self._lock:
             # Evict oldest entries if at capacity
@@ -188,11 +211,40 @@ class ScreenshotCache:
 
         return key
 
+    def get_for_frame(self, frame_key: str, *params) -> Optional["OptimizedScreenshot"]:
+        """
+        Get the screenshot previously encoded from identical pixels.
+
+        Args:
+            frame_key: frame_digest() of the captured frame
+            *params: Encoding parameters (quality, size, format, ...)
+
+        Returns:
+            OptimizedScreenshot if this frame was already encoded, None otherwise
+        """
+        key = (frame_key,) + params
+        with self._lock:
+            optimized = self._by_frame.get(key)
+            if optimized is not None:
+                self._by_frame.move_to_end(key)
+                self._stats["frame_hits"] += 1
+            return optimized
+
+    def put_for_frame(
+        self, screenshot: "OptimizedScreenshot", frame_key: str, *params
+    ):
+        """Store a screenshot under its frame digest and encoding parameters."""
+        with self._lock:
+            self._by_frame[(frame_key,) + params] = screenshot
+            while len(self._by_frame) > self.max_entries:
+                self._by_frame.popitem(last=False)
+
     def clear(self):
         """Clear all cached screenshots."""
         with self._lock:
             count = len(self._cache)
             self._cache.clear()
+            self._by_frame.clear()
             self._stats["evictions"] += count
 
     def get_stats(self) -> Dict:
@@ -210,6 +262,7 @@ class ScreenshotCache:
                 "misses": self._stats["misses"],
                 "stores": self._stats["stores"],
                 "evictions": self._stats["evictions"],
+                "frame_hits": self._stats["frame_hits"],
                 "hit_rate": round(hit_rate, 3),
             }
 
@@ -245,6 +298,118 @@ def get_screenshot_cache() -> ScreenshotCache:
     return _screenshot_cache
 
 
+# =========================================================================
+# FRAME RESULT CACHE
+# =========================================================================
+
+
+def frame_digest(image: Union[Image.Image, np.ndarray], stride: int = 8) -> str:
+    """
+    Cheap fingerprint of a frame from a strided pixel sample.
+
+    Samples every `stride`-th pixel in both directions (~1/64 of the frame),
+    which changes for any real UI update while costing well under a millisecond
+    to hash.
+
+    PIL frames are sampled with a nearest-neighbour affine transform that
+    reads only the sampled pixels; np.asarray() would copy the whole frame
+    first (~5 ms at 2560x1440). Both paths pick the same pixels, so a PIL
+    frame and its ndarray view hash the same.
+    """
+    if isinstance(image, np.ndarray):
+        sample = image[::stride, ::stride]
+    else:
+        width, height = image.size
+        # Output pixel i samples input floor(stride * (i + 0.5) + offset),
+        # i.e. exactly stride * i
+        offset = -(stride - 1) / 2
+        sample = np.asarray(
+            image.transform(
+                (-(-width // stride), -(-height // stride)),
+                Image.AFFINE,
+                (stride, 0, offset, 0, stride, offset),
+                Image.NEAREST,
+            )
+        )
+    data = np.ascontiguousarray(sample).tobytes()
+    if _XXHASH_AVAILABLE:
+        digest = xxhash.xxh3_64_hexdigest(data)
+    else:
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+    width, height = _frame_size(image)
+    return f"{width}x{height}:{digest}"
+
+
+class FrameResultCache:
+    """
+    Short-lived cache of detection/OCR results keyed by frame digest.
+
+    Agents typically call ocr -> find_text -> click_text on an unchanged
+    screen within a second; each call re-captures the screen, but identical
+    frames hash the same, so the model/OCR work is done only once.
+
+    Thread-safe for concurrent access.
+    """
+
+    def __init__(self, ttl_seconds: float = 1.0, max_entries: int = 8):
+        """
+        Initialize the frame result cache.
+
+        Args:
+            ttl_seconds: Time-to-live for cached results (default 1s)
+            max_entries: Maximum number of frames kept (default 8)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, object]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, digest: str, kind: str):
+        """Cached result of `kind` ('detect', 'ocr') for a frame, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(digest)
+            if entry is not None and now - entry[0] > self.ttl_seconds:
+                del self._cache[digest]
+                entry = None
+            if entry is None or kind not in entry[1]:
+                self._stats["misses"] += 1
+                return None
+            self._cache.move_to_end(digest)
+            self._stats["hits"] += 1
+            return entry[1][kind]
+
+    def put(self, digest: str, kind: str, value):
+        """Store a result of `kind` for a frame"""
+        with self._lock:
+            entry = self._cache.get(digest)
+            if entry is None:
+                entry = (time.time(), {})
+                self._cache[digest] = entry
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            entry[1][kind] = value
+
+    def clear(self):
+        """Clear all cached results"""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._stats["hits"],
+                "misses": self._stats["misses"],
+            }
+
+
 # =========================================================================
 # VISION MODE CONFIGURATION
 # =========================================================================
@@ -264,6 +429,9 @@ class VisionConfig:
     mode: str = os.environ.get("VISION_MODE", "auto")
 
     # Screenshot compression settings
+    image_format: str = normalize_format(
+        os.environ.get("VISION_IMAGE_FORMAT", "jpeg")
+    )
     jpeg_quality: int = int(os.environ.get("VISION_JPEG_QUALITY", "75"))
     max_width: int = int(os.environ.get("VISION_MAX_WIDTH", "1920"))
     max_height: int = int(os.environ.get("VISION_MAX_HEIGHT", "1080"))
@@ -288,6 +456,7 @@ class VisionConfig:
         """Get current configuration as dict"""
         return {
             "mode": cls.mode,
+            "format": cls.image_format,
             "jpeg_quality": cls.jpeg_quality,
             "max_width": cls.max_width,
             "max_height": cls.max_height,
@@ -300,6 +469,8 @@ class VisionConfig:
         """Update configuration settings"""
         if "mode" in kwargs:
             cls.set_mode(kwargs["mode"])
+        if "format" in kwargs:
+            cls.image_format = normalize_format(kwargs["format"])
         if "jpeg_quality" in kwargs:
             cls.jpeg_quality = max(1, min(100, int(kwargs["jpeg_quality"])))
         if "max_width" in kwargs:
@@ -324,17 +495,18 @@ class OptimizedScreenshot:
     Contains base64-encoded image with metadata.
     """
 
-    data: str  # base64-encoded JPEG
+    data: str  # base64-encoded image
     width: int
     height: int
     original_width: int
     original_height: int
-    format: str  # 'jpeg'
+    format: str  # 'jpeg', 'webp' or 'png'
     quality: int
     size_bytes: int
     compression_ratio: float
     timestamp: float
     thumbnail: Optional[str] = None  # Optional smaller preview
+    raw: Optional[bytes] = field(default=None, repr=False)  # encoded bytes
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
@@ -356,77 +528,76 @@ class OptimizedScreenshot:
 
 
 def optimize_screenshot(
-    image: Image.Image,
+    image: Union[Image.Image, np.ndarray],
     max_width: Optional[int] = None,
     max_height: Optional[int] = None,
     jpeg_quality: Optional[int] = None,
     include_thumbnail: bool = False,
     thumbnail_max_size: int = 400,
+    image_format: Optional[str] = None,
+    encode_base64: bool = True,
 ) -> OptimizedScreenshot:
     """
     Optimize a screenshot for agent vision mode.
 
     Performs:
     - Resize if larger than max dimensions (maintains aspect ratio)
-    - JPEG compression with configurable quality
+    - JPEG/WebP/PNG compression with configurable quality
     - Optional thumbnail generation
 
     Args:
-        image: PIL Image to optimize
+        image: PIL Image, or RGB/BGRA ndarray frame (encoded without a PIL
+            round-trip when no resize is needed)
         max_width: Maximum width (default from VisionConfig)
         max_height: Maximum height (default from VisionConfig)
         jpeg_quality: JPEG quality 1-100 (default from VisionConfig)
         include_thumbnail: Generate smaller thumbnail
         thumbnail_max_size: Max dimension for thumbnail
+        image_format: 'jpeg', 'webp' or 'png' (default from VisionConfig)
+        encode_base64: Fill `data` with base64; False leaves it empty for
+            binary consumers that only read `raw`
 
     Returns:
-        OptimizedScreenshot with base64 data and metadata
+        OptimizedScreenshot with base64 data, raw bytes and metadata
     """
     # Use defaults from config
     max_width = max_width or VisionConfig.max_width
     max_height = max_height or VisionConfig.max_height
     jpeg_quality = jpeg_quality or VisionConfig.jpeg_quality
+    image_format = normalize_format(image_format or VisionConfig.image_format)
 
-    original_width, original_height = image.size
+    original_width, original_height = _frame_size(image)
 
     # Calculate original uncompressed size (RGB)
     original_size = original_width * original_height * 3
 
-    # Resize if needed (maintain aspect ratio)
-    resized = image.copy()
+    # Resize if needed (maintain aspect ratio, no full-frame copy when not).
+    # The resized frame only lives until it is encoded, so it can use the
+    # thread's scratch buffer
+    resized = image
     if original_width > max_width or original_height > max_height:
-        resized.thumbnail((max_width, max_height), Image.LANCZOS)
+        resized = _downscale(image, max_width, max_height, scratch=True)
 
-    # Convert to RGB if needed (JPEG doesn't support alpha)
-    if resized.mode in ("RGBA", "P"):
-        resized = resized.convert("RGB")
-
-    # Compress to JPEG
-    buffer = io.BytesIO()
-    resized.save(buffer, format="JPEG", quality=jpeg_quality, optimize=True)
-    compressed_data = buffer.getvalue()
+    # Compress
+    compressed_data = encode_image(resized, image_format, jpeg_quality)
 
     # Base64 encode
-    b64_data = base64.b64encode(compressed_data).decode("ascii")
+    b64_data = b64encode_str(compressed_data) if encode_base64 else ""
 
-    # Generate thumbnail if requested
+    # Generate thumbnail if requested: downscale the already-resized frame
+    # with a box filter (cheapest; fine for a low-quality preview)
     thumbnail_b64 = None
     if include_thumbnail:
-        thumb = image.copy()
-        thumb.thumbnail((thumbnail_max_size, thumbnail_max_size), Image.LANCZOS)
-        if thumb.mode in ("RGBA", "P"):
-            thumb = thumb.convert("RGB")
-        thumb_buffer = io.BytesIO()
-        thumb.save(thumb_buffer, format="JPEG", quality=60, optimize=True)
-        thumbnail_b64 = base64.b64encode(thumb_buffer.getvalue()).decode("ascii")
+        thumb = _downscale(resized, thumbnail_max_size, thumbnail_max_size, Image.BOX)
+        thumbnail_b64 = b64encode_str(encode_image(thumb, "jpeg", 60))
 
     return OptimizedScreenshot(
         data=b64_data,
-        width=resized.size[0],
-        height=resized.size[1],
+        width=_frame_size(resized)[0],
+        height=_frame_size(resized)[1],
         original_width=original_width,
         original_height=original_height,
-        format="jpeg",
+        format=image_format,
         quality=jpeg_quality,
         size_bytes=len(compressed_data),
         compression_ratio=original_size / len(compressed_data)
@@ -434,6 +605,7 @@ def optimize_screenshot(
         else 0,
         timestamp=time.time(),
         thumbnail=thumbnail_b64,
+        raw=compressed_data,
     )
 
 
@@ -444,6 +616,7 @@ def optimize_region(
     width: int,
     height: int,
     jpeg_quality: Optional[int] = None,
+    image_format: Optional[str] = None,
 ) -> OptimizedScreenshot:
     """
     Extract and optimize a region of a screenshot.
@@ -455,33 +628,57 @@ def optimize_region(
         x, y: Top-left corner of region
         width, height: Size of region
         jpeg_quality: JPEG quality 1-100
+        image_format: 'jpeg', 'webp' or 'png' (default from VisionConfig)
 
     Returns:
         OptimizedScreenshot of the cropped region
     """
-    # Clamp to image bounds
-    img_width, img_height = image.size
-    x = max(0, min(x, img_width - 1))
-    y = max(0, min(y, img_height - 1))
-    right = min(x + width, img_width)
-    bottom = min(y + height, img_height)
+    # Clamp to image bounds and crop
+    img_width, img_height = _frame_size(image)
+    box = clamp_region(x, y, width, height, img_width, img_height)
+    region = _crop(image, box)
+
+    return encode_region(region, (img_width, img_height), jpeg_quality, image_format)
+
 
-    # Crop region
-    region = image.crop((x, y, right, bottom))
+def clamp_region(
+    x: int, y: int, width: int, height: int, screen_width: int, screen_height: int
+) -> Tuple[int, int, int, int]:
+    """Clamp an (x, y, width, height) region to the screen; returns a box"""
+    x = max(0, min(x, screen_width - 1))
+    y = max(0, min(y, screen_height - 1))
+    return (x, y, min(x + width, screen_width), min(y + height, screen_height))
+
+
+def encode_region(
+    region: Union[Image.Image, np.ndarray],
+    screen_size: Tuple[int, int],
+    jpeg_quality: Optional[int] = None,
+    image_format: Optional[str] = None,
+) -> OptimizedScreenshot:
+    """
+    Encode an already-cropped region (e.g. captured with a bbox).
+
+    Args:
+        region: Region pixels as a PIL Image or RGB/BGRA ndarray
+        screen_size: (width, height) of the full screen, for metadata
+        jpeg_quality: JPEG quality 1-100
+        image_format: 'jpeg', 'webp' or 'png' (default from VisionConfig)
+
+    Returns:
+        OptimizedScreenshot of the region
+    """
+    img_width, img_height = screen_size
 
     # Optimize (no resize for regions - they're already targeted)
     jpeg_quality = jpeg_quality or VisionConfig.jpeg_quality
+    image_format = normalize_format(image_format or VisionConfig.image_format)
 
-    if region.mode in ("RGBA", "P"):
-        region = region.convert("RGB")
+    compressed_data = encode_image(region, image_format, jpeg_quality)
 
-    buffer = io.BytesIO()
-    region.save(buffer, format="JPEG", quality=jpeg_quality, optimize=True)
-    compressed_data = buffer.getvalue()
+    b64_data = b64encode_str(compressed_data)
 
-    b64_data = base64.b64encode(compressed_data).decode("ascii")
-
-    region_width, region_height = region.size
+    region_width, region_height = _frame_size(region)
     original_size = region_width * region_height * 3
 
     return OptimizedScreenshot(
@@ -490,7 +687,7 @@ def optimize_region(
         height=region_height,
         original_width=img_width,
         original_height=img_height,
-        format="jpeg",
+        format=image_format,
         quality=jpeg_quality,
         size_bytes=len(compressed_data),
         compression_ratio=original_size / len(compressed_data)
@@ -501,6 +698,93 @@ def optimize_region(
     )
 
 
+def _frame_size(image: Union[Image.Image, np.ndarray]) -> Tuple[int, int]:
+    """(width, height) of a PIL Image or (H, W, 3) ndarray frame"""
+    if isinstance(image, np.ndarray):
+        return image.shape[1], image.shape[0]
+    return image.size
+
+
+def _crop(
+    image: Union[Image.Image, np.ndarray], box: Tuple[int, int, int, int]
+) -> Union[Image.Image, np.ndarray]:
+    """Crop a frame; ndarray frames are sliced as views (no pixel copy)"""
+    if isinstance(image, np.ndarray):
+        left, top, right, bottom = box
+        return image[top:bottom, left:right]
+    return image.crop(box)
+
+
+def _as_image(image: Union[Image.Image, np.ndarray]) -> Image.Image:
+    """Wrap an RGB or BGRA ndarray frame as a PIL Image; pass PIL images through."""
+    return to_image(image)
+
+
+def _downscale(
+    image: Union[Image.Image, np.ndarray],
+    max_width: int,
+    max_height: int,
+    resample: int = Image.LANCZOS,
+    scratch: bool = False,
+) -> Union[Image.Image, np.ndarray]:
+    """
+    Downscale a frame to fit max_width x max_height (aspect kept).
+
+    PIL images are copied and thumbnailed as before. BGRA ndarray frames are
+    wrapped as a zero-copy RGBX image (resampling is per channel, so the
+    channel order does not matter) and come back as a smaller BGRA ndarray:
+    the full-size frame is never color-converted or copied, and the result
+    feeds the BGRA JPEG encoder directly. Large frames resized with Lanczos
+    go through the parallel numba kernels when available; with scratch=True
+    they write into a reused per-thread buffer (see resize.scratch_buffer).
+    """
+    if isinstance(image, Image.Image):
+        thumb = image.copy()
+        thumb.thumbnail((max_width, max_height), resample)
+        return thumb
+
+    height, width = image.shape[:2]
+    scale = min(max_width / width, max_height / height, 1.0)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    if resample == Image.LANCZOS and size != (width, height):
+        resized = resize.lanczos_resize(image, size, scratch)
+        if resized is not None:
+            return resized
+
+    if image.shape[2] == 4:
+        view = Image.frombuffer(
+            "RGBX", (width, height), np.ascontiguousarray(image), "raw", "RGBX", 0, 1
+        )
+    else:
+        view = Image.fromarray(image)
+    # reducing_gap matches Image.thumbnail: box-reduce first, then Lanczos
+    return np.asarray(view.resize(size, resample, reducing_gap=2.0))
+
+
+def to_columns(items: List) -> Dict:
+    """
+    Struct-of-arrays layout for UIElement/TextRegion lists.
+
+    One array per field instead of one dict per item; left/top/right/bottom
+    follow from x, y, width and height.
+    """
+    count = len(items)
+
+    def column(name: str, dtype) -> np.ndarray:
+        return np.fromiter((getattr(i, name) for i in items), dtype=dtype, count=count)
+
+    return {
+        "count": count,
+        "x": column("x", np.int32),
+        "y": column("y", np.int32),
+        "width": column("width", np.int32),
+        "height": column("height", np.int32),
+        "confidence": np.round(column("confidence", np.float64), 3),
+        "text": [i.text for i in items],
+    }
+
+
 @dataclass
 class UIElement:
     """
@@ -582,25 +866,39 @@ class VisionService:
         self.optimized_ocr = get_optimized_ocr() if use_optimized_ocr else None
         self.confidence_threshold = confidence_threshold
         self._use_optimized = use_optimized_ocr
+        self.frame_cache = FrameResultCache(
+            ttl_seconds=float(os.environ.get("VISION_FRAME_CACHE_TTL", "1.0"))
+        )
+
+        # Pay the NMS/resize JIT cost at startup instead of on the first request
+        nms.warmup()
+        resize.warmup()
 
     def detect_elements(
-        self, image: Image.Image, use_tiling: bool = True
+        self, image: Image.Image, use_tiling: bool = True, use_cache: bool = True
     ) -> List[UIElement]:
         """
         Detect all UI elements in an image using tiling only (no global resize).
 
         Args:
-            image: PIL Image
+            image: PIL Image or RGB ndarray
             use_tiling: unused (kept for signature compatibility)
+            use_cache: Reuse results for an identical recent frame (default True)
 
         Returns:
             List of UIElement objects
         """
+        digest = frame_digest(image)
+        if use_cache:
+            cached = self.frame_cache.get(digest, "detect")
+            if cached is not None:
+                return list(cached)
+
         # Always use tiling to avoid downscaling before OmniParser
         detections = self._detect_with_tiling(image)
 
         # Convert Detection to UIElement
-        return [
+        elements = [
             UIElement(
                 x=d.x,
                 y=d.y,
@@ -611,43 +909,109 @@ class VisionService:
             )
             for d in detections
         ]
+        self.frame_cache.put(digest, "detect", elements)
+        return list(elements)
 
-    def _detect_with_tiling(self, image: Image.Image) -> List[Detection]:
+    def detect_elements_batch(
+        self, images: List[Union[Image.Image, np.ndarray]], use_cache: bool = True
+    ) -> List[List[UIElement]]:
         """
-        Detect elements using tiling for large images.
+        Detect UI elements in several screenshots at once.
 
-        Divides the image into overlapping tiles, processes each,
-        and merges results with deduplication.
-        """
-        width, height = image.size
-        all_detections = []
+        Tiles from every image are sent to the detector together so concurrent
+        requests share model calls. Results match detect_elements() per image.
 
-        # Calculate tile positions
+        Args:
+            images: PIL Images or RGB ndarrays
+            use_cache: Reuse results for identical recent frames (default True)
+
+        Returns:
+            One list of UIElement objects per input image, in input order
+        """
+        digests = [frame_digest(img) for img in images]
+        results: List[Optional[List[UIElement]]] = [
+            self.frame_cache.get(d, "detect") if use_cache else None for d in digests
+        ]
+        pending = [i for i, r in enumerate(results) if r is None]
+
+        tiles = []
+        owners = []  # (image index, tile_left, tile_top) for each tile
+        for index in pending:
+            image = images[index]
+            for box in self._tile_boxes(*_frame_size(image)):
+                tiles.append(_crop(image, box))
+                owners.append((index, box[0], box[1]))
+
+        per_image: Dict[int, List[Detection]] = {index: [] for index in pending}
+        for (index, tile_left, tile_top), tile_detections in zip(
+            owners, self.detector.detect_batch(tiles)
+        ):
+            for d in tile_detections:
+                d.x += tile_left
+                d.y += tile_top
+                per_image[index].append(d)
+
+        for index, detections in per_image.items():
+            elements = [
+                UIElement(
+                    x=d.x,
+                    y=d.y,
+                    width=d.width,
+                    height=d.height,
+                    confidence=d.confidence,
+                    element_type="icon",
+                )
+                for d in self._deduplicate_detections(detections)
+            ]
+            self.frame_cache.put(digests[index], "detect", elements)
+            results[index] = elements
+
+        return [list(elements) for elements in results]
+
+    def _tile_boxes(
+        self, width: int, height: int
+    ) -> List[Tuple[int, int, int, int]]:
+        """Overlapping (left, top, right, bottom) tile boxes covering the image"""
+        boxes = []
         step = self.TILE_SIZE - self.TILE_OVERLAP
 
         for y in range(0, height, step):
             for x in range(0, width, step):
-                # Calculate tile bounds
-                tile_left = x
-                tile_top = y
                 tile_right = min(x + self.TILE_SIZE, width)
                 tile_bottom = min(y + self.TILE_SIZE, height)
 
                 # Skip tiny edge tiles
-                if tile_right - tile_left < 100 or tile_bottom - tile_top < 100:
+                if tile_right - x < 100 or tile_bottom - y < 100:
                     continue
 
-                # Extract tile
-                tile = image.crop((tile_left, tile_top, tile_right, tile_bottom))
+                boxes.append((x, y, tile_right, tile_bottom))
+        return boxes
+
+    def _detect_with_tiling(
+        self, image: Union[Image.Image, np.ndarray]
+    ) -> List[Detection]:
+        """
+        Detect elements using tiling for large images.
+
+        Divides the image into overlapping tiles, processes each,
+        and merges results with deduplication.
+        """
+        all_detections = []
+
+        for tile_left, tile_top, tile_right, tile_bottom in self._tile_boxes(
+            *_frame_size(image)
+        ):
+            # Extract tile (a view for ndarray frames)
+            tile = _crop(image, (tile_left, tile_top, tile_right, tile_bottom))
 
-                # Detect in tile
-                tile_detections = self.detector.detect(tile)
+            # Detect in tile
+            tile_detections = self.detector.detect(tile)
 
-                # Offset coordinates to original image space
-                for d in tile_detections:
-                    d.x += tile_left
-                    d.y += tile_top
-                    all_detections.append(d)
+            # Offset coordinates to original image space
+            for d in tile_detections:
+                d.x += tile_left
+                d.y += tile_top
+                all_detections.append(d)
 
         # Deduplicate overlapping detections from different tiles
         return self._deduplicate_detections(all_detections)
@@ -659,39 +1023,35 @@ class VisionService:
         if len(detections) <= 1:
             return detections
 
-        # Sort by confidence
-        detections.sort(key=lambda d: d.confidence, reverse=True)
-
-        kept = []
-        suppressed = set()
-
-        for i, det in enumerate(detections):
-            if i in suppressed:
-                continue
-
-            kept.append(det)
-
-            for j in range(i + 1, len(detections)):
-                if j in suppressed:
-                    continue
-
-                iou = self.detector._calculate_iou(det, detections[j])
-                if iou > iou_threshold:
-                    suppressed.add(j)
+        boxes = np.array([d.bounds for d in detections], dtype=np.float64)
+        scores = np.array([d.confidence for d in detections], dtype=np.float64)
+        keep = nms.nms(boxes, scores, iou_threshold)
 
-        return kept
+        return [detections[i] for i in keep]
 
-    def recognize_text(self, image: Image.Image) -> List[TextRegion]:
+    def recognize_text(
+        self, image: Image.Image, use_cache: bool = True
+    ) -> List[TextRegion]:
         """
         Recognize all text in an image.
 
         Args:
-            image: PIL Image
+            image: PIL Image or RGB ndarray
+            use_cache: Reuse results for an identical recent frame (default True)
 
         Returns:
             List of TextRegion objects with text and positions
         """
-        return self.ocr.recognize(image)
+        image = _as_image(image)
+        digest = frame_digest(image)
+        if use_cache:
+            cached = self.frame_cache.get(digest, "ocr")
+            if cached is not None:
+                return list(cached)
+
+        regions = self.ocr.recognize(image)
+        self.frame_cache.put(digest, "ocr", regions)
+        return list(regions)
 
     def find_element_by_text(
         self,
@@ -699,6 +1059,7 @@ class VisionService:
         text: str,
         case_sensitive: bool = False,
         fuzzy: bool = False,
+        use_cache: bool = True,
     ) -> Optional[UIElement]:
         """
         Find a UI element containing specific text.
@@ -709,22 +1070,28 @@ class VisionService:
         3. Returns the best matching element
 
         Args:
-            image: PIL Image
+            image: PIL Image or RGB ndarray
             text: Text to search for
             case_sensitive: Whether to use case-sensitive matching
             fuzzy: Allow partial/fuzzy matching
+            use_cache: Reuse results for an identical recent frame (default True)
 
         Returns:
             UIElement if found, None otherwise
         """
         # First, find text regions
-        text_regions = self.ocr.find_text(image, text, case_sensitive)
+        regions = self.recognize_text(image, use_cache=use_cache)
+        if case_sensitive:
+            text_regions = [r for r in regions if text in r.text]
+        else:
+            text_lower = text.lower()
+            text_regions = [r for r in regions if text_lower in r.text.lower()]
 
         if not text_regions:
             return None
 
         # For each text region, check if it overlaps with a detected element
-        detections = self.detect_elements(image)
+        detections = self.detect_elements(image, use_cache=use_cache)
 
         best_match: Optional[UIElement] = None
         best_score = 0.0
@@ -795,7 +1162,7 @@ class VisionService:
         Get the click coordinates for a UI element with specific text.
 
         Args:
-            image: PIL Image
+            image: PIL Image or RGB ndarray
             text: Text to search for
             case_sensitive: Whether to use case-sensitive matching
 
@@ -820,12 +1187,13 @@ class VisionService:
         Performance: ~530ms first call, <1ms cached
 
         Args:
-            image: PIL Image
+            image: PIL Image or RGB ndarray
             use_cache: Use cache for repeated queries (default True)
 
         Returns:
             List of TextRegion objects
         """
+        image = _as_image(image)
         if self.optimized_ocr:
             return self.optimized_ocr.recognize(image, use_cache=use_cache)
         return self.ocr.recognize(image)
@@ -839,13 +1207,14 @@ class VisionService:
         Performance: ~120ms vs ~530ms for full screen
 
         Args:
-            image: PIL Image
+            image: PIL Image or RGB ndarray
             x, y: Top-left corner of region
             width, height: Size of region
 
         Returns:
             List of TextRegion objects with absolute coordinates
         """
+        image = _as_image(image)
         if self.optimized_ocr:
             return self.optimized_ocr.recognize_region(image, x, y, width, height)
 
@@ -870,13 +1239,14 @@ class VisionService:
         Falls back to full image search if not found in hints.
 
         Args:
-            image: PIL Image
+            image: PIL Image or RGB ndarray
             text: Text to find
             hint_regions: Optional list of (x, y, width, height) to search first
 
         Returns:
             TextRegion if found, None otherwise
         """
+        image = _as_image(image)
         if self.optimized_ocr:
             return self.optimized_ocr.find_text_fast(image, text, hint_regions)
 
@@ -885,13 +1255,17 @@ class VisionService:
         return regions[0] if regions else None
 
     def get_ocr_cache_stats(self) -> Dict:
-        """Get OCR cache statistics"""
+        """Get OCR cache statistics (plus the frame result cache)"""
         if self.optimized_ocr:
-            return self.optimized_ocr.get_cache_stats()
-        return {"entries": 0, "ttl_seconds": 0, "optimized": False}
+            stats = self.optimized_ocr.get_cache_stats()
+        else:
+            stats = {"entries": 0, "ttl_seconds": 0, "optimized": False}
+        stats["frame_cache"] = self.frame_cache.get_stats()
+        return stats
 
     def clear_ocr_cache(self):
-        """Clear OCR cache"""
+        """Clear OCR cache and the frame result cache"""
+        self.frame_cache.clear()
         if self.optimized_ocr:
             self.optimized_ocr.clear_cache()
 
@@ -900,13 +1274,14 @@ class VisionService:
         Perform full analysis of a screen.
 
         Args:
-            image: PIL Image
+            image: PIL Image or RGB ndarray
             use_cache: Use OCR cache (default True)
 
         Returns:
             Dict with elements, text, and summary
         """
-        elements = self.detect_elements(image)
+        image = _as_image(image)
+        elements = self.detect_elements(image, use_cache=use_cache)
         text_regions = self.recognize_text_cached(image, use_cache=use_cache)
 
         result = {
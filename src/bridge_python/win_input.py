@@ -0,0 +1,275 @@
+"""
+Direct Win32 input injection for the Python bridge
+
+Thin ctypes layer over user32.SendInput / SetCursorPos. Coordinate-based
+mouse endpoints and named-key keyboard endpoints use these helpers instead of
+pywinauto.mouse / send_keys, which add argument normalization, mini-language
+parsing and one SendInput call per event. Here every action is a single
+SendInput call with all of its events.
+"""
+
+import ctypes
+from ctypes import wintypes
+
+user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+# ==================== WIN32 STRUCTURES ====================
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_RIGHTDOWN = 0x0008
+MOUSEEVENTF_RIGHTUP = 0x0010
+MOUSEEVENTF_MIDDLEDOWN = 0x0020
+MOUSEEVENTF_MIDDLEUP = 0x0040
+MOUSEEVENTF_WHEEL = 0x0800
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+MOUSEEVENTF_ABSOLUTE = 0x8000
+
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+
+WHEEL_DELTA = 120
+
+ULONG_PTR = wintypes.WPARAM
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = (
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    )
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = (
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    )
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = (
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    )
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = (("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT))
+
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = (("type", wintypes.DWORD), ("u", _INPUTUNION))
+
+
+_INPUT_SIZE = ctypes.sizeof(INPUT)
+
+user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+user32.SendInput.restype = wintypes.UINT
+user32.SetCursorPos.argtypes = (ctypes.c_int, ctypes.c_int)
+user32.SetCursorPos.restype = wintypes.BOOL
+user32.GetSystemMetrics.argtypes = (ctypes.c_int,)
+user32.GetSystemMetrics.restype = ctypes.c_int
+
+# (down, up) flags per button
+_BUTTON_FLAGS = {
+    "left": (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+    "right": (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP),
+    "middle": (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP),
+}
+
+
+# Virtual-key codes by key name, built once at import
+VK_CODES = {
+    "ctrl": 0x11,
+    "alt": 0x12,
+    "shift": 0x10,
+    "win": 0x5B,
+    "enter": 0x0D,
+    "tab": 0x09,
+    "esc": 0x1B,
+    "escape": 0x1B,
+    "backspace": 0x08,
+    "delete": 0x2E,
+    "del": 0x2E,
+    "insert": 0x2D,
+    "space": 0x20,
+    "up": 0x26,
+    "down": 0x28,
+    "left": 0x25,
+    "right": 0x27,
+    "home": 0x24,
+    "end": 0x23,
+    "pageup": 0x21,
+    "pagedown": 0x22,
+    "pgup": 0x21,
+    "pgdn": 0x22,
+    "capslock": 0x14,
+    "printscreen": 0x2C,
+    **{chr(c): c - 0x20 for c in range(ord("a"), ord("z") + 1)},
+    **{str(d): 0x30 + d for d in range(10)},
+    **{f"f{n}": 0x6F + n for n in range(1, 25)},
+}
+
+# Keys that must be sent with KEYEVENTF_EXTENDEDKEY
+_EXTENDED_VK = frozenset(
+    (0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2D, 0x2E, 0x5B)
+)
+
+
+# ==================== LOW-LEVEL HELPERS ====================
+
+
+def send_inputs(inputs):
+    """Sends a sequence of INPUT structures with one SendInput call."""
+    count = len(inputs)
+    if not count:
+        return
+    array = (INPUT * count)(*inputs)
+    sent = user32.SendInput(count, array, _INPUT_SIZE)
+    if sent != count:
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+def mouse_input(flags, data=0):
+    """Builds a mouse INPUT at the current cursor position."""
+    return INPUT(
+        type=INPUT_MOUSE,
+        mi=MOUSEINPUT(0, 0, data & 0xFFFFFFFF, flags, 0, 0),
+    )
+
+
+def absolute_move_input(x, y):
+    """Builds a mouse move INPUT to screen coordinates (virtual desktop)."""
+    left = user32.GetSystemMetrics(SM_XVIRTUALSCREEN)
+    top = user32.GetSystemMetrics(SM_YVIRTUALSCREEN)
+    width = max(user32.GetSystemMetrics(SM_CXVIRTUALSCREEN) - 1, 1)
+    height = max(user32.GetSystemMetrics(SM_CYVIRTUALSCREEN) - 1, 1)
+    flags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+    return INPUT(
+        type=INPUT_MOUSE,
+        mi=MOUSEINPUT(
+            round((x - left) * 65535 / width),
+            round((y - top) * 65535 / height),
+            0,
+            flags,
+            0,
+            0,
+        ),
+    )
+
+
+def key_input(vk, key_up=False):
+    """Builds a keyboard INPUT for a virtual-key code."""
+    flags = KEYEVENTF_KEYUP if key_up else 0
+    if vk in _EXTENDED_VK:
+        flags |= KEYEVENTF_EXTENDEDKEY
+    return INPUT(type=INPUT_KEYBOARD, ki=KEYBDINPUT(vk, 0, flags, 0, 0))
+
+
+def _button_flags(button):
+    try:
+        return _BUTTON_FLAGS[button]
+    except KeyError:
+        raise ValueError(f"Unknown mouse button: {button}") from None
+
+
+# ==================== MOUSE ====================
+
+
+def move(x, y):
+    """Moves the cursor to screen coordinates."""
+    if not user32.SetCursorPos(int(x), int(y)):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+def click(x, y, button="left", count=1):
+    """Clicks (count=2 for double click) at screen coordinates."""
+    down, up = _button_flags(button)
+    move(x, y)
+    send_inputs([mouse_input(flag) for _ in range(count) for flag in (down, up)])
+
+
+def press(x, y, button="left"):
+    """Presses a mouse button at screen coordinates."""
+    move(x, y)
+    send_inputs([mouse_input(_button_flags(button)[0])])
+
+
+def release(x, y, button="left"):
+    """Releases a mouse button at screen coordinates."""
+    move(x, y)
+    send_inputs([mouse_input(_button_flags(button)[1])])
+
+
+def drag(from_x, from_y, to_x, to_y, button="left", steps=8):
+    """
+    Drags from one point to another.
+
+    Sends button-down, `steps` interpolated moves and button-up as one ordered
+    SendInput batch, so apps that track motion see a continuous drag.
+    """
+    down, up = _button_flags(button)
+    steps = max(1, int(steps))
+    move(from_x, from_y)
+    path = [
+        absolute_move_input(
+            from_x + (to_x - from_x) * i / steps, from_y + (to_y - from_y) * i / steps
+        )
+        for i in range(1, steps + 1)
+    ]
+    send_inputs([mouse_input(down)] + path + [mouse_input(up)])
+
+
+def scroll(wheel_dist, x=None, y=None):
+    """
+    Scrolls the mouse wheel by wheel_dist notches (positive = up).
+
+    Scrolls at the current cursor position unless x and y are given.
+    """
+    if x is not None and y is not None:
+        move(x, y)
+    send_inputs([mouse_input(MOUSEEVENTF_WHEEL, int(wheel_dist) * WHEEL_DELTA)])
+
+
+# ==================== KEYBOARD ====================
+
+
+def send_hotkey(keys):
+    """
+    Presses a key combination, e.g. ["ctrl", "shift", "s"].
+
+    Keys go down in order and come up in reverse order, all in one SendInput
+    call. Returns False without sending anything if a key has no VK code, so
+    the caller can fall back to send_keys.
+    """
+    vks = [VK_CODES.get(key) for key in keys]
+    if not vks or None in vks:
+        return False
+    send_inputs(
+        [key_input(vk) for vk in vks] + [key_input(vk, True) for vk in reversed(vks)]
+    )
+    return True
+
+
+def press_key(key):
+    """Presses and releases one named key. Returns False if it has no VK code."""
+    return send_hotkey([key])